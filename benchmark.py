@@ -0,0 +1,189 @@
+import argparse, json, os, random, sys, time, tracemalloc
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1' # keeps the printed results valid json
+from game import Game
+from scripts.tilemap import Tilemap
+from scripts.entities import Player
+
+MAPS_PATH = 'data/maps/'
+ENTITY_SAMPLES = 100 # the number of entities of each kind created to measure their size
+
+def summarize(samples) -> dict:
+    """
+    Summarizes a list of timings.
+
+    :param samples: the timings, in seconds
+    :return: the number of samples and the mean, 95th and 99th percentile, in milliseconds
+    """
+    ordered = sorted(samples)
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] * 1000
+    return {'samples': len(ordered),
+            'mean_ms': round(sum(ordered) / len(ordered) * 1000, 4),
+            'p95_ms': round(percentile(95), 4),
+            'p99_ms': round(percentile(99), 4)}
+
+def time_loading(game, name, repeats) -> dict:
+    """
+    Times loading a map and extracting its collectibles and spawners, on a fresh Tilemap each time.
+
+    :param game: the headless game the tilemaps belong to
+    :param name: the name of the map, without the file extension
+    :param repeats: the number of times to load the map
+    :return: the timings of Tilemap.load, Tilemap.load_compiled (if the map is compiled) and Tilemap.extract
+    """
+    timings = {'tilemap_load': [], 'tilemap_load_compiled': [], 'tilemap_extract': []}
+    for i in range(repeats):
+        tilemap = Tilemap(game)
+        start = time.perf_counter()
+        tilemap.load(MAPS_PATH + name + '.json')
+        timings['tilemap_load'].append(time.perf_counter() - start)
+
+        if os.path.exists(MAPS_PATH + name + '.lvl'):
+            start = time.perf_counter()
+            Tilemap(game).load_compiled(MAPS_PATH + name + '.lvl')
+            timings['tilemap_load_compiled'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        tilemap.extract([('collectible', 0), ('collectible', 1), ('collectible', 2)])
+        tilemap.extract([('spawner', 0), ('spawner', 1), ('spawner', 2), ('spawner', 3)])
+        timings['tilemap_extract'].append(time.perf_counter() - start)
+    return {stage: summarize(samples) for stage, samples in timings.items() if samples}
+
+def time_starting(game, level, repeats, seed=0) -> dict:
+    """
+    Times starting a level that has already been loaded once, which is setting up its entities and camera.
+
+    :param game: the headless game to start the level in
+    :param level: the level to start, as accepted by Game.start_level
+    :param repeats: the number of times to start the level
+    :param seed: the seed of the level's random numbers
+    :return: the timings of Game.start_level, and the number of entities it created out of the level's total
+    """
+    game.start_level(level, seed) # reads the level into the cache, which isn't timed
+    samples = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        game.start_level(level, seed)
+        samples.append(time.perf_counter() - start)
+    return {'level_start': summarize(samples), 
+            'entities_created': len(game.collectibles) + len(game.enemies), 
+            'entities_total': len(game.collectibles) + len(game.enemies) + len(game.collectible_spawners.records) + len(game.enemy_spawners.records)}
+
+def time_frames(game, level, frames, seed=0) -> dict:
+    """
+    Plays a level for the given number of frames with no input, timing each part of the frame separately.
+
+    :param game: the headless game to play the level in
+    :param level: the level to play, as accepted by Game.start_level
+    :param frames: the number of frames to time
+    :param seed: the seed of the level's random numbers
+    :return: the timings of the entity updates, clouds, tilemap, entity rendering and overlay
+    """
+    game.start_level(level, seed)
+    timings = {'entity_update': [], 'clouds': [], 'tilemap_render': [], 'entity_render': [], 'overlay': []}
+    for frame in range(frames):
+        if not game.level_loop:
+            break
+        start = time.perf_counter()
+        game.update_level()
+        timings['entity_update'].append(time.perf_counter() - start)
+
+        render_scroll = (int(game.scroll[0]), int(game.scroll[1]))
+        game.display.fill((0, 0, 0))
+
+        start = time.perf_counter()
+        game.clouds.render(game.display, offset=render_scroll)
+        timings['clouds'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        game.tilemap.render(game.display, offset=render_scroll)
+        timings['tilemap_render'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        game.render_entities(render_scroll)
+        timings['entity_render'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        game.draw_overlay()
+        timings['overlay'].append(time.perf_counter() - start)
+    return {stage: summarize(samples) for stage, samples in timings.items() if samples}
+
+def measure_memory(game, level, frames, seed=0) -> dict:
+    """
+    Measures with tracemalloc how much memory each kind of entity takes, and how much a tick allocates.
+
+    The memory of an entity includes everything made for it, like its copy of its animation. The
+    memory a tick allocates is the most that's allocated at once during the tick, above what was
+    allocated before it, so it counts the memory that's freed again before the tick ends.
+
+    :param game: the headless game to play the level in
+    :param level: the level to play, as accepted by Game.start_level
+    :param frames: the number of ticks to measure
+    :param seed: the seed of the level's random numbers
+    :return: the bytes per entity of each kind, and the mean and largest bytes allocated per tick and per update of the player
+    """
+    game.start_level(level, seed)
+    results = {}
+    tracemalloc.start()
+    makers = {'player': lambda pos: Player(game, pos, (16, 16)), 
+              'collectible': lambda pos: game.create_collectible({'variant': 0, 'pos': pos}), 
+              'tick_enemy': lambda pos: game.create_enemy({'variant': 1, 'pos': pos}), 
+              'dung_enemy': lambda pos: game.create_enemy({'variant': 2, 'pos': pos}), 
+              'mole_enemy': lambda pos: game.create_enemy({'variant': 3, 'pos': pos})}
+    for name, make in makers.items():
+        entities = [None] * ENTITY_SAMPLES # made before measuring, so only the entities are counted
+        start = tracemalloc.get_traced_memory()[0]
+        for i in range(ENTITY_SAMPLES):
+            entities[i] = make([i * 16, 0])
+        results[name + '_bytes'] = (tracemalloc.get_traced_memory()[0] - start) // ENTITY_SAMPLES
+        del entities
+    game.start_level(level, seed) # lets go of the enemies in the registry
+
+    samples = []
+    for frame in range(frames):
+        if not game.level_loop:
+            break
+        start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        game.update_level()
+        samples.append(tracemalloc.get_traced_memory()[1] - start)
+    results['tick_alloc_bytes'] = {'mean': round(sum(samples) / len(samples)) if samples else 0, 'max': max(samples, default=0)}
+
+    #* the player's physics alone, where the level's other allocations don't hide it
+    samples = []
+    for frame in range(frames):
+        start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        game.player.update()
+        samples.append(tracemalloc.get_traced_memory()[1] - start)
+    tracemalloc.stop()
+    results['player_update_alloc_bytes'] = {'mean': round(sum(samples) / len(samples)) if samples else 0, 'max': max(samples, default=0)}
+    return results
+
+# Benchmarks every map (or the ones given) and prints or writes the results as json
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Times the per-frame subsystems of every map in data/maps/ and measures their memory, headless.')
+    parser.add_argument('maps', nargs='*', help='the maps to benchmark, without the file extension. Defaults to every json map')
+    parser.add_argument('--frames', type=int, default=600, help='the number of frames to time per map')
+    parser.add_argument('--loads', type=int, default=10, help='the number of times to load each map')
+    parser.add_argument('--seed', type=int, default=0, help='the random seed, so runs can be compared')
+    parser.add_argument('--output', help='the file to write the results to, instead of printing them')
+    args = parser.parse_args()
+
+    names = args.maps or sorted(file[:-5] for file in os.listdir(MAPS_PATH) if file.endswith('.json'))
+
+    game = Game(headless=True)
+    results = {'frames': args.frames, 'seed': args.seed, 'python': sys.version.split()[0], 'maps': {}}
+    for name in names:
+        random.seed(args.seed)
+        level = int(name) if name.isdigit() else name
+        results['maps'][name] = time_loading(game, name, args.loads)
+        results['maps'][name].update(time_starting(game, level, args.loads, args.seed))
+        results['maps'][name].update(time_frames(game, level, args.frames, args.seed))
+        results['maps'][name].update(measure_memory(game, level, args.frames, args.seed))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
@@ -1,24 +1,94 @@
 import pygame as py
-import sys, time, json
+import sys, os, time, json, random, math
 from scripts.entities import *
 from scripts.tilemap import Tilemap
-from scripts.utils import load_image, load_images, Animation
+from scripts.utils import Atlas, ASSETS
 from scripts.clouds import Clouds
+from scripts.spatial import SpatialHash
+from scripts.hud import Hud
+from scripts.ui import Menu, Button
+from scripts.preload import Preloader
+from scripts.replay import Recording, INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+from scripts.projectiles import ProjectilePool
+from scripts.profiler import (FrameProfiler, PROFILE_SIMULATION, PROFILE_PLAYER, PROFILE_COLLECTIBLES, PROFILE_ENEMIES, PROFILE_PROJECTILES,
+                               PROFILE_BACKGROUND, PROFILE_CLOUDS, PROFILE_TILEMAP, PROFILE_ENTITIES, PROFILE_INPUT, PROFILE_HUD,
+                               PROFILE_PROFILER, PROFILE_PRESENT, PROFILE_WAIT)
+from scripts.swarm import TickSwarm, TileGrid, SWARM_AVAILABLE, SWARM_MIN_TICKS
+from scripts.spawners import SpawnerIndex
+from scripts.registry import EntityRegistry
+
+TICK_RATE = 60 # the default number of simulation ticks per second
+FPS = 60 # the default frame rate limit
+MAX_FRAME_TIME = 0.25 # the most time a single frame can add to the simulation, so a stall doesn't cause a burst of ticks
+REPLAYS_PATH = 'data/replays/' # where the recordings of the last and the fastest run of each level are saved
+
+#* the keys that control the player, by the input they're recorded as
+LEFT_KEYS = (py.K_LEFT, py.K_a)
+RIGHT_KEYS = (py.K_RIGHT, py.K_d)
+JUMP_KEYS = (py.K_UP, py.K_w, py.K_SPACE)
+
+#* the assets of a level, by name
+LEVEL_IMAGES = {'player': 'entities/player/player_test.png', 'background': 'Background.png'}
+LEVEL_IMAGE_DIRECTORIES = {'dirt': 'tiles/dirt', 'empty_dirt': 'tiles/empty_dirt', 'air': 'tiles/air', 'clouds': 'clouds'}
+LEVEL_TILES = ('dirt', 'empty_dirt', 'air') # the image directories that are tiles, rotated by the Atlas
+ENEMY_VARIANTS = {'tick_enemy': 1, 'dung_enemy': 2, 'mole_enemy': 3} # the spawner variant of each enemy type
+ENEMY_SIZE = 16 # the width and height of every enemy
+MAX_ENEMY_SPEED = 5 # the most pixels an enemy moves along either axis in a tick at BASE_TICK_RATE, the cap on falling speed
+LEVEL_ANIMATIONS = {'collectible/carrot': 'tiles/collectible/carrot', 
+                    'collectible/radish': 'tiles/collectible/radish', 
+                    'collectible/finish': 'tiles/collectible/z_finish', 
+                    'player/idle': 'entities/player', 
+                    'tick_enemy/idle': 'entities/tick_enemy', 
+                    'dung_enemy/idle': 'entities/dung_enemy', 
+                    'projectile/idle': 'entities/projectiles', 
+                    'mole_enemy/idle': 'entities/mole_enemy'}
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, hardware_scaling=False, tick_rate=TICK_RATE, fps=FPS, batch_ticks=True):
         """
         Initializes the Game class, setting up the pygame environment and creating a game window, clock, and assets.
 
+        A headless game uses SDL's dummy video and audio drivers, so it never opens a window and can
+        run on machines without a display. Levels are then started with start_level and advanced
+        with step.
+
+        With hardware scaling the window is opened with pygame.SCALED, so SDL scales the display up
+        when it is drawn instead of present scaling it every frame.
+
+        A level is simulated in fixed ticks of 1/tick_rate seconds, whatever the frame rate. Movement
+        is tuned in pixels per tick at BASE_TICK_RATE, so it is scaled by tick_scale at other rates.
+
+        With batch_ticks, and numpy installed, the tick enemies of a level are moved together by a
+        TickSwarm. The results are the same either way, it's only faster with many tick enemies.
+
         This constructor initializes the pygame library, sets up the display window and title, prepares the clock for frame rate control,
         and initializes game assets such as images for clouds and the background. It also sets up the game volume, font for rendering text,
         and main menu surface. Additionally, it initializes the game's loop states and sets up the levels dictionary.
 
+        Args:
+            headless (bool, optional): Whether to run without a window. Defaults to False.
+            hardware_scaling (bool, optional): Whether SDL scales the display up to the window. Defaults to False.
+            tick_rate (int, optional): The number of simulation ticks per second. Defaults to TICK_RATE.
+            fps (int, optional): The frame rate limit. Defaults to FPS.
+            batch_ticks (bool, optional): Whether to move the tick enemies together, if numpy is installed. Defaults to True.
+
         Attributes:
+            headless (bool): Whether the game runs without a window.
+            hardware_scaling (bool): Whether SDL scales the display up to the window.
+            tick_rate (int): The number of simulation ticks per second.
+            dt (float): The length of a tick, in seconds.
+            tick_scale (float): How much of a BASE_TICK_RATE tick a tick is, 1 at the default tick rate.
+            fps (int): The frame rate limit.
+            batch_ticks (bool): Whether the tick enemies are moved together by a TickSwarm.
+            swarm_min_ticks (int): The fewest tick enemies the TickSwarm moves together, SWARM_MIN_TICKS unless
+                lowered to check the swarm against the ticks updating themselves, as validate.py --check-swarm does.
             screen (pygame.Surface): The main display surface for the game.
             display (pygame.Surface): A secondary surface for rendering the game's content.
             scale (int): The scale factor for the game window.
+            scaled_display (pygame.Surface): The surface present scales the display into, the screen itself when their formats match.
+            scaled_background (pygame.Surface): The background scaled to the display, see background.
+            background_source (pygame.Surface): The background image scaled_background was made from.
             clock (pygame.time.Clock): Used to control the frame rate of the game.
             assets (dict): A dictionary containing loaded images for clouds and the background.
             clouds (Clouds): The clouds instance used in the game.
@@ -26,14 +96,38 @@ class Game:
             title_text (pygame.font.Font): The font used for rendering title text.
             text (pygame.font.Font): The font used for rendering normal text.
             number_text (pygame.font.Font): The font used for rendering large numbers.
-            main_menu (pygame.Surface): The main menu surface.
+            menu_rect (tuple): The rectangle coordinates for the menus.
+            menu_radius (int): The radius of the menus.
+            logo (pygame.Surface): The logo drawn on the main and settings menus.
+            menus (dict): The built menus, keyed by 'main', 'settings' and 'win'.
+            hud (Hud): The overlay drawn over a level.
             title_screen_loop (bool): A flag indicating if the title screen is to be displayed.
             level_loop (bool): A flag indicating if the level is to be displayed.
             settings_loop (bool): A flag indicating if the settings menu is to be displayed.
             win_screen_loop (bool): A flag indicating if the win screen is to be displayed.
             current_level (int): The current level being played.
             levels (dict): A dictionary containing the levels and their completion status.
+            enemy_grid (SpatialHash): The broadphase of the enemies, rebuilt every frame of a level. Its reach covers
+                an enemy plus the most it moves in a tick, which grows as the tick rate drops.
+            registry (EntityRegistry): The IDs of the enemies of a level.
+            tick_swarm (TickSwarm): The swarm moving the tick enemies created in the level, or None.
+            tile_grid (TileGrid): The tilemap laid out for the swarm, kept until the tilemap changes.
+            projectiles (ProjectilePool): The projectiles in the air, reused from level to level.
+            profiler (FrameProfiler): Times each stage of the level loop's frames, shown as an overlay while it's on.
+            level_cache (dict): The pristine state of every level loaded so far, keyed by map id.
+            preloader (Preloader): Loads the level assets and unlocked levels in the background while a menu is open.
         """
+        self.headless = headless
+        self.hardware_scaling = hardware_scaling
+        self.tick_rate = tick_rate
+        self.dt = 1 / tick_rate
+        self.tick_scale = BASE_TICK_RATE / tick_rate
+        self.fps = fps
+        self.batch_ticks = batch_ticks and SWARM_AVAILABLE
+        self.swarm_min_ticks = SWARM_MIN_TICKS
+        if self.headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
         py.init()
 
         self.width = 640
@@ -41,16 +135,22 @@ class Game:
 
         # create game window
         py.display.set_caption("Just a Hare Higher")
-        self.screen = py.display.set_mode((1920, 1080))
+        if self.headless:
+            self.screen = py.display.set_mode((self.width, self.height)) # images still need a display mode to be converted
+            self.scale = 3
+        else:
+            self.set_resolution((1920, 1080), 3)
         self.display = py.Surface((self.width, self.height))
-        self.scale = 3
+        self.scaled_display = None
+        self.scaled_background = None
+        self.background_source = None
 
         self.clock = py.time.Clock()
 
         # Main Menu Setup
         self.assets = {
-            'clouds': load_images('clouds'),
-            'background': load_image('Background.png'),
+            'clouds': ASSETS.images('clouds'),
+            'background': ASSETS.image('Background.png'),
         }
         self.clouds = Clouds(self.assets['clouds'])
 
@@ -63,7 +163,11 @@ class Game:
         self.smol_text = py.font.SysFont('Times New Roman', 14)
         self.number_text = py.font.SysFont('Times New Roman', 60)
 
-        self.main_menu = py.Surface((640,360), py.SRCALPHA)
+        self.menu_rect = (40, 55, 560, 290)
+        self.menu_radius = 50
+        self.logo = py.image.load('data/images/Logo.png').convert_alpha()
+        self.menus = {}
+        self.hud = Hud(self.normal_text)
 
         self.title_screen_loop = True
         self.level_loop = False
@@ -73,16 +177,24 @@ class Game:
         self.current_level = 1
         self.levels = {0: {'Completed': True}}
 
+        self.enemy_grid = SpatialHash(reach=ENEMY_SIZE + MAX_ENEMY_SPEED * self.tick_scale)
+        self.registry = EntityRegistry()
+        self.tick_swarm = None
+        self.tile_grid = None
+        self.projectiles = ProjectilePool(self)
+        self.profiler = FrameProfiler(self.smol_text)
+        self.level_cache = {}
+        self.preloader = Preloader(self)
+
     def run_menu(self):
         """
         The main menu loop for the game. This function is responsible for drawing the title screen, checking for events,
-        and updating the game window. It also loads the levels and their completion status, and sets up the main menu surface.
-        
+        and updating the game window. It also loads the levels and their completion status, and builds the main menu.
+
         Attributes:
-            main_menu (pygame.Surface): The main menu surface.
-            menu_rect (tuple): The rectangle coordinates for the main menu.
-            menu_radius (int): The radius of the main menu.
-            rects (dict): A dictionary containing the rectangles for the level "buttons" and the settings and exit "buttons".
+            high_scores (dict): The best carrots, radishes and score of each level.
+            menus (dict): The menus, built from the save data when the main menu is opened.
+            rects (dict): The hit-test rects of the open menu's "buttons", used by menu_events.
         """
         for i in range(1, 6):
             self.load(i)
@@ -91,104 +203,200 @@ class Game:
                             3: [self.levels[3]['Carrots'], self.levels[3]['Radishes'], self.levels[3]['Score']], 
                             4: [self.levels[4]['Carrots'], self.levels[4]['Radishes'], self.levels[4]['Score']], 
                             5: [self.levels[5]['Carrots'], self.levels[5]['Radishes'], self.levels[5]['Score']]}
+        self.menus['main'] = self.build_main_menu()
+        self.preload()
         
         while self.title_screen_loop:
-            
-            # draw background so we don't have an abyss
-            self.display.blit(py.transform.scale(self.assets['background'], self.display.get_size()), (0, 0))
-
-            self.clouds.update()
-            self.clouds.render(self.display)
-            
-            self.menu_rect = (40, 55, 560, 290)
-            self.menu_radius = 50
-            self.rects = {0: py.Rect((self.menu_rect[0]+15)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 94*self.scale, 94*self.scale),
-                    1: py.Rect((self.menu_rect[0]+15*2 + 94)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 94*self.scale, 94*self.scale),
-                    2: py.Rect((self.menu_rect[0]+15*3 + 94*2)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 94*self.scale, 94*self.scale),
-                    3: py.Rect((self.menu_rect[0]+15*4 + 94*3)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 94*self.scale, 94*self.scale),
-                    4: py.Rect((self.menu_rect[0]+15*5 + 94*4)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 94*self.scale, 94*self.scale), 
-                    'settings': py.Rect((self.menu_rect[0] + 15)*self.scale, (self.menu_rect[1] + self.menu_radius + 124)*self.scale, 203*self.scale, 94*self.scale),
-                    'exit': py.Rect((self.menu_rect[0] + 342)*self.scale, (self.menu_rect[1] + self.menu_radius + 124)*self.scale, 203*self.scale, 94*self.scale),
-                    5: py.Rect((self.menu_rect[0] + 15)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 161*self.scale, 94*self.scale),
-                    6: py.Rect((self.menu_rect[0] + 15 + 161 + 15)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 161*self.scale, 94*self.scale),
-                    7: py.Rect((self.menu_rect[0] + 15*2 + 161*2 + 15)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 161*self.scale, 94*self.scale),
-                    'wipe': py.Rect((self.menu_rect[0] + 342)*self.scale, (self.menu_rect[1] + 3)*self.scale, 150*self.scale, 47*self.scale)
-                    }
-            
-            # draw the background of the menu
-            py.draw.rect(self.main_menu, (255, 255, 255, 150), self.menu_rect, 0, self.menu_radius)
-            py.draw.rect(self.main_menu, (0, 0, 0, 150), self.menu_rect, 4, self.menu_radius)
-            py.draw.line(self.main_menu, (150, 150, 150, 150), (self.menu_rect[0]+4, self.menu_rect[1] + self.menu_radius), (self.menu_rect[0] + self.menu_rect[2]-5, self.menu_rect[1] + self.menu_radius))
-                
-            # draw the level "buttons" 
-            for i in range(5):
-                py.draw.rect(self.main_menu, (150, 150, 150, 150), (self.menu_rect[0] + i*94 +15*(i+1), self.menu_rect[1] + self.menu_radius + 5, 94, 63), 0, 25)
-                py.draw.rect(self.main_menu, (0, 0, 0, 150), (self.menu_rect[0] + i*94 +15*(i+1), self.menu_rect[1] + self.menu_radius + 5, 94, 63), 2, 25)
-                
-            # draw the text for the level "buttons"
-            for i in range(5):
-                self.main_menu.blit(py.font.Font.render(self.number_text, str(i+1), True, (0, 0, 0, 150)), ((self.menu_rect[0] + i*94 +15*(i+1) + 28, self.menu_rect[1] + self.menu_radius + 4)))
-                if self.levels[i]['Completed'] == False:
-                    py.draw.line(self.main_menu, (150, 0, 0), (self.menu_rect[0] + i*94 +15*(i+1), self.menu_rect[1] + self.menu_radius + 5), (self.menu_rect[0] + i*94 +15*(i+1) + 94, self.menu_rect[1] + self.menu_radius + 5 + 63), 2)
-                    py.draw.line(self.main_menu, (150, 0, 0), (self.menu_rect[0] + i*94 +15*(i+1) + 94, self.menu_rect[1] + self.menu_radius + 5), (self.menu_rect[0] + i*94 +15*(i+1), self.menu_rect[1] + self.menu_radius + 5 + 63), 2)
-
-            self.main_menu.blit(py.font.Font.render(self.smol_text, 'High Scores', True, (0, 0, 0, 150)), ((self.menu_rect[0] + 5, self.menu_rect[1] + self.menu_radius + 70)))
-            self.main_menu.blit(py.font.Font.render(self.smol_text, 'Fastest Times', True, (0, 0, 0, 150)), ((self.menu_rect[0] + 5, self.menu_rect[1] + self.menu_radius + 90)))
-
-            for i in range(5):
-                self.main_menu.blit(py.font.Font.render(self.menu_text, str(self.high_scores[i+1][2]), True, (0, 0, 0, 150)), ((self.menu_rect[0] + i*94 +15*(i+1) + 60, self.menu_rect[1] + self.menu_radius + 70)))
-            
-            for i in range(5):
-                if self.levels[i+1]['Time'] == '99:59:59':
-                    self.main_menu.blit(py.font.Font.render(self.menu_text, 'N/A', True, (0, 0, 0, 150)), ((self.menu_rect[0] + i*94 +15*(i+1) + 32, self.menu_rect[1] + self.menu_radius + 100)))
-                else:
-                    self.main_menu.blit(py.font.Font.render(self.menu_text, str(self.levels[i+1]['Time']), True, (0, 0, 0, 150)), ((self.menu_rect[0] + i*94 +15*(i+1) + 32, self.menu_rect[1] + self.menu_radius + 100)))
-
-            # draw the current level "button" differently
-            if py.Rect((self.menu_rect[0] + 15)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 530*self.scale, 94*self.scale).collidepoint(py.mouse.get_pos()):
-                # draw the menu "buttons"
-                for i in range(5):
-                    if self.rects[i].collidepoint(py.mouse.get_pos()) and self.levels[i]['Completed'] == True:
-                        py.draw.rect(self.display, (150, 150, 150, 150), (self.menu_rect[0] + i*94 +15*(i+1), self.menu_rect[1] + self.menu_radius + 5, 94, 63), 0, 25)
-                        py.draw.rect(self.display, (0, 0, 0, 150), (self.menu_rect[0] + i*94 +15*(i+1), self.menu_rect[1] + self.menu_radius + 5, 94, 63), 2, 25)
-            
-                # draw the text for the menu "buttons"
-                for i in range(5):
-                    if self.rects[i].collidepoint(py.mouse.get_pos()):
-                        self.display.blit(py.font.Font.render(self.number_text, str(i+1), True, (0, 0, 0, 150)), ((self.menu_rect[0] + i*94 +15*(i+1) + 28, self.menu_rect[1] + self.menu_radius + 4)))
-            
-            # draw the settings "button"
-            py.draw.rect(self.main_menu, (150, 150, 150, 150), (self.menu_rect[0] + 15, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 0, 25)
-            py.draw.rect(self.main_menu, (0, 0, 0, 150), (self.menu_rect[0] + 15, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 2, 25)
-            self.main_menu.blit(py.font.Font.render(self.title_text, 'Settings', True, (0, 0, 0, 150)), ((self.menu_rect[0] + 52, self.menu_rect[1] + self.menu_radius + 145)))
-            if py.Rect((self.menu_rect[0] + 15)*self.scale, (self.menu_rect[1] + self.menu_radius + 124)*self.scale, 203*self.scale, 94*self.scale).collidepoint(py.mouse.get_pos()):
-                py.draw.rect(self.display, (150, 150, 150, 150), (self.menu_rect[0] + 15, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 0, 25)
-                py.draw.rect(self.display, (0, 0, 0, 150), (self.menu_rect[0] + 15, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 2, 25)
-                self.display.blit(py.font.Font.render(self.title_text, 'Settings', True, (0, 0, 0)), ((self.menu_rect[0] + 52, self.menu_rect[1] + self.menu_radius + 145)))
-            
-            # draw the exit "button"
-            py.draw.rect(self.main_menu, (150, 150, 150, 150), (self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 0, 25)
-            py.draw.rect(self.main_menu, (0, 0, 0, 150), (self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 2, 25)
-            self.main_menu.blit(py.font.Font.render(self.title_text, 'Exit', True, (0, 0, 0, 150)), ((self.menu_rect[0] + 409, self.menu_rect[1] + self.menu_radius + 145)))
-            if py.Rect((self.menu_rect[0] + 342)*self.scale, (self.menu_rect[1] + self.menu_radius + 124)*self.scale, 203*self.scale, 94*self.scale).collidepoint(py.mouse.get_pos()):
-                py.draw.rect(self.display, (150, 150, 150, 150), (self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 0, 25)
-                py.draw.rect(self.display, (0, 0, 0, 150), (self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 2, 25)
-                self.display.blit(py.font.Font.render(self.title_text, 'Exit', True, (0, 0, 0)), ((self.menu_rect[0] + 409, self.menu_rect[1] + self.menu_radius + 145)))
-            
-            self.display.blit(self.main_menu, (0,0))
-            self.display.blit(py.font.Font.render(self.title_text, "Just A Hare Higher", True, 'black'), (self.menu_rect[0]+142, self.menu_rect[1]+5))
-
-            # draw my logo
-            self.logo = py.image.load('data/images/Logo.png').convert_alpha()
-            self.display.blit(self.logo, (self.menu_rect[0] + 245, self.menu_rect[1] + self.menu_radius + 140))
+            self.draw_menu(self.menus['main'])
 
             self.menu_events()
 
             # update the window
-            self.screen.blit(py.transform.scale(self.display, self.screen.get_size()), (0, 0)) # scales the diplay to the screen size
-            py.display.flip()
-            self.clock.tick(60) # limit FPS to 60 per second
+            self.present()
+
+    def preload(self) -> None:
+        """
+        Starts loading the level assets and the unlocked levels in the background, the highest unlocked level first.
+
+        :return: None
+        """
+        self.preloader.request_images(LEVEL_IMAGES.values())
+        self.preloader.request_directories(LEVEL_IMAGE_DIRECTORIES.values())
+        self.preloader.request_directories(LEVEL_ANIMATIONS.values())
+        for level in range(5, 0, -1):
+            if self.levels[level-1]['Completed'] == True:
+                self.preloader.request_level(level)
+
+    def load_level_assets(self) -> dict:
+        """
+        Returns the assets of a level, loading any that haven't been loaded or preloaded yet.
+
+        :return: the assets, keyed by name
+        """
+        assets = {name: ASSETS.image(path) for name, path in LEVEL_IMAGES.items()}
+        assets.update({name: ASSETS.images(path) for name, path in LEVEL_IMAGE_DIRECTORIES.items()})
+        assets.update({name: ASSETS.animation(path) for name, path in LEVEL_ANIMATIONS.items()})
+        return assets
+
+    def build_menu_background(self, title, title_x) -> Menu:
+        """
+        Creates a menu with the background of the menus drawn into its panel and its title as an overlay.
+
+        :param title: the title shown at the top of the menu
+        :param title_x: how far from the left of the menu the title is drawn
+        :return: the new Menu
+        """
+        menu = Menu(self.display.get_size())
+        py.draw.rect(menu.panel, (255, 255, 255, 150), self.menu_rect, 0, self.menu_radius)
+        py.draw.rect(menu.panel, (0, 0, 0, 150), self.menu_rect, 4, self.menu_radius)
+        py.draw.line(menu.panel, (150, 150, 150, 150), (self.menu_rect[0]+4, self.menu_rect[1] + self.menu_radius), (self.menu_rect[0] + self.menu_rect[2]-5, self.menu_rect[1] + self.menu_radius))
+        menu.add_overlay(py.font.Font.render(self.title_text, title, True, 'black'), (self.menu_rect[0]+title_x, self.menu_rect[1]+5))
+        return menu
+
+    def build_main_menu(self) -> Menu:
+        """
+        Builds the main menu from the levels' completion status, high scores and fastest times.
+
+        :return: the main Menu, with the level, settings and exit "buttons"
+        """
+        menu = self.build_menu_background("Just A Hare Higher", 142)
+        panel = menu.panel
+
+        # draw the level "buttons" 
+        for i in range(5):
+            py.draw.rect(panel, (150, 150, 150, 150), (self.menu_rect[0] + i*94 +15*(i+1), self.menu_rect[1] + self.menu_radius + 5, 94, 63), 0, 25)
+            py.draw.rect(panel, (0, 0, 0, 150), (self.menu_rect[0] + i*94 +15*(i+1), self.menu_rect[1] + self.menu_radius + 5, 94, 63), 2, 25)
+
+        # draw the text for the level "buttons"
+        for i in range(5):
+            number = py.font.Font.render(self.number_text, str(i+1), True, (0, 0, 0, 150))
+            panel.blit(number, ((self.menu_rect[0] + i*94 +15*(i+1) + 28, self.menu_rect[1] + self.menu_radius + 4)))
+            if self.levels[i]['Completed'] == False:
+                py.draw.line(panel, (150, 0, 0), (self.menu_rect[0] + i*94 +15*(i+1), self.menu_rect[1] + self.menu_radius + 5), (self.menu_rect[0] + i*94 +15*(i+1) + 94, self.menu_rect[1] + self.menu_radius + 5 + 63), 2)
+                py.draw.line(panel, (150, 0, 0), (self.menu_rect[0] + i*94 +15*(i+1) + 94, self.menu_rect[1] + self.menu_radius + 5), (self.menu_rect[0] + i*94 +15*(i+1), self.menu_rect[1] + self.menu_radius + 5 + 63), 2)
+
+            # only an unlocked level is highlighted, but its number always is
+            menu.add_button(i, Button((self.menu_rect[0] + i*94 +15*(i+1), self.menu_rect[1] + self.menu_radius + 5, 94, 63), 
+                                      hit_rect=(self.menu_rect[0] + 15*(i+1) + 94*i, self.menu_rect[1] + self.menu_radius + 15, 94, 94), 
+                                      hover_background=self.levels[i]['Completed'] == True, 
+                                      hover_labels=[(number, (self.menu_rect[0] + i*94 +15*(i+1) + 28, self.menu_rect[1] + self.menu_radius + 4))]))
+
+        panel.blit(py.font.Font.render(self.smol_text, 'High Scores', True, (0, 0, 0, 150)), ((self.menu_rect[0] + 5, self.menu_rect[1] + self.menu_radius + 70)))
+        panel.blit(py.font.Font.render(self.smol_text, 'Fastest Times', True, (0, 0, 0, 150)), ((self.menu_rect[0] + 5, self.menu_rect[1] + self.menu_radius + 90)))
+
+        for i in range(5):
+            panel.blit(py.font.Font.render(self.menu_text, str(self.high_scores[i+1][2]), True, (0, 0, 0, 150)), ((self.menu_rect[0] + i*94 +15*(i+1) + 60, self.menu_rect[1] + self.menu_radius + 70)))
         
+        for i in range(5):
+            if self.levels[i+1]['Time'] == '99:59:59':
+                panel.blit(py.font.Font.render(self.menu_text, 'N/A', True, (0, 0, 0, 150)), ((self.menu_rect[0] + i*94 +15*(i+1) + 32, self.menu_rect[1] + self.menu_radius + 100)))
+            else:
+                panel.blit(py.font.Font.render(self.menu_text, str(self.levels[i+1]['Time']), True, (0, 0, 0, 150)), ((self.menu_rect[0] + i*94 +15*(i+1) + 32, self.menu_rect[1] + self.menu_radius + 100)))
+
+        # draw the settings "button"
+        py.draw.rect(panel, (150, 150, 150, 150), (self.menu_rect[0] + 15, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 0, 25)
+        py.draw.rect(panel, (0, 0, 0, 150), (self.menu_rect[0] + 15, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 2, 25)
+        panel.blit(py.font.Font.render(self.title_text, 'Settings', True, (0, 0, 0, 150)), ((self.menu_rect[0] + 52, self.menu_rect[1] + self.menu_radius + 145)))
+        menu.add_button('settings', Button((self.menu_rect[0] + 15, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 
+                                           hover_labels=[(py.font.Font.render(self.title_text, 'Settings', True, (0, 0, 0)), (self.menu_rect[0] + 52, self.menu_rect[1] + self.menu_radius + 145))]))
+
+        # draw the exit "button"
+        py.draw.rect(panel, (150, 150, 150, 150), (self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 0, 25)
+        py.draw.rect(panel, (0, 0, 0, 150), (self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 2, 25)
+        panel.blit(py.font.Font.render(self.title_text, 'Exit', True, (0, 0, 0, 150)), ((self.menu_rect[0] + 409, self.menu_rect[1] + self.menu_radius + 145)))
+        menu.add_button('exit', Button((self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 
+                                       hover_labels=[(py.font.Font.render(self.title_text, 'Exit', True, (0, 0, 0)), (self.menu_rect[0] + 409, self.menu_rect[1] + self.menu_radius + 145))]))
+
+        # draw my logo
+        menu.add_overlay(self.logo, (self.menu_rect[0] + 245, self.menu_rect[1] + self.menu_radius + 140))
+        return menu
+
+    def build_settings_menu(self) -> Menu:
+        """
+        Builds the settings menu for the current volume.
+
+        :return: the settings Menu, with the resolution, volume, wipe data and main menu "buttons"
+        """
+        menu = self.build_menu_background("Settings", 215)
+        panel = menu.panel
+
+        # draw the resolutions
+        for i in range(3):
+            resolution = py.font.Font.render(self.title_text, str(640*(i+1))+'x'+str(360*(i+1)), True, (0, 0, 0, 150))
+            py.draw.rect(panel, (150, 150, 150, 150), (self.menu_rect[0] + 15*i + 161*i + 15, self.menu_rect[1] + self.menu_radius + 15, 161, 94), 0, 25)
+            py.draw.rect(panel, (0, 0, 0, 150), (self.menu_rect[0] + 15*i + 161*i + 15, self.menu_rect[1] + self.menu_radius + 15, 161, 94), 2, 25)
+            panel.blit(resolution, ((self.menu_rect[0] + 15*i + 150*i + 35, self.menu_rect[1] + self.menu_radius + 35)))
+            menu.add_button(i+5, Button((self.menu_rect[0] + 15*i + 161*i + 15, self.menu_rect[1] + self.menu_radius + 15, 161, 94), 
+                                        hover_labels=[(resolution, (self.menu_rect[0] + 15*i + 150*i + 35, self.menu_rect[1] + self.menu_radius + 35))]))
+
+        # draw the volume editor
+        py.draw.rect(panel, (150, 150, 150, 150), (self.menu_rect[0] + 15, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 0, 25)
+        py.draw.rect(panel, (0, 0, 0, 150), (self.menu_rect[0] + 15, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 2, 25)
+        panel.blit(py.font.Font.render(self.title_text, 'Volume: '+str(self.volume), True, (0, 0, 0, 150)), ((self.menu_rect[0] + 25, self.menu_rect[1] + self.menu_radius + 145)))
+        menu.add_button('settings', Button((self.menu_rect[0] + 15, self.menu_rect[1] + self.menu_radius + 124, 203, 94)))
+
+        # draw the wipe data button
+        py.draw.rect(panel, (150, 150, 150, 150), (self.menu_rect[0] + 342, self.menu_rect[1]+3, 150, 47), 0, 25)
+        py.draw.rect(panel, (0, 0, 0, 150), (self.menu_rect[0] + 342, self.menu_rect[1]+3, 150, 47), 2, 25)
+        panel.blit(py.font.Font.render(self.normal_text, 'Wipe Data', True, (0, 0, 0, 150)), ((self.menu_rect[0] + 365, self.menu_rect[1] +10)))
+        menu.add_button('wipe', Button((self.menu_rect[0] + 342, self.menu_rect[1]+3, 150, 47)))
+
+        # draw the return to main menu "button"
+        py.draw.rect(panel, (150, 150, 150, 150), (self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 0, 25)
+        py.draw.rect(panel, (0, 0, 0, 150), (self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 2, 25)
+        panel.blit(py.font.Font.render(self.title_text, 'Main Menu', True, (0, 0, 0, 150)), ((self.menu_rect[0] + 365, self.menu_rect[1] + self.menu_radius + 145)))
+        menu.add_button('exit', Button((self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 
+                                       hover_labels=[(py.font.Font.render(self.title_text, 'Main Menu', True, (0, 0, 0)), (self.menu_rect[0] + 365, self.menu_rect[1] + self.menu_radius + 145))]))
+
+        menu.add_overlay(self.logo, (self.menu_rect[0] + 245, self.menu_rect[1] + self.menu_radius + 140))
+        return menu
+
+    def build_win_menu(self) -> Menu:
+        """
+        Builds the win screen for the score of the level just completed.
+
+        :return: the win Menu, with the return to main menu "button"
+        """
+        menu = self.build_menu_background("YOU WIN", 200)
+        panel = menu.panel
+
+        # draw the return to main menu "button"
+        return_to = py.font.Font.render(self.title_text, 'Return to', True, (0, 0, 0, 150))
+        main_menu = py.font.Font.render(self.title_text, 'Main Menu', True, (0, 0, 0, 150))
+        py.draw.rect(panel, (150, 150, 150, 150), (self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 0, 25)
+        py.draw.rect(panel, (0, 0, 0, 150), (self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 2, 25)
+        panel.blit(return_to, ((self.menu_rect[0] + 365, self.menu_rect[1] + self.menu_radius + 125)))
+        panel.blit(main_menu, ((self.menu_rect[0] + 365, self.menu_rect[1] + self.menu_radius + 165)))
+        menu.add_button('exit', Button((self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 
+                                       hover_labels=[(return_to, (self.menu_rect[0] + 365, self.menu_rect[1] + self.menu_radius + 125)), 
+                                                     (main_menu, (self.menu_rect[0] + 365, self.menu_rect[1] + self.menu_radius + 165))]))
+
+        menu.add_overlay(py.font.Font.render(self.title_text, f"Carrots: {self.score}", True, 'black'), (self.menu_rect[0]+55, self.menu_rect[1]+self.menu_radius+35))
+        menu.add_overlay(py.font.Font.render(self.title_text, f"Radishes: {self.super_score}", True, 'black'), (self.menu_rect[0]+55, self.menu_rect[1]+self.menu_radius+95))
+        menu.add_overlay(py.font.Font.render(self.title_text, f"Score: {self.score*10 + self.super_score*100}", True, 'black'), (self.menu_rect[0]+55, self.menu_rect[1]+self.menu_radius+155))
+        return menu
+
+    def draw_menu(self, menu) -> None:
+        """
+        Draws the background, the clouds and the given menu onto the display, and makes
+        the menu's hit-test rects the ones menu_events checks.
+
+        :param menu: the Menu to draw
+        :return: None
+        """
+        # draw background so we don't have an abyss
+        self.display.blit(self.background(), (0, 0))
+
+        self.clouds.update(BASE_TICK_RATE / self.fps) # menus update once a frame, so the clouds keep their speed at any frame rate
+        self.clouds.render(self.display)
+
+        self.rects = menu.hit_rects(self.scale)
+        menu.render(self.display, py.mouse.get_pos(), self.scale)
+
+        #* convert what the preloader has decoded, then build the level's animations and tiles once everything is in
+        if self.preloader.finish() and self.preloader.thread != None and ('atlas', 'level') not in ASSETS.cache:
+            ASSETS.get(('atlas', 'level'), lambda: Atlas(self.load_level_assets(), LEVEL_TILES))
+
     def menu_events(self):
         """
         Handles all events while in the main menu or settings menu.
@@ -226,19 +434,17 @@ class Game:
 
             if event.type == py.MOUSEBUTTONDOWN and self.settings_loop == True:
                 if self.rects[5].collidepoint(py.mouse.get_pos()):
-                    self.screen = py.display.set_mode((640, 360)) 
-                    self.scale = 1
+                    self.set_resolution((640, 360), 1)
                 if self.rects[6].collidepoint(py.mouse.get_pos()):
-                    self.screen = py.display.set_mode((1280, 720)) 
-                    self.scale = 2
+                    self.set_resolution((1280, 720), 2)
                 if self.rects[7].collidepoint(py.mouse.get_pos()):
-                    self.screen = py.display.set_mode((1920, 1080-64)) 
-                    self.scale = 3
+                    self.set_resolution((1920, 1080-64), 3)
                 if self.rects['settings'].collidepoint(py.mouse.get_pos()):
                     self.volume += 10
                     if self.volume > 100:
                         self.volume = 0
                     py.mixer.music.set_volume(self.volume)
+                    self.menus['settings'] = self.build_settings_menu()
                 if self.rects['exit'].collidepoint(py.mouse.get_pos()):
                     self.title_screen_loop = True
                 if self.rects['wipe'].collidepoint(py.mouse.get_pos()):
@@ -258,120 +464,81 @@ class Game:
         """
         self.title_screen_loop = False
         self.settings_loop = True
+        self.menus['settings'] = self.build_settings_menu()
         while self.settings_loop:
             if self.title_screen_loop == True:
                 self.settings_loop = False
                 self.run_menu()
-            self.display.blit(py.transform.scale(self.assets['background'], self.display.get_size()), (0, 0))
-
-            self.clouds.update()
-            self.clouds.render(self.display)
-
-            self.rects = {0: py.Rect((self.menu_rect[0]+15)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 94*self.scale, 94*self.scale),
-                    1: py.Rect((self.menu_rect[0]+15*2 + 94)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 94*self.scale, 94*self.scale),
-                    2: py.Rect((self.menu_rect[0]+15*3 + 94*2)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 94*self.scale, 94*self.scale),
-                    3: py.Rect((self.menu_rect[0]+15*4 + 94*3)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 94*self.scale, 94*self.scale),
-                    4: py.Rect((self.menu_rect[0]+15*5 + 94*4)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 94*self.scale, 94*self.scale), 
-                    'settings': py.Rect((self.menu_rect[0] + 15)*self.scale, (self.menu_rect[1] + self.menu_radius + 124)*self.scale, 203*self.scale, 94*self.scale),
-                    'exit': py.Rect((self.menu_rect[0] + 342)*self.scale, (self.menu_rect[1] + self.menu_radius + 124)*self.scale, 203*self.scale, 94*self.scale),
-                    5: py.Rect((self.menu_rect[0] + 15)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 161*self.scale, 94*self.scale),
-                    6: py.Rect((self.menu_rect[0] + 15 + 161 + 15)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 161*self.scale, 94*self.scale),
-                    7: py.Rect((self.menu_rect[0] + 15*2 + 161*2 + 15)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 161*self.scale, 94*self.scale),
-                    'wipe': py.Rect((self.menu_rect[0] + 342)*self.scale, (self.menu_rect[1] + 3)*self.scale, 150*self.scale, 47*self.scale)
-                    }
-            
-            # draw the background of the menu
-            py.draw.rect(self.main_menu, (255, 255, 255, 150), self.menu_rect, 0, self.menu_radius)
-            py.draw.rect(self.main_menu, (0, 0, 0, 150), self.menu_rect, 4, self.menu_radius)
-            py.draw.line(self.main_menu, (150, 150, 150, 150), (self.menu_rect[0]+4, self.menu_rect[1] + self.menu_radius), (self.menu_rect[0] + self.menu_rect[2]-5, self.menu_rect[1] + self.menu_radius))
-            
-            # draw the resolutions
-            for i in range(3):
-                py.draw.rect(self.main_menu, (150, 150, 150, 150), (self.menu_rect[0] + 15*i + 161*i + 15, self.menu_rect[1] + self.menu_radius + 15, 161, 94), 0, 25)
-                py.draw.rect(self.main_menu, (0, 0, 0, 150), (self.menu_rect[0] + 15*i + 161*i + 15, self.menu_rect[1] + self.menu_radius + 15, 161, 94), 2, 25)
-                self.main_menu.blit(py.font.Font.render(self.title_text, str(640*(i+1))+'x'+str(360*(i+1)), True, (0, 0, 0, 150)), ((self.menu_rect[0] + 15*i + 150*i + 35, self.menu_rect[1] + self.menu_radius + 35)))
-            if py.Rect((self.menu_rect[0] + 15)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 530*self.scale, 94*self.scale).collidepoint(py.mouse.get_pos()):
-                for i in range(3):
-                    if self.rects[i+5].collidepoint(py.mouse.get_pos()):
-                        py.draw.rect(self.display, (150, 150, 150, 150), (self.menu_rect[0] + 15*i + 161*i + 15, self.menu_rect[1] + self.menu_radius + 15, 161, 94), 0, 25)
-                        py.draw.rect(self.display, (0, 0, 0, 150), (self.menu_rect[0] + 15*i + 161*i + 15, self.menu_rect[1] + self.menu_radius + 15, 161, 94), 2, 25)
-                        self.display.blit(py.font.Font.render(self.title_text, str(640*(i+1))+'x'+str(360*(i+1)), True, (0, 0, 0, 150)), ((self.menu_rect[0] + 15*i + 150*i + 35, self.menu_rect[1] + self.menu_radius + 35)))
-
-            # draw the volume editor
-            py.draw.rect(self.main_menu, (150, 150, 150, 150), (self.menu_rect[0] + 15, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 0, 25)
-            py.draw.rect(self.main_menu, (0, 0, 0, 150), (self.menu_rect[0] + 15, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 2, 25)
-            self.main_menu.blit(py.font.Font.render(self.title_text, 'Volume: '+str(self.volume), True, (0, 0, 0, 150)), ((self.menu_rect[0] + 25, self.menu_rect[1] + self.menu_radius + 145)))
-            if py.Rect((self.menu_rect[0] + 15)*self.scale, (self.menu_rect[1] + self.menu_radius + 124)*self.scale, 203*self.scale, 94*self.scale).collidepoint(py.mouse.get_pos()):
-                py.draw.rect(self.display, (150, 150, 150, 150), (self.menu_rect[0] + 15, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 0, 25)
-                py.draw.rect(self.display, (0, 0, 0, 150), (self.menu_rect[0] + 15, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 2, 25)
-
-            # draw the wipe data button
-            py.draw.rect(self.main_menu, (150, 150, 150, 150), (self.menu_rect[0] + 342, self.menu_rect[1]+3, 150, 47), 0, 25)
-            py.draw.rect(self.main_menu, (0, 0, 0, 150), (self.menu_rect[0] + 342, self.menu_rect[1]+3, 150, 47), 2, 25)
-            self.main_menu.blit(py.font.Font.render(self.normal_text, 'Wipe Data', True, (0, 0, 0, 150)), ((self.menu_rect[0] + 365, self.menu_rect[1] +10)))
-            if py.Rect((self.menu_rect[0] + 342)*self.scale, (self.menu_rect[1] + 3)*self.scale, 150*self.scale, 47*self.scale).collidepoint(py.mouse.get_pos()):
-                py.draw.rect(self.display, (150, 150, 150, 150), (self.menu_rect[0] + 342, self.menu_rect[1]+3, 150, 47), 0, 25)
-                py.draw.rect(self.display, (0, 0, 0, 150), (self.menu_rect[0] + 342, self.menu_rect[1]+3, 150, 47), 2, 25)
-            
-            # draw the return to main menu "button"
-            py.draw.rect(self.main_menu, (150, 150, 150, 150), (self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 0, 25)
-            py.draw.rect(self.main_menu, (0, 0, 0, 150), (self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 2, 25)
-            self.main_menu.blit(py.font.Font.render(self.title_text, 'Main Menu', True, (0, 0, 0, 150)), ((self.menu_rect[0] + 365, self.menu_rect[1] + self.menu_radius + 145)))
-            if py.Rect((self.menu_rect[0] + 342)*self.scale, (self.menu_rect[1] + self.menu_radius + 124)*self.scale, 203*self.scale, 94*self.scale).collidepoint(py.mouse.get_pos()):
-                py.draw.rect(self.display, (150, 150, 150, 150), (self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 0, 25)
-                py.draw.rect(self.display, (0, 0, 0, 150), (self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 2, 25)
-                self.display.blit(py.font.Font.render(self.title_text, 'Main Menu', True, (0, 0, 0)), ((self.menu_rect[0] + 365, self.menu_rect[1] + self.menu_radius + 145)))
-
-            self.display.blit(self.main_menu, (0,0))
-            self.display.blit(py.font.Font.render(self.title_text, "Settings", True, 'black'), (self.menu_rect[0]+215, self.menu_rect[1]+5))
-
-            self.display.blit(self.logo, (self.menu_rect[0] + 245, self.menu_rect[1] + self.menu_radius + 140))
+            self.draw_menu(self.menus['settings'])
 
             self.menu_events()
 
             # update the window
-            self.screen.blit(py.transform.scale(self.display, self.screen.get_size()), (0, 0)) # scales the diplay to the screen size
-            py.display.flip()
-            self.clock.tick(60) # limit FPS to 60 per second
+            self.present()
 
     def setup_level(self, level: int) -> None:
         """
-        Sets up the game for a level.
+        Sets up the game for a level and runs it.
 
-        This function sets up the game state to begin a new level. This includes loading
-        the assets, assembling the level, setting up the player and camera, and initializing
-        scores and other game variables.
+        This function starts the level with start_level and then runs the level loop.
 
         Parameters:
             level (int): The level number to load.
         """
         self.title_screen_loop = False
+        self.start_level(level)
+        self.run_level()
+
+    def start_level(self, level: int, seed=None) -> None:
+        """
+        Sets up the game state to begin a new level, without running the level loop.
+
+        This includes loading the assets, assembling the level, setting up the player and camera,
+        and initializing scores and other game variables. A headless game calls this directly and
+        then advances the level with step.
+
+        Everything random in the level comes from rng, so the seed and the keys held each tick
+        are all it takes to play the level the same way again. They're recorded in recording.
+
+        Parameters:
+            level (int): The level number to load.
+            seed (int, optional): The seed of the level's random numbers. Defaults to a random seed.
+
+        Attributes:
+            seed (int): The seed of the level's random numbers.
+            rng (random.Random): The level's random numbers, used by the enemies.
+            held_keys (int): The keys held down, as a combination of INPUT_LEFT, INPUT_RIGHT and INPUT_JUMP.
+            input_state (int): The keys held during the last tick, see apply_input.
+            recording (Recording): The keys held during every tick of the level so far.
+            replayable (bool): Whether recording can play the run back. Debug movement and ending the level
+                with SHIFT + ` aren't recorded, so using either makes the run unreplayable and it isn't saved.
+            deaths (int): The number of times the level has been reset.
+            most_carrots (int): The most carrots collected in an attempt that ended in a reset.
+            most_radishes (int): The most radishes collected in an attempt that ended in a reset.
+        """
         self.level_loop = True
+        self.seed = seed if seed != None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        self.held_keys = 0
+        self.input_state = 0
+        self.recording = Recording(level, self.seed, self.tick_rate)
+        self.replayable = True
+        if level not in self.levels and os.path.exists(f'data/save_data/save{level}.json'):
+            self.load(level)
         
         #* assets of the game
-        self.assets = {
-            'player': load_image('entities/player/player_test.png'),
-            'dirt': load_images('tiles/dirt'),
-            'empty_dirt': load_images('tiles/empty_dirt'),
-            'air': load_images('tiles/air'),
-            'clouds': load_images('clouds'),
-            'background': load_image('Background.png'),
-            'collectible/carrot': Animation(load_images('tiles/collectible/carrot')),
-            'collectible/radish': Animation(load_images('tiles/collectible/radish')),
-            'collectible/finish': Animation(load_images('tiles/collectible/z_finish')),
-            'player/idle': Animation(load_images('entities/player')),
-            'tick_enemy/idle': Animation(load_images('entities/tick_enemy')),
-            'dung_enemy/idle': Animation(load_images('entities/dung_enemy')),
-            'projectile/idle': Animation(load_images('entities/projectiles')),
-            'mole_enemy/idle': Animation(load_images('entities/mole_enemy')),
-        }
+        self.assets = self.load_level_assets()
+        self.atlas = ASSETS.get(('atlas', 'level'), lambda: Atlas(self.assets, LEVEL_TILES))
 
-        #* Assemble the level
+        #* Assemble the level, from its first tick
+        self.frame_count = 0
         self.tilemap = Tilemap(self)
         self.clouds = Clouds(self.assets['clouds'])
         self.player = Player(self, (100, 200), (16, 16))
         self.load_level(level)
         self.scroll = [self.player.pos[0] - self.display.get_width()/2, self.player.pos[1] - self.display.get_height()/2]
+        self.prev_scroll = list(self.scroll)
+        self.update_visibility()
 
         #* Player variables
         global jump, jump_time
@@ -383,161 +550,375 @@ class Game:
         self.score = 0 # for carrots
         self.super_score = 0 # for radishes
 
-        self.run_level()
+        #* Level state
+        self.debug = False
+        self.reset = False
+        self.level_complete = False
+        self.deaths = 0
+        self.most_carrots = 0
+        self.most_radishes = 0
+
+    def step(self, frames=1) -> int:
+        """
+        Advances the current level by the given number of ticks as fast as possible.
+
+        Only the simulation runs: nothing is rendered, no events are read (the keys in held_keys
+        stay held) and the frame rate isn't limited. Stops early if the level ends.
+
+        Parameters:
+            frames (int, optional): The number of ticks to simulate. Defaults to 1.
+
+        Returns:
+            int: The number of ticks that were simulated.
+        """
+        for frame in range(frames):
+            if not self.level_loop:
+                return frame
+            self.update_level()
+        return frames
+
+    def play_recording(self, recording) -> dict:
+        """
+        Plays a recorded run of a level back as fast as possible, from the start of the level.
+
+        The level is started with the recording's seed and every tick is simulated holding the
+        recorded keys, as with step, so the run plays out exactly as it was recorded. Meant for a
+        headless game, as the win screen would otherwise open when the level is completed.
+
+        Parameters:
+            recording (Recording): The run to play.
+
+        Returns:
+            dict: How the run went: whether the level was completed, the ticks simulated, the level
+                time in seconds, the deaths, the carrots and radishes collected (at the end and in the
+                best attempt, out of the level's total) and where the player ended up.
+
+        Raises:
+            ValueError: If the run was recorded at a different tick rate.
+        """
+        if recording.tick_rate != self.tick_rate:
+            raise ValueError(f'the recording is at {recording.tick_rate} ticks per second, but the game runs at {self.tick_rate}')
+        self.start_level(recording.level, recording.seed)
+        for state in recording.states():
+            if not self.level_loop:
+                break
+            self.held_keys = state
+            self.update_level()
+        return {'level': recording.level, 
+                'completed': self.level_complete, 
+                'ticks': self.frame_count, 
+                'time': self.final_time if self.level_complete else self.frame_count * self.dt, 
+                'deaths': self.deaths, 
+                'carrots': self.score, 
+                'radishes': self.super_score, 
+                'most_carrots': max(self.most_carrots, self.score), 
+                'most_radishes': max(self.most_radishes, self.super_score), 
+                'total_carrots': sum(1 for collectible in self.level_snapshot['collectibles'] if collectible['variant'] == 0), 
+                'total_radishes': sum(1 for collectible in self.level_snapshot['collectibles'] if collectible['variant'] == 1), 
+                'player_pos': list(self.player.pos)}
 
     def run_level(self) -> None:
         """
         Runs the main game loop for a level.
 
-        This function handles updating and rendering game entities such as the player,
-        enemies, and collectibles, as well as managing the player's input and jump mechanics.
-        It continuously refreshes the display and updates the game state while the level
-        is active. The function also draws a jump power gauge to visually indicate the player's
-        jump charge level.
+        The time each frame takes is added to an accumulator, and the level is updated with
+        update_level once for every whole tick in it, so the simulation runs at tick_rate whatever
+        the frame rate. The frame is then drawn with render_level, between the last two ticks by
+        the fraction of a tick left over. Each frame also handles the player's input, draws the
+        overlay and presents the frame. While the profiler is on, each stage of the frame is timed.
+        """
+        accumulator = 0
+        previous = time.perf_counter()
+        while self.level_loop: 
+            self.profiler.start_frame()
+            now = time.perf_counter()
+            accumulator += min(now - previous, MAX_FRAME_TIME)
+            previous = now
+
+            while accumulator >= self.dt and self.level_loop:
+                self.update_level()
+                accumulator -= self.dt
+
+            self.render_level(accumulator / self.dt)
+
+            self.player_input() # handles player inputs
+            self.profiler.lap(PROFILE_INPUT)
+
+            self.draw_overlay()
+
+            self.present()
+            self.profiler.end_frame()
+
+    def update_level(self) -> None:
+        """
+        Runs one tick of the level's simulation.
+
+        This function applies and records the held keys, handles the jump charge, moves the camera and
+        the clouds, and updates the player, collectibles, enemies and projectiles, freeing the slots of
+        the projectiles that hit something. Only the collectibles and enemies found within the simulation
+        margin by update_visibility are updated. The positions from before the tick are kept so rendering
+        can interpolate.
 
         Global Variables:
             jump (bool): A flag indicating if the jump is being charged.
             jump_time (float): The duration for which the jump has been charged.
 
         Attributes:
-            game_overlay (pygame.Surface): An overlay surface for rendering UI elements like the jump gauge.
             scroll (list): The camera's scrolling offset, dynamically adjusted based on the player's position.
+            prev_scroll (list): The camera's scrolling offset before the tick.
+            frame_count (int): The number of ticks simulated since the level started.
+            collectible_bob (float): How far the collectibles have bobbed from where they spawned, shared so
+                the collectibles that aren't updated stay in step with the rest.
         """
-
         global jump, jump_time
 
-        self.debug = False
+        self.apply_input(self.held_keys)
+        self.recording.record(self.input_state)
 
-        self.game_overlay = py.Surface((640, 360), py.SRCALPHA)
+        if self.reset == True:
+            self.reset = False
+            self.reset_level()
 
-        self.start_time = time.time()
+        #* remember where everything was, so rendering can interpolate to where it is now
+        self.prev_scroll[0] = self.scroll[0]
+        self.prev_scroll[1] = self.scroll[1]
+        self.player.remember_pos()
+        for collectible in self.simulated_collectibles:
+            collectible.remember_pos()
+        for enemy in self.simulated_enemies:
+            enemy.remember_pos()
+        self.projectiles.remember_pos()
 
-        self.reset = False
+        if jump == True:
+            jump_time = min(10, round(max(4, jump_time + 1/15 * self.tick_scale), 2))
 
-        while self.level_loop: 
-            self.display.blit(py.transform.scale(self.assets['background'], self.display.get_size()), (0, 0))
+        self.scroll[0] += (self.player.rect().centerx - self.display.get_width() /2 - self.scroll[0]) / 30 * self.tick_scale
+        self.scroll[1] += (self.player.rect().centery - self.display.get_height() /2 - self.scroll[1]) / 12 * self.tick_scale
 
-            self.game_overlay.fill((0, 0, 0, 5))
+        self.clouds.update(self.tick_scale)
 
-            self.scroll[0] += (self.player.rect().centerx - self.display.get_width() /2 - self.scroll[0]) / 30
-            self.scroll[1] += (self.player.rect().centery - self.display.get_height() /2 - self.scroll[1]) / 12
-            render_scroll = (int(self.scroll[0]), int(self.scroll[1]))
+        self.update_visibility()
+        self.profiler.lap(PROFILE_SIMULATION)
 
-            self.clouds.update()
-            self.clouds.render(self.display, offset=render_scroll)
- 
-            self.tilemap.render(self.display, offset=render_scroll)
+        self.player.update()
+        self.player.update()
+        self.profiler.lap(PROFILE_PLAYER)
 
-            self.player.update()
-            self.player.render(self.display, offset=render_scroll)
-            self.player.update()
+        level_ms = self.frame_count * 1000 / self.tick_rate # the bob follows the level's ticks, so every run of a level bobs the same
+        self.collectible_bob += math.sin(level_ms/250) * 0.5 * self.tick_scale
+        for collectible in self.simulated_collectibles:
+            collectible.update()
+        self.profiler.lap(PROFILE_COLLECTIBLES)
 
-            for collectible in self.collectibles:
-                collectible.update()
-                collectible.render(self.display, offset=render_scroll)
+        self.enemy_grid.rebuild(self.enemies)
+        if self.tick_swarm != None:
+            self.tick_swarm.step()
+        for enemy in self.simulated_enemies:
+            enemy.update()
+        self.profiler.lap(PROFILE_ENEMIES)
 
-            for enemy in self.enemies:
-                enemy.update()
-                enemy.render(self.display, offset=render_scroll)
+        self.projectiles.update()
+        self.profiler.lap(PROFILE_PROJECTILES)
 
-            self.projectiles_to_delete = []
-            for projectile in self.projectiles.values():
-                projectile.update()
-                projectile.render(self.display, offset=render_scroll)
+        self.frame_count += 1
 
-            for projectile in self.projectiles_to_delete:
-                try:
-                    self.projectiles_id.remove(projectile)
-                    del self.projectiles[projectile]
-                except ValueError:
-                    pass
-            self.projectiles_to_delete.clear()
+    def update_visibility(self) -> None:
+        """
+        Works out, once per tick, which collectibles and enemies exist, which are updated and which are drawn.
 
-            self.player_input() # handles player inputs
+        The spawner indexes first create the collectibles and enemies coming near the screen and put
+        back the ones far from it, and the tick swarm is made again if the enemies changed. Then the
+        collectibles and enemies within SIMULATION_MARGIN pixels of the screen are updated, and
+        the ones within RENDER_MARGIN pixels are drawn. The margin around the screen when drawing
+        covers the camera and the entities moving between ticks. The lists are made anew each time,
+        so the loops still going over the old ones when the level is reset are unaffected.
+
+        Attributes:
+            simulated_collectibles (list): The collectibles near enough to the screen to be updated.
+            simulated_enemies (list): The enemies near enough to the screen to be updated.
+            visible_collectibles (list): The collectibles near enough to the screen to be drawn.
+            visible_enemies (list): The enemies near enough to the screen to be drawn.
+        """
+        self.collectible_spawners.update()
+        if self.enemy_spawners.update():
+            self.build_tick_swarm()
+        self.simulated_collectibles, self.visible_collectibles = self.cull(self.collectibles)
+        self.simulated_enemies, self.visible_enemies = self.cull(self.enemies)
 
-            if self.reset == True:
-                self.reset = False
-                self.reset_level()
+    def cull(self, entities) -> tuple:
+        """
+        Splits out the entities within the simulation margin and the render margin of the screen.
+
+        :param entities: the entities to look through
+        :return: the entities within SIMULATION_MARGIN of the screen and the ones within RENDER_MARGIN, each in their original order
+        """
+        sim_left, sim_top = self.scroll[0] - SIMULATION_MARGIN, self.scroll[1] - SIMULATION_MARGIN
+        sim_right, sim_bottom = self.scroll[0] + self.width + SIMULATION_MARGIN, self.scroll[1] + self.height + SIMULATION_MARGIN
+        view_left, view_top = self.scroll[0] - RENDER_MARGIN, self.scroll[1] - RENDER_MARGIN
+        view_right, view_bottom = self.scroll[0] + self.width + RENDER_MARGIN, self.scroll[1] + self.height + RENDER_MARGIN
+        simulated = []
+        visible = []
+        for entity in entities:
+            x, y = entity.pos
+            w, h = entity.size
+            if x + w >= sim_left and x <= sim_right and y + h >= sim_top and y <= sim_bottom:
+                simulated.append(entity)
+                if x + w >= view_left and x <= view_right and y + h >= view_top and y <= view_bottom:
+                    visible.append(entity)
+        return simulated, visible
+
+    def render_level(self, alpha=1) -> None:
+        """
+        Draws the background, clouds, tilemap and every entity of the level onto the display.
+
+        Args:
+            alpha (float, optional): How far between the last two ticks the level is drawn, from 0 to 1. Defaults to 1.
+        """
+        self.display.blit(self.background(), (0, 0))
+        self.profiler.lap(PROFILE_BACKGROUND)
 
-            if jump == True:
-                jump_time = min(10, round(max(4, jump_time + 1/15), 2))
-            
-            # Draw Jump Power Gauge
-            self.game_overlay.blit(py.font.Font.render(self.normal_text, "Jump Power", False, (0, 0, 0)), (25, 5))
-            py.draw.rect(self.game_overlay, (150, 150, 150, 150), (15, 35, 200, 30), 0, 15) 
-            py.draw.circle(self.game_overlay, (150, 0, 0, 150), (30, 50), 15, 0)
-            
-            if 4 < jump_time:
-                py.draw.rect(self.game_overlay, (150, 0, 0, 150), (27, 35, 190*(jump_time - 4)*1/6-3, 30), 0, 15)
-            if 6 < jump_time:
-                py.draw.rect(self.game_overlay, (150, 150, 0, 150), (27+64, 35, 190*(jump_time - 6)*1/6-3, 30), 0, 15)
-            if 8 < jump_time:
-                py.draw.rect(self.game_overlay, (0, 150, 0, 150), (27+128, 35, 190*(jump_time - 8)*1/6-4, 30), 0, 15)
-            
-            py.draw.rect(self.game_overlay, (0, 0, 0, 150), (15, 35, 200, 30), 2, 15)
+        render_scroll = (int(self.scroll[0] * alpha + self.prev_scroll[0] * (1 - alpha)), int(self.scroll[1] * alpha + self.prev_scroll[1] * (1 - alpha)))
 
-            # Draw Number of carrots & radishes - to show the player how many they've collected 
+        self.clouds.render(self.display, offset=render_scroll, alpha=alpha)
+        self.profiler.lap(PROFILE_CLOUDS)
+ 
+        self.tilemap.render(self.display, offset=render_scroll)
+        self.profiler.lap(PROFILE_TILEMAP)
+
+        self.render_entities(render_scroll, alpha)
+        self.profiler.lap(PROFILE_ENTITIES)
 
-            carrot = load_image("collectibles/carrot.png")
-            radish = load_image("collectibles/radish.png")
+    def render_entities(self, offset=(0, 0), alpha=1) -> None:
+        """
+        Draws the player, collectibles, enemies and projectiles onto the display. Only the collectibles
+        and enemies found near the screen by update_visibility are drawn.
 
-            carrot.set_alpha(200)
-            radish.set_alpha(200)
+        Args:
+            offset (tuple, optional): The camera offset, given as (x, y) coordinates.
+            alpha (float, optional): How far between the last two ticks the entities are drawn, from 0 to 1. Defaults to 1.
+        """
+        self.player.render(self.display, offset=offset, alpha=alpha)
 
-            self.game_overlay.blit(carrot, (520, 15))
-            self.game_overlay.blit(py.font.Font.render(self.normal_text, str(self.score), None, 'black'), (540, 12))
+        for collectible in self.visible_collectibles:
+            if not collectible.is_collected:
+                collectible.render(self.display, offset=offset, alpha=alpha)
 
-            self.game_overlay.blit(radish, (580, 15))
-            self.game_overlay.blit(py.font.Font.render(self.normal_text, str(self.super_score), None, 'black'), (600, 12))
+        for enemy in self.visible_enemies:
+            enemy.render(self.display, offset=offset, alpha=alpha)
 
-            # Draw the time spent in the level
+        self.projectiles.render(self.display, offset=offset, alpha=alpha)
 
-            self.level_time = round(time.time() - self.start_time, 2)
+    def draw_overlay(self) -> None:
+        """
+        Draws the overlay onto the display: the jump power gauge, the number of carrots and radishes
+        collected, and the time spent in the level. The HUD only redraws itself when one of these changes.
+        The frame profiler's overlay is drawn over it while the profiler is on.
+        """
+        # Work out the time spent in the level, in simulated time so it's the same when the run is replayed
 
-            hour = '0'+str(int(self.level_time//3600)) if self.level_time//3600 < 10 else str(int(self.level_time//3600))
-            minute = '0'+ str(int(self.level_time//60 - self.level_time//3600*60)) if self.level_time//60 - self.level_time//3600*60 < 10 else str(int(self.level_time//60 - self.level_time//3600*60))
-            second = '0'+str(int(self.level_time - self.level_time//60*60)) if self.level_time - self.level_time//60*60 < 10 else str(int(self.level_time - self.level_time//60*60))
+        self.level_time = round(self.frame_count * self.dt, 2)
 
-            self.current_time = hour+':'+minute+':'+second
+        hour = '0'+str(int(self.level_time//3600)) if self.level_time//3600 < 10 else str(int(self.level_time//3600))
+        minute = '0'+ str(int(self.level_time//60 - self.level_time//3600*60)) if self.level_time//60 - self.level_time//3600*60 < 10 else str(int(self.level_time//60 - self.level_time//3600*60))
+        second = '0'+str(int(self.level_time - self.level_time//60*60)) if self.level_time - self.level_time//60*60 < 10 else str(int(self.level_time - self.level_time//60*60))
 
-            self.game_overlay.blit(py.font.Font.render(self.normal_text, str(self.current_time), None, 'black'), (530, 47))
+        self.current_time = hour+':'+minute+':'+second
 
-            self.display.blit(self.game_overlay, (0,0))
+        self.hud.update(jump_time, self.score, self.super_score, self.current_time)
+        self.hud.render(self.display)
+        self.profiler.lap(PROFILE_HUD)
+
+        if self.profiler.enabled:
+            self.profiler.render(self.display, 1 / self.fps)
+            self.profiler.lap(PROFILE_PROFILER)
+
+    def present(self) -> None:
+        """
+        Scales the display up to the window, updates the window and limits the frame rate to fps.
+
+        The display is scaled straight into the window when their pixel formats match, and into
+        the reused scaled_display otherwise. It isn't scaled at all when the window is the same
+        size as the display, as with hardware scaling.
+        """
+        size = self.screen.get_size()
+        if size == self.display.get_size():
+            self.screen.blit(self.display, (0, 0))
+        else:
+            if self.scaled_display == None or self.scaled_display.get_size() != size:
+                if self.screen.get_bitsize() == self.display.get_bitsize() and self.screen.get_masks() == self.display.get_masks():
+                    self.scaled_display = self.screen
+                else:
+                    self.scaled_display = py.Surface(size, 0, self.display)
+            py.transform.scale(self.display, size, self.scaled_display)
+            if self.scaled_display != self.screen:
+                self.screen.blit(self.scaled_display, (0, 0))
+        py.display.flip()
+        self.profiler.lap(PROFILE_PRESENT)
+        self.clock.tick(self.fps) # limit the frame rate
+        self.profiler.lap(PROFILE_WAIT)
+
+    def set_resolution(self, size, scale) -> None:
+        """
+        Opens the window at the given size, with the display scaled up by the given factor.
+
+        With hardware scaling the window is opened at the display's size with pygame.SCALED and
+        SDL picks how big it is shown, so the size is ignored and the scale is 1, as mouse
+        positions are then already in display coordinates. If SDL can't scale, hardware scaling
+        is turned off.
+
+        :param size: the size of the window, as (width, height)
+        :param scale: the scale of the window compared to the display, used for mouse positions
+        :return: None
+        """
+        if self.hardware_scaling:
+            try:
+                self.screen = py.display.set_mode((self.width, self.height), py.SCALED)
+                self.scale = 1
+                self.scaled_display = None # the window surface may have been replaced
+                return
+            except py.error:
+                # SDL couldn't make a renderer to scale with, so scale in software instead
+                self.hardware_scaling = False
+        self.screen = py.display.set_mode(size)
+        self.scale = scale
+        self.scaled_display = None # the window surface may have been replaced
+
+    def background(self) -> py.Surface:
+        """
+        Returns the background scaled to the size of the display, scaling it only the first time
+        and whenever the background image changes.
 
-            # updates the window
-            self.screen.blit(py.transform.scale(self.display, self.screen.get_size()), (0, 0))
-            py.display.flip()
-            self.clock.tick(60) # limit FPS to 60 per second
+        :return: the scaled background
+        """
+        if self.scaled_background == None or self.background_source != self.assets['background']:
+            self.background_source = self.assets['background']
+            self.scaled_background = py.transform.scale(self.background_source, self.display.get_size())
+        return self.scaled_background
         
     def player_input(self) -> None:
         """
-        Handles player input events and updates player state accordingly.
+        Handles player input events and updates the held keys accordingly.
 
         This function processes input events for controlling the player character.
-        It updates the player's velocity and jump state based on keyboard inputs,
-        such as moving left or right and charging or executing a jump. The function
-        also handles exiting the game and ending the level.
-
-        Global Variables:
-            jump (bool): A flag indicating if the jump is being charged.
-            jump_time (float): The duration for which the jump has been charged.
+        The movement and jump keys only update held_keys, which the next tick applies
+        with apply_input, so a run can be recorded and replayed tick by tick. The function
+        also handles exiting the game, toggling debug movement and ending the level.
 
         Handles the following events:
             - QUIT: Exits the game.
             - KEYDOWN:
                 - ESCAPE: Exits the game.
-                - LEFT/A: Moves the player left.
-                - RIGHT/D: Moves the player right.
-                - UP/W/SPACE: Starts charging the player's jump.
-                - M: Ends the current level.
+                - LEFT/A: Holds left.
+                - RIGHT/D: Holds right.
+                - UP/W/SPACE: Holds jump.
+                - M: Toggles debug movement.
+                - F3: Toggles the frame profiler overlay.
+                - SHIFT + `: Ends the current level.
             - KEYUP:
-                - LEFT/A: Stops moving the player left.
-                - RIGHT/D: Stops moving the player right.
-                - UP/W/SPACE: Executes the player's jump if possible.
+                - LEFT/A: Releases left.
+                - RIGHT/D: Releases right.
+                - UP/W/SPACE: Releases jump.
         """
-
-        global jump, jump_time
-
         for event in py.event.get():
             if event.type == py.QUIT:
                 self.exit_game()
@@ -547,110 +928,258 @@ class Game:
                     self.exit_game()
                 if event.key == py.K_m:
                     self.debug = True if self.debug == False else False
-                if self.debug == False:
-                    if event.key == py.K_LEFT or event.key == py.K_a:
-                        # move player left 
-                        self.player.velocity[0] -= self.move_speed
-                    if event.key == py.K_RIGHT or event.key == py.K_d:
-                        # move player right
-                        self.player.velocity[0] += self.move_speed
-                    if event.key == py.K_UP or event.key == py.K_w or event.key == py.K_SPACE:
-                        # start charging the player's jump
-                        jump = True
-                else:
-                    if event.key == py.K_LEFT or event.key == py.K_a:
-                        # move player left 
-                        self.player.velocity[0] = -3*self.move_speed
-                    if event.key == py.K_RIGHT or event.key == py.K_d:
-                        # move player right
-                        self.player.velocity[0] = 3*self.move_speed
-                    if event.key == py.K_UP or event.key == py.K_w or event.key == py.K_SPACE:
-                        # start charging the player's jump
-                        self.player.velocity[1] = -3*self.move_speed
+                    self.replayable = False # debug movement isn't recorded
+                if event.key == py.K_F3:
+                    self.profiler.toggle()
+                if event.key in LEFT_KEYS:
+                    self.held_keys |= INPUT_LEFT
+                if event.key in RIGHT_KEYS:
+                    self.held_keys |= INPUT_RIGHT
+                if event.key in JUMP_KEYS:
+                    self.held_keys |= INPUT_JUMP
                 if py.key.get_pressed()[py.K_BACKQUOTE] and (py.key.get_pressed()[py.K_LSHIFT] or py.key.get_pressed()[py.K_RSHIFT]): 
+                    self.replayable = False # nor is ending the level this way
                     self.end_level() # "complete" the level upon pressing the ~ key
-                
 
             if event.type == py.KEYUP:
-                if self.debug == False:
-                    if event.key == py.K_LEFT or event.key == py.K_a:
-                        # stop moving player left
-                        self.player.velocity[0] += self.move_speed
-                    if event.key == py.K_RIGHT or event.key == py.K_d:
-                        # stop moving player right
-                        self.player.velocity[0] -= self.move_speed
-                    if event.key == py.K_UP or event.key == py.K_w or event.key == py.K_SPACE:
-                        # make the player jump
-                        if self.player.jumps > 0:
-                            self.player.velocity[1] -= (jump_time)
-                        jump_time = 0
-                        jump = False
-                        self.player.jumps = 0
-                else:
-                    if event.key == py.K_LEFT or event.key == py.K_a:
-                        # stop moving player left
-                        self.player.velocity[0] = 0
-                    if event.key == py.K_RIGHT or event.key == py.K_d:
-                        # stop moving player right
-                        self.player.velocity[0] = 0
-                    if event.key == py.K_UP or event.key == py.K_w or event.key == py.K_SPACE:
-                        # make the player jump
-                        self.player.velocity[1] = 0
+                if event.key in LEFT_KEYS:
+                    self.held_keys &= ~INPUT_LEFT
+                if event.key in RIGHT_KEYS:
+                    self.held_keys &= ~INPUT_RIGHT
+                if event.key in JUMP_KEYS:
+                    self.held_keys &= ~INPUT_JUMP
+
+    def apply_input(self, state) -> None:
+        """
+        Updates the player for the keys pressed and released since the last tick.
 
+        Moving and jumping react to a key going down or up rather than to it being held, so
+        the given keys are compared with the ones held during the last tick.
+
+        Global Variables:
+            jump (bool): A flag indicating if the jump is being charged.
+            jump_time (float): The duration for which the jump has been charged.
+
+        Parameters:
+            state (int): The keys held this tick, as a combination of INPUT_LEFT, INPUT_RIGHT and INPUT_JUMP.
+        """
+        global jump, jump_time
+
+        pressed = state & ~self.input_state
+        released = self.input_state & ~state
+        self.input_state = state
+
+        if self.debug == False:
+            if pressed & INPUT_LEFT:
+                # move player left 
+                self.player.velocity[0] -= self.move_speed
+            if pressed & INPUT_RIGHT:
+                # move player right
+                self.player.velocity[0] += self.move_speed
+            if pressed & INPUT_JUMP:
+                # start charging the player's jump
+                jump = True
+            if released & INPUT_LEFT:
+                # stop moving player left
+                self.player.velocity[0] += self.move_speed
+            if released & INPUT_RIGHT:
+                # stop moving player right
+                self.player.velocity[0] -= self.move_speed
+            if released & INPUT_JUMP:
+                # make the player jump
+                if self.player.jumps > 0:
+                    self.player.velocity[1] -= (jump_time)
+                jump_time = 0
+                jump = False
+                self.player.jumps = 0
+        else:
+            if pressed & INPUT_LEFT:
+                # move player left 
+                self.player.velocity[0] = -3*self.move_speed
+            if pressed & INPUT_RIGHT:
+                # move player right
+                self.player.velocity[0] = 3*self.move_speed
+            if pressed & INPUT_JUMP:
+                # move player up
+                self.player.velocity[1] = -3*self.move_speed
+            if released & (INPUT_LEFT | INPUT_RIGHT):
+                # stop moving player sideways
+                self.player.velocity[0] = 0
+            if released & INPUT_JUMP:
+                # stop moving player up
+                self.player.velocity[1] = 0
 
     def load_level(self, map_id=0) -> None:
         """
         Loads a level from a JSON file and initializes all level entities.
 
-        Loads a level from a JSON file and sets up all level entities such as the player, collectibles, and enemies.
-        It also initializes the game's projectile list and sets the current level ID.
-
-        Global Variables:
-            projectiles (dict): A dictionary containing all projectiles in the game, keyed by ID.
-            projectiles_id (list): A list of all projectile IDs.
+        Loads a level from a JSON file and sets up all level entities such as the player, collectibles, and enemies,
+        which are created as the camera comes near them.
+        It also empties the game's projectile pool and sets the current level ID.
+        A level that was loaded or preloaded before is restored from level_cache without reading any file,
+        and a level the preloader is reading right now is waited for rather than read again.
 
         Attributes:
-            collectibles (list): A list of all collectibles in the level.
-            enemies (list): A list of all enemies in the level.
             current_level (int): The ID of the currently loaded level.
+            level_snapshot (dict): The tilemap snapshot and the collectible and spawner lists of the level, used by spawn_entities and restore_level.
         """
-        try:
-            self.tilemap.load(f'data/maps/{map_id}.json')
-        except FileNotFoundError:
-            print("Could not find the Level File(hint: it's a json file)")
-            self.exit_game()
-
         self.current_level = map_id
 
-        self.fastest_time = self.levels[self.current_level]['Fastest_Time']
-        
-        #* creates list to hold all projectiles
-        self.projectiles = {}
-        self.projectiles_id = []
+        self.fastest_time = self.levels.get(self.current_level, {}).get('Fastest_Time', 359999) # levels without save data have no fastest time
+
+        if self.preloader.claim_level(map_id):
+            try:
+                self.level_cache[map_id] = self.read_level(map_id, self.tilemap)
+            except FileNotFoundError:
+                print("Could not find the Level File(hint: it's a json file)")
+                self.exit_game()
+            finally:
+                self.preloader.release_level(map_id)
+
+        #* keep the pristine level around, so resetting or playing it again doesn't need to load it again
+        self.level_snapshot = self.level_cache[map_id]
+        self.tilemap.restore(self.level_snapshot['tilemap']) # does nothing if the level was just read into this tilemap
+        if self.tilemap.collision_cells == None: # the mesh is built with the snapshot, so this is only for a tilemap changed since
+            self.tilemap.build_collision_mesh()
+        self.spawn_entities()
+
+    def read_level(self, map_id, tilemap) -> dict:
+        """
+        Reads a level's map into the given tilemap, takes out its collectibles and spawners and builds its collision mesh.
+
+        If the level has been compiled with scripts/compile_maps.py and the compiled file is
+        not older than the JSON file, the compiled file is loaded instead, unless it's damaged.
+        Nothing here needs the display, so the Preloader calls this on its worker thread.
+
+        :param map_id: the id of the level's map
+        :param tilemap: the Tilemap to read the map into
+        :return: the pristine level, as the tilemap snapshot (collision mesh included) and the collectible and spawner lists
+        :raises FileNotFoundError: if the map doesn't exist
+        """
+        compiled_path = f'data/maps/{map_id}.lvl'
+        if os.path.exists(compiled_path) and os.path.getmtime(compiled_path) >= os.path.getmtime(f'data/maps/{map_id}.json'):
+            try:
+                tilemap.load_compiled(compiled_path)
+            except ValueError: # a damaged compiled file, like one cut short by an interrupted compile, is read from the json file instead
+                tilemap.load(f'data/maps/{map_id}.json')
+        else:
+            tilemap.load(f'data/maps/{map_id}.json')
+
+        collectibles = tilemap.extract([('collectible', 0), ('collectible', 1), ('collectible', 2)])
+        spawners = tilemap.extract([('spawner', 0), ('spawner', 1), ('spawner', 2), ('spawner', 3)])
+        for spawner in spawners:
+            if spawner['variant'] == 3:
+                # moles hide in a dirt tile
+                tilemap.set_tile((int(spawner['pos'][0]/tilemap.tile_size), int(spawner['pos'][1]/tilemap.tile_size)), 'dirt', 4)
+        tilemap.build_collision_mesh() # built here, so it's built on the Preloader's worker thread rather than at level start
+        return {'tilemap': tilemap.snapshot(), 'collectibles': collectibles, 'spawners': spawners}
+
+    def spawn_entities(self) -> None:
+        """
+        Places the player and sets up the spawner indexes of the collectibles and enemies of the current level from its snapshot.
+
+        No collectible or enemy is created here. update_visibility creates them once the camera is
+        placed, and then as it comes near them, so starting a level only takes as long as the part
+        of it around the player.
+
+        Attributes:
+            projectiles (ProjectilePool): The projectiles in the air, emptied here.
+            registry (EntityRegistry): The IDs of the enemies, emptied here.
+            collectible_spawners (SpawnerIndex): The collectibles of the level, created or waiting to be.
+            enemy_spawners (SpawnerIndex): The enemies of the level, created or waiting to be.
+            collectibles (list): The collectibles created and not yet collected or put back.
+            enemies (list): The enemies created and not yet put back.
+            tick_swarm (TickSwarm): The swarm moving the tick enemies created, or None.
+            collectible_bob (float): How far the collectibles have bobbed, from 0 as they spawn.
+            attempt_start (int): The tick the current attempt at the level started on, when the level was started or last reset.
+        """
+        self.attempt_start = self.frame_count
+
+        #* empties the projectile pool, keeping its slots for the next projectiles
+        self.projectiles.clear()
 
         #* collectibles
-        self.collectibles = []
-        for collectible in self.tilemap.extract([('collectible', 0), ('collectible', 1), ('collectible', 2)]):
-            if collectible['variant'] == 0:
-                self.collectibles.append(Collectible(self, collectible['pos'], (16, 16)))
-            elif collectible['variant'] == 1:
-                self.collectibles.append(Collectible(self, collectible['pos'], (16, 16), 1))
-            else: 
-                self.collectibles.append(Collectible(self, collectible['pos'], (16, 16), 2))
+        self.collectible_spawners = SpawnerIndex(self, self.level_snapshot['collectibles'], self.create_collectible, self.save_collectible)
+        self.collectibles = self.collectible_spawners.entities
+        self.collectible_bob = 0
         
         #* enemies
-        self.enemies = []
-        self.enemies_id = []
-        for spawner in self.tilemap.extract([('spawner', 0), ('spawner', 1), ('spawner', 2), ('spawner', 3)]):
+        enemies = []
+        for spawner in self.level_snapshot['spawners']:
             if spawner['variant'] == 0:
-                self.player.pos = spawner['pos']
-            elif spawner['variant'] == 1:
-                self.enemies.append(TickEnemy(self, spawner['pos'], (16, 16)))
-            elif spawner['variant'] == 2: 
-                self.enemies.append(DungEnemy(self, spawner['pos'], (16, 16)))
-            else:
-                self.enemies.append(MoleEnemy(self, spawner['pos'], (16, 16)))
-                self.tilemap.tilemap[str(int(spawner['pos'][0]/self.tilemap.tile_size))+';'+str(int(spawner['pos'][1]/self.tilemap.tile_size))] = {'type': 'dirt', 'variant': 4, 'rotations': 0, 'pos': (int(spawner['pos'][0]/self.tilemap.tile_size), int(spawner['pos'][1]/self.tilemap.tile_size))}
+                self.player.pos = list(spawner['pos'])
+            else: enemies.append(spawner)
+        self.enemy_spawners = SpawnerIndex(self, enemies, self.create_enemy, self.save_enemy)
+        self.enemies = self.enemy_spawners.entities
+        self.registry.clear()
+        self.tick_swarm = None
+        self.player.remember_pos() # the player was moved to its spawn, so it shouldn't be drawn moving there
+
+    def create_collectible(self, spawner) -> Collectible:
+        """
+        Creates the collectible of a spawner record.
+
+        :param spawner: the record, with the collectible's variant and position
+        :return: the collectible
+        """
+        return Collectible(self, spawner['pos'], (16, 16), spawner['variant'])
+
+    def save_collectible(self, collectible) -> dict:
+        """
+        Makes the spawner record a collectible is put back into. It bobs with every other collectible, so only where it spawned is kept.
+
+        :param collectible: the collectible
+        :return: the record
+        """
+        return {'type': 'collectible', 'variant': collectible.variant, 'pos': [collectible.pos[0], collectible.spawn_y]}
+
+    def create_enemy(self, spawner) -> Enemy:
+        """
+        Creates the enemy of a spawner record, in the state it was put back in if it was created before.
+
+        :param spawner: the record, with the enemy's variant and position, and its state if it was put back
+        :return: the enemy
+        """
+        if spawner['variant'] == 1:
+            enemy = TickEnemy(self, spawner['pos'], (ENEMY_SIZE, ENEMY_SIZE))
+        elif spawner['variant'] == 2: 
+            enemy = DungEnemy(self, spawner['pos'], (ENEMY_SIZE, ENEMY_SIZE))
+        else:
+            enemy = MoleEnemy(self, spawner['pos'], (ENEMY_SIZE, ENEMY_SIZE))
+        if 'state' in spawner:
+            enemy.load_state(spawner['state'])
+        return enemy
+
+    def save_enemy(self, enemy) -> dict:
+        """
+        Makes the spawner record an enemy is put back into, with its state so it carries on where it left off, and frees its id.
+
+        :param enemy: the enemy
+        :return: the record
+        """
+        self.registry.remove(enemy.id)
+        return {'type': 'spawner', 'variant': ENEMY_VARIANTS[enemy.enemy_type], 'pos': list(enemy.pos), 'state': enemy.save_state()}
+
+    def build_tick_swarm(self) -> None:
+        """
+        Makes the tick swarm again for the tick enemies created, as they are moved together when there are enough of them for it to be faster.
+        """
+        ticks = [enemy for enemy in self.enemies if enemy.enemy_type == 'tick_enemy']
+        self.tick_swarm = None
+        if self.batch_ticks and len(ticks) >= self.swarm_min_ticks:
+            if self.tile_grid == None or not self.tile_grid.matches(self.tilemap):
+                self.tile_grid = TileGrid(self.tilemap)
+            self.tick_swarm = TickSwarm(self, ticks, self.tile_grid)
+
+    def restore_level(self) -> None:
+        """
+        Puts the current level back the way it was when it was loaded, without reading it from disk again.
+
+        The tilemap is restored from the level snapshot (which does nothing if no tile changed),
+        and the spawner indexes are set up again from the spawn lists.
+        """
+        self.tilemap.restore(self.level_snapshot['tilemap'])
+        self.spawn_entities()
     
     def end_level(self) -> None:
         """
@@ -659,11 +1188,17 @@ class Game:
         This function sets level_loop to False and win_screen_loop to True, 
         then calls the win_menu function to start the win screen loop. 
         It also sets title_screen_loop to True and calls the run_menu function to start the main menu loop.
+        A headless game only marks the level as complete, so step returns. Otherwise the run's
+        recording is saved, and also kept as the fastest run if it beat the level's fastest time.
         
         :return: None
         """
-        self.final_time = time.time() - self.start_time
+        self.final_time = self.frame_count * self.dt
         self.level_loop = False 
+        self.level_complete = True
+        if self.headless:
+            return
+        self.save_recording(fastest=self.final_time < self.fastest_time)
         self.win_screen_loop = True
         self.win_menu()
         self.run_menu()
@@ -671,47 +1206,10 @@ class Game:
     def win_menu(self):
         self.save(self.current_level)
 
+        self.menus['win'] = self.build_win_menu()
+
         while self.win_screen_loop:
-            
-            self.display.blit(py.transform.scale(self.assets['background'], self.display.get_size()), (0, 0))
-
-            self.clouds.update()
-            self.clouds.render(self.display)
-
-            self.rects = {0: py.Rect((self.menu_rect[0]+15)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 94*self.scale, 94*self.scale),
-                    1: py.Rect((self.menu_rect[0]+15*2 + 94)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 94*self.scale, 94*self.scale),
-                    2: py.Rect((self.menu_rect[0]+15*3 + 94*2)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 94*self.scale, 94*self.scale),
-                    3: py.Rect((self.menu_rect[0]+15*4 + 94*3)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 94*self.scale, 94*self.scale),
-                    4: py.Rect((self.menu_rect[0]+15*5 + 94*4)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 94*self.scale, 94*self.scale), 
-                    'settings': py.Rect((self.menu_rect[0] + 15)*self.scale, (self.menu_rect[1] + self.menu_radius + 124)*self.scale, 203*self.scale, 94*self.scale),
-                    'exit': py.Rect((self.menu_rect[0] + 342)*self.scale, (self.menu_rect[1] + self.menu_radius + 124)*self.scale, 203*self.scale, 94*self.scale),
-                    5: py.Rect((self.menu_rect[0] + 15)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 161*self.scale, 94*self.scale),
-                    6: py.Rect((self.menu_rect[0] + 15 + 161 + 15)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 161*self.scale, 94*self.scale),
-                    7: py.Rect((self.menu_rect[0] + 15*2 + 161*2 + 15)*self.scale, (self.menu_rect[1] + self.menu_radius + 15)*self.scale, 161*self.scale, 94*self.scale),
-                    }
-            
-            # draw the background of the menu
-            py.draw.rect(self.main_menu, (255, 255, 255, 150), self.menu_rect, 0, self.menu_radius)
-            py.draw.rect(self.main_menu, (0, 0, 0, 150), self.menu_rect, 4, self.menu_radius)
-            py.draw.line(self.main_menu, (150, 150, 150, 150), (self.menu_rect[0]+4, self.menu_rect[1] + self.menu_radius), (self.menu_rect[0] + self.menu_rect[2]-5, self.menu_rect[1] + self.menu_radius))
-
-            # draw the return to main menu "button"
-            py.draw.rect(self.main_menu, (150, 150, 150, 150), (self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 0, 25)
-            py.draw.rect(self.main_menu, (0, 0, 0, 150), (self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 2, 25)
-            self.main_menu.blit(py.font.Font.render(self.title_text, 'Return to', True, (0, 0, 0, 150)), ((self.menu_rect[0] + 365, self.menu_rect[1] + self.menu_radius + 125)))
-            self.main_menu.blit(py.font.Font.render(self.title_text, 'Main Menu', True, (0, 0, 0, 150)), ((self.menu_rect[0] + 365, self.menu_rect[1] + self.menu_radius + 165)))
-            if py.Rect((self.menu_rect[0] + 342)*self.scale, (self.menu_rect[1] + self.menu_radius + 124)*self.scale, 203*self.scale, 94*self.scale).collidepoint(py.mouse.get_pos()):
-                py.draw.rect(self.display, (150, 150, 150, 150), (self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 0, 25)
-                py.draw.rect(self.display, (0, 0, 0, 150), (self.menu_rect[0] + 342, self.menu_rect[1] + self.menu_radius + 124, 203, 94), 2, 25)
-                self.display.blit(py.font.Font.render(self.title_text, 'Return to', True, (0, 0, 0, 150)), ((self.menu_rect[0] + 365, self.menu_rect[1] + self.menu_radius + 125)))
-                self.display.blit(py.font.Font.render(self.title_text, 'Main Menu', True, (0, 0, 0, 150)), ((self.menu_rect[0] + 365, self.menu_rect[1] + self.menu_radius + 165)))
-
-            self.display.blit(self.main_menu, (0,0))
-            self.display.blit(py.font.Font.render(self.title_text, "YOU WIN", True, 'black'), (self.menu_rect[0]+200, self.menu_rect[1]+5))
-            
-            self.display.blit(py.font.Font.render(self.title_text, f"Carrots: {self.score}", True, 'black'), (self.menu_rect[0]+55, self.menu_rect[1]+self.menu_radius+35))
-            self.display.blit(py.font.Font.render(self.title_text, f"Radishes: {self.super_score}", True, 'black'), (self.menu_rect[0]+55, self.menu_rect[1]+self.menu_radius+95))
-            self.display.blit(py.font.Font.render(self.title_text, f"Score: {self.score*10 + self.super_score*100}", True, 'black'), (self.menu_rect[0]+55, self.menu_rect[1]+self.menu_radius+155))
+            self.draw_menu(self.menus['win'])
 
             self.menu_events()
 
@@ -719,33 +1217,53 @@ class Game:
                 self.win_screen_loop = False
 
             # update the window
-            self.screen.blit(py.transform.scale(self.display, self.screen.get_size()), (0, 0)) # scales the diplay to the screen size
-            py.display.flip()
-            self.clock.tick(60) # limit FPS to 60 per second
+            self.present()
 
     def reset_level(self) -> None:
         global jump, jump_time
         if self.debug == False:
+            self.deaths += 1
+            self.most_carrots = max(self.most_carrots, self.score)
+            self.most_radishes = max(self.most_radishes, self.super_score)
             self.score = 0
             self.super_score = 0
             jump = False
             self.player.jumps = 0
             jump_time = 0
-            self.load_level(self.current_level)
+            self.restore_level()
             self.scroll = [self.player.pos[0] - self.display.get_width()/2, self.player.pos[1] - self.display.get_height()/2]
+            self.prev_scroll = list(self.scroll)
+            self.update_visibility()
         else: pass
 
     def exit_game(self) -> None:
         """
         Exits the game cleanly.
 
-        Closes the pygame window and exits the game.
+        Closes the pygame window and exits the game, saving the recording of the level being played.
 
         :return: None
         """
+        if self.level_loop and not self.headless:
+            self.save_recording()
         py.quit()
         sys.exit()
 
+    def save_recording(self, fastest=False) -> None:
+        """
+        Saves the recording of the current level to data/replays/, replacing the level's last one.
+        A run that can't be played back, see replayable, isn't saved.
+
+        :param fastest: whether the run is the level's fastest, to also save it as level{n}_fastest.json
+        :return: None
+        """
+        if not self.replayable:
+            return
+        os.makedirs(REPLAYS_PATH, exist_ok=True)
+        self.recording.save(f'{REPLAYS_PATH}level{self.current_level}.json')
+        if fastest:
+            self.recording.save(f'{REPLAYS_PATH}level{self.current_level}_fastest.json')
+
     def __str__(self) -> str:
         return "Game"
 
@@ -824,5 +1342,5 @@ class Game:
 
 
 if __name__ == "__main__":
-    game = Game()
+    game = Game(hardware_scaling='--scaled' in sys.argv[1:])
     game.run_menu()
\ No newline at end of file
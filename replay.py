@@ -0,0 +1,73 @@
+import argparse, glob, json, os, sys
+from concurrent.futures import ProcessPoolExecutor
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1' # keeps the printed results valid json
+from game import Game, REPLAYS_PATH
+from scripts.replay import load_recording
+
+game = None # the headless game of this process, created by the first replay
+
+def replay_file(path) -> dict:
+    """
+    Plays a recording back in this process's headless game.
+
+    :param path: the recording's file
+    :return: how the run went, as returned by Game.play_recording
+    """
+    global game
+    if game == None:
+        game = Game(headless=True)
+    return game.play_recording(load_recording(path))
+
+def verify_save(result) -> dict:
+    """
+    Checks a replayed run's time against the fastest time in its level's save file.
+
+    :param result: the replayed run, as returned by Game.play_recording
+    :return: the save's fastest time and whether the run completed the level in exactly that time
+    """
+    with open(f'data/save_data/save{result["level"]}.json', 'r') as f:
+        fastest_time = json.load(f)['Fastest_Time']
+    return {'save_fastest_time': fastest_time,
+            'matches_save': result['completed'] and round(result['time'], 3) == fastest_time}
+
+# Replays every recording given, headless and as fast as possible, and prints or writes the results as json
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Plays recorded runs back headless, to reproduce them and check their results.')
+    parser.add_argument('recordings', nargs='*', help='the recordings to play, as saved in data/replays/')
+    parser.add_argument('--jobs', type=int, default=1, help='the number of recordings to play at once, each in its own process')
+    parser.add_argument('--verify', action='store_true', help="check each run's time against the fastest time in its level's save file, playing every level{n}_fastest.json recording if none are given")
+    parser.add_argument('--compare', help='a file of earlier results to compare against, failing if any run plays out differently')
+    parser.add_argument('--output', help='the file to write the results to, instead of printing them')
+    args = parser.parse_args()
+    if not args.recordings:
+        if not args.verify:
+            parser.error('the recordings to play are required, unless verifying the fastest runs')
+        args.recordings = sorted(glob.glob(f'{REPLAYS_PATH}level*_fastest.json'))
+
+    if args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            runs = list(executor.map(replay_file, args.recordings))
+    else:
+        runs = [replay_file(path) for path in args.recordings]
+    results = dict(zip(args.recordings, runs))
+
+    failed = False
+    if args.verify:
+        for result in results.values():
+            result.update(verify_save(result))
+            failed = failed or not result['matches_save']
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            expected = json.load(f)
+        for path, result in results.items():
+            if path in expected:
+                result['matches_expected'] = all(result[key] == value for key, value in expected[path].items() if key in result and key not in ('save_fastest_time', 'matches_save', 'matches_expected'))
+                failed = failed or not result['matches_expected']
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+    sys.exit(1 if failed else 0)
@@ -8,31 +8,41 @@ class Cloud:
         Args:
             pos (tuple): The initial position of the cloud as a (x, y) tuple.
             img (pygame.Surface): The image of the cloud.
-            speed (float): The speed of the cloud, in pixels per frame.
+            speed (float): The speed of the cloud, in pixels per frame at the base tick rate.
             depth (float): The depth of the cloud, used for sorting clouds for rendering.
+
+        Attributes:
+            prev_x (float): The x position of the cloud before its last update, used to interpolate rendering.
         """
         
         self.pos = list(pos)
+        self.prev_x = self.pos[0]
         self.img = img
         self.speed = speed
         self.depth = depth
     
-    def update(self):
+    def update(self, scale=1):
         """
-        Updates the cloud's position by adding the speed to the x position
+        Updates the cloud's position by adding the speed to the x position, remembering where it was
+
+        Args:
+            scale (float, optional): How much of a base tick rate frame the update covers, the game's tick_scale. Defaults to 1.
         """
         
-        self.pos[0] += self.speed
+        self.prev_x = self.pos[0]
+        self.pos[0] += self.speed * scale
         
-    def render(self, surf, offset=(0, 0)):
+    def render(self, surf, offset=(0, 0), alpha=1):
         """
         Renders the cloud image onto the given surface at a position adjusted by the offset and depth.
 
         Args:
             surf (pygame.Surface): The surface to render the cloud image onto.
             offset (tuple): The offset applied to the cloud's position, affecting its depth, given as (x, y) coordinates.
+            alpha (float, optional): How far between its previous and current position the cloud is drawn, from 0 to 1. Defaults to 1.
         """
-        render_pos = (self.pos[0] - offset[0] * self.depth, self.pos[1] - offset[1] * self.depth)
+        x = self.pos[0] * alpha + self.prev_x * (1 - alpha)
+        render_pos = (x - offset[0] * self.depth, self.pos[1] - offset[1] * self.depth)
         surf.blit(self.img, (render_pos[0] % (surf.get_width() + self.img.get_width()) - self.img.get_width(), render_pos[1] % (surf.get_height() + self.img.get_height()) - self.img.get_height()))
         
 class Clouds:
@@ -56,24 +66,28 @@ class Clouds:
         
         self.clouds.sort(key=lambda x: x.depth)
     
-    def update(self):
+    def update(self, scale=1):
         """
         Updates the position of each cloud in the collection.
 
         Iterates through all clouds and calls their update method,
         which adjusts their positions based on their speed.
+
+        Args:
+            scale (float, optional): How much of a base tick rate frame the update covers, the game's tick_scale. Defaults to 1.
         """
 
         for cloud in self.clouds:
-            cloud.update()
+            cloud.update(scale)
     
-    def render(self, surf, offset=(0, 0)):
+    def render(self, surf, offset=(0, 0), alpha=1):
         """
         Renders all the clouds in the collection onto the given surface at a position adjusted by the offset.
 
         Args:
             surf (pygame.Surface): The surface to render the clouds onto.
             offset (tuple): The offset applied to the cloud's position, affecting its depth, given as (x, y) coordinates.
+            alpha (float, optional): How far between the last two updates the clouds are drawn, from 0 to 1. Defaults to 1.
         """
         for cloud in self.clouds:
-            cloud.render(surf, offset=offset)
\ No newline at end of file
+            cloud.render(surf, offset=offset, alpha=alpha)
\ No newline at end of file
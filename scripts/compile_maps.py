@@ -0,0 +1,30 @@
+import os, sys
+from tilemap import Tilemap
+
+MAPS_PATH = 'data/maps/'
+
+def compile_map(name) -> None:
+    """
+    Compiles a json level into the binary level format, next to the json file.
+
+    Loads data/maps/<name>.json and saves it as data/maps/<name>.lvl, which the game
+    loads instead of the json file for as long as the compiled file is not older. The
+    level is written to a temporary file first and then moved into place, so an
+    interrupted compile never leaves a partly written .lvl file behind.
+
+    :param name: the name of the level, without the file extension
+    :return: None
+    """
+    tilemap = Tilemap(None)
+    tilemap.load(MAPS_PATH + name + '.json')
+    tilemap.save_compiled(MAPS_PATH + name + '.lvl.tmp')
+    os.replace(MAPS_PATH + name + '.lvl.tmp', MAPS_PATH + name + '.lvl')
+    print(f'Compiled {name}.json -> {name}.lvl ({len(tilemap.tilemap)} tiles)')
+
+# Compiles the levels given on the command line, or every json level if none are given
+if __name__ == '__main__':
+    names = sys.argv[1:]
+    if not names:
+        names = sorted(file[:-5] for file in os.listdir(MAPS_PATH) if file.endswith('.json'))
+    for name in names:
+        compile_map(name)
@@ -1,6 +1,6 @@
 import pygame as py
 import sys
-from utils import load_image, load_images
+from utils import Atlas, ASSETS
 from tilemap import Tilemap
 
 RENDER_SCALE = 3.0
@@ -51,12 +51,13 @@ class Editor:
         self.clock = py.time.Clock()
         # assets setup
         self.assets = {
-            'dirt': load_images('tiles/dirt'),
-            'empty_dirt': load_images('tiles/empty_dirt'),
-            'collectible': load_images('tiles/collectible'),
-            'spawner': load_images('tiles/spawners'),
-            'air': load_images('tiles/air'),
+            'dirt': ASSETS.images('tiles/dirt'),
+            'empty_dirt': ASSETS.images('tiles/empty_dirt'),
+            'collectible': ASSETS.images('tiles/collectible'),
+            'spawner': ASSETS.images('tiles/spawners'),
+            'air': ASSETS.images('tiles/air'),
         }
+        self.atlas = Atlas(self.assets)
 
         # scroll movement setup
         self.movement = [False, False, False, False]
@@ -109,7 +110,7 @@ class Editor:
             self.tilemap.render(self.display, offset=render_scroll)
 
             # sets the current tile image to be displayed on the grid
-            current_tile_img = py.transform.rotate(self.assets[self.tile_list[self.tile_group]][self.tile_variant].copy(), -90 * self.rotations)
+            current_tile_img = self.atlas.tile(self.tile_list[self.tile_group], self.tile_variant, self.rotations).copy()
             current_tile_img.set_alpha(100)
 
             if self.rotate == True:
@@ -131,16 +132,15 @@ class Editor:
 
             
             if self.clicking and self.ongrid:
-                self.tilemap.tilemap[str(tile_pos[0]) + ';' + str(tile_pos[1])] = {'type': self.tile_list[self.tile_group], 'variant': self.tile_variant, 'pos': (tile_pos[0], tile_pos[1]), 'rotations': (self.rotations)}
+                self.tilemap.set_tile(tile_pos, self.tile_list[self.tile_group], self.tile_variant, self.rotations)
             if self.right_clicking:
-                tile_location = str(tile_pos[0]) + ';' + str(tile_pos[1])
-                if tile_location in self.tilemap.tilemap and self.ongrid == True:
-                    del self.tilemap.tilemap[tile_location]
+                if self.ongrid == True:
+                    self.tilemap.remove_tile(tile_pos)
                 for tile in self.tilemap.offgrid_tiles.copy():
                     tile_img = self.assets[tile['type']][tile['variant']]
                     tile_r = py.Rect(tile['pos'][0] - self.scroll[0], tile['pos'][1] - self.scroll[1], tile_img.get_width(), tile_img.get_height())
                     if tile_r.collidepoint(self.mouse_pos) and self.ongrid == False:
-                        self.tilemap.offgrid_tiles.remove(tile)
+                        self.tilemap.remove_offgrid_tile(tile)
 
             event_handler(self) 
     
@@ -182,7 +182,7 @@ def event_handler(self) -> None:
             if event.button == 1:
                 self.clicking = True
                 if not self.ongrid:
-                    self.tilemap.offgrid_tiles.append({'type': self.tile_list[self.tile_group], 'variant': self.tile_variant, 'pos': (self.mouse_pos[0] + self.scroll[0], self.mouse_pos[1] + self.scroll[1]), 'rotations': self.rotations})
+                    self.tilemap.add_offgrid_tile({'type': self.tile_list[self.tile_group], 'variant': self.tile_variant, 'pos': (self.mouse_pos[0] + self.scroll[0], self.mouse_pos[1] + self.scroll[1]), 'rotations': self.rotations})
             if event.button == 3:
                 self.right_clicking = True
             
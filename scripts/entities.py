@@ -1,7 +1,19 @@
 import pygame as py
-import math, random
+
+BASE_TICK_RATE = 60 # velocities and accelerations are in pixels per tick at this tick rate
+SIMULATION_MARGIN = 256 # the amount of pixels offscreen before an entity isn't updated
+RENDER_MARGIN = 32 # the amount of pixels offscreen an entity is still drawn, as the camera and the entity move between ticks
+
+#* the directions an entity collided in during its last update, as bits of its collisions
+COLLISION_UP = 1
+COLLISION_DOWN = 2
+COLLISION_LEFT = 4
+COLLISION_RIGHT = 8
 
 class PhysicsEntity:
+    __slots__ = ('game', 'tilemap', 'entity_type', 'pos', 'prev_pos', 'size', 'velocity', 'collisions', 
+                 'flip', 'action', 'anim_offset', 'animation', 'hitbox') # no __dict__, as a level can have hundreds of entities
+
     def __init__(self, game, entity_type:str, pos, size):
         """
         Initializes a PhysicsEntity instance with the given parameters.
@@ -17,29 +29,27 @@ class PhysicsEntity:
             tilemap: The tilemap associated with the game.
             entity_type (str): The type of the entity.
             pos (list): The current position of the entity.
+            prev_pos (list): The position of the entity before the last tick, used to interpolate rendering.
             size (tuple): The size of the entity.
             velocity (list): The current velocity of the entity.
-            collisions (dict): A dictionary tracking collision states in four directions.
-            id_options (list): Possible characters for generating entity IDs.
+            collisions (int): The directions the entity collided in during its last update, as COLLISION_ bits.
             flip (bool): Indicates whether the entity's direction is flipped. True for left, False for right.
             action (str): The current action of the entity. Used for handling sprites easier.
             anim_offset (tuple): The offset of the animation from the entity's position.
-            NULL_RECT (py.Rect): A constant representing a null rectangle.
+            hitbox (py.Rect): The rect returned by rect(), moved to the entity's position on every call rather than made anew.
         """
         self.game = game
         self.tilemap = game.tilemap
         self.entity_type = entity_type
         self.pos = list(pos)
+        self.prev_pos = list(pos)
         self.size = size #! Super important! - the size of the entity must be the same size as the image
         self.velocity = [0, 0]
-        self.collisions = {'up': False, 'down': False, 'left': False, 'right': False} # all directional collisions
-        self.id_options = ['0','1','2','3','4','5','6','7','8', '9', 'A','B','C','D','E','F'] # the options for each position of the id
+        self.collisions = 0 # all directional collisions
         self.flip = False # whether the direction of the entity is flipped
         self.action = '' # the current action of the entity
         self.anim_offset = (0, 0) # the offset of the animation from the entity's position
-        self.offscreen_offset = 256 # the amount of pixels offscreen before the entity isn't updated
-
-        self.NULL_RECT = py.Rect(-1000, -1000, 1, 1) #! THE NULL RECT IS REAL
+        self.hitbox = py.Rect(self.pos[0], self.pos[1], self.size[0], self.size[1])
 
     def update(self, gravity_force=[0.125, True, 0.2]) -> None:
         """
@@ -56,22 +66,19 @@ class PhysicsEntity:
                 Defaults to [0.125, True, 0.2].
         """
 
-        self.collisions = {'up': False, 'down': False, 'left': False, 'right': False} # resets the collisions for the new frame
-
-        # frame movement of the entity to change the position based on the velocity
-        frame_movement = [self.velocity[0], self.velocity[1]]
+        self.collisions = 0 # resets the collisions for the new frame
 
-        # handles horizontal collisions
-        self.horizontal_collision(frame_movement[0])
+        # handles horizontal collisions, moving the entity by its velocity
+        self.horizontal_collision(self.velocity[0] * self.game.tick_scale)
 
         # handles vertical collisions
-        self.vertical_collision(frame_movement[1])
+        self.vertical_collision(self.velocity[1] * self.game.tick_scale)
         
         # handles gravity
         self.gravity(*gravity_force)
 
         # handles normal force
-        if self.collisions['down'] or self.collisions['up']:
+        if self.collisions & (COLLISION_DOWN | COLLISION_UP):
             self.velocity[1] = 0
 
         # handles sprite flipping based on velocity's direction
@@ -81,7 +88,7 @@ class PhysicsEntity:
             self.flip = True
 
         # handles the animation getting updated
-        self.animation.update()
+        self.animation.update(self.game.tick_scale)
 
     
     def horizontal_collision(self, x_movement) -> bool:
@@ -106,12 +113,12 @@ class PhysicsEntity:
             if entity_rect.colliderect(rect):
                 if x_movement > 0:
                     entity_rect.right = rect.left
-                    self.collisions['right'] = True
+                    self.collisions |= COLLISION_RIGHT
                 if x_movement < 0:
                     entity_rect.left = rect.right
-                    self.collisions['left'] = True
+                    self.collisions |= COLLISION_LEFT
                 self.pos[0] = entity_rect.x
-        return (self.collisions['right'] or self.collisions['left'])
+        return bool(self.collisions & (COLLISION_RIGHT | COLLISION_LEFT))
 
     # handles vertical collisions
     def vertical_collision(self, y_movement) -> bool:
@@ -136,12 +143,12 @@ class PhysicsEntity:
             if entity_rect.colliderect(rect):
                 if y_movement > 0:
                     entity_rect.bottom = rect.top
-                    self.collisions['down'] = True
+                    self.collisions |= COLLISION_DOWN
                 if y_movement < 0:
                     entity_rect.top = rect.bottom
-                    self.collisions['up'] = True
+                    self.collisions |= COLLISION_UP
                 self.pos[1] = entity_rect.y
-        return (self.collisions['down'] or self.collisions['up'])
+        return bool(self.collisions & (COLLISION_DOWN | COLLISION_UP))
 
     # handles gravity
     def gravity(self, falling_speed, slow_descent=True, descent_multiplier=0.2) -> None:
@@ -164,6 +171,7 @@ class PhysicsEntity:
             descent_multiplier (float, optional): The multiplier to apply to the
                 falling speed when slow_descent is True. Defaults to 0.2.
         """
+        falling_speed *= self.game.tick_scale
         if not self.is_touching_ground():
             if self.velocity[1] > 0:
                 self.velocity[1] = round(min(5, self.velocity[1] + falling_speed*descent_multiplier if slow_descent else self.velocity[1] + falling_speed), 2)
@@ -187,27 +195,59 @@ class PhysicsEntity:
             return True
         return False    
 
-    def render(self, surface, offset=(0,0)) -> None:
+    def render(self, surface, offset=(0,0), alpha=1) -> None:
         '''
         Renders the entity's current animation onto the given surface at the given offset, with the animation flipped horizontally if the entity is facing left.
         
         Args:
             surface (pygame.Surface): The surface to render the entity onto.
             offset (tuple, optional): The offset from the top left corner of the surface to render the entity at, given as a tuple of (x, y) coordinates. Defaults to (0, 0).
+            alpha (float, optional): How far between its previous and current position the entity is drawn, from 0 to 1. Defaults to 1.
+        '''
+        x = self.pos[0] * alpha + self.prev_pos[0] * (1 - alpha)
+        y = self.pos[1] * alpha + self.prev_pos[1] * (1 - alpha)
+        surface.blit(self.animation.img(self.flip), (x - offset[0] + self.anim_offset[0], y - offset[1] + self.anim_offset[1]))
+
+    def remember_pos(self) -> None:
+        '''
+        Stores the current position as the previous one, before a tick moves the entity.
+        '''
+        self.prev_pos[0] = self.pos[0]
+        self.prev_pos[1] = self.pos[1]
+
+    def save_state(self) -> dict:
+        '''
+        Returns the state the entity needs to carry on where it left off, when it's put back into a spawner record.
+
+        Returns:
+            dict: The entity's position, velocity and direction.
+        '''
+        return {'pos': list(self.pos), 'velocity': list(self.velocity), 'flip': self.flip}
+
+    def load_state(self, state) -> None:
+        '''
+        Puts the entity back in a state from save_state, where it's drawn without moving there.
+
+        Args:
+            state (dict): The state from save_state.
         '''
-        surface.blit(py.transform.flip(self.animation.img(), self.flip, False), (self.pos[0] - offset[0] + self.anim_offset[0], self.pos[1] - offset[1] + self.anim_offset[1]))
+        self.pos = list(state['pos'])
+        self.prev_pos = list(state['pos'])
+        self.velocity = list(state['velocity'])
+        self.flip = state['flip']
 
     def rect(self) -> py.Rect:
         """
         Returns the pygame.Rect representation of the entity's position and size.
 
-        This rectangle is used for collision detection and rendering.
+        This rectangle is used for collision detection and rendering. It's the entity's hitbox,
+        moved to its position, so it's only good until the next call.
 
         Returns:
             py.Rect: A rectangle with the entity's current position and size.
         """
-
-        return py.Rect(self.pos[0], self.pos[1], self.size[0], self.size[1])
+        self.hitbox.update(self.pos[0], self.pos[1], self.size[0], self.size[1])
+        return self.hitbox
     
     def set_action(self, action: str) -> None:
         """
@@ -225,6 +265,9 @@ class PhysicsEntity:
             self.animation = self.game.assets[self.entity_type + '/' + action].copy()
 
 class Player(PhysicsEntity):
+    __slots__ = ('air_time', 'jumps')
+    COYOTE_TIME = 0.25 # the time the player can jump after leaving the ground while they have a jump left
+
     def __init__(self, game, pos, size):
         """
         Initializes a Player instance.
@@ -235,13 +278,11 @@ class Player(PhysicsEntity):
             size (tuple): The size of the player as a (width, height) tuple.
 
         Attributes:
-            COYOTE_TIME (float): The time the player can jump after leaving the ground while they have a jump left.
             air_time (float): The time since the player left the ground.
             jumps (int): The number of jumps the player has left.
         """
 
         super().__init__(game, 'player', pos, size)
-        self.COYOTE_TIME = 0.25 # the time the player can jump after leaving the ground while they have a jump left
         self.air_time = 0 # the time since the player left the ground
         self.jumps = 1
         self.set_action('idle')
@@ -255,8 +296,8 @@ class Player(PhysicsEntity):
         if self.game.debug == False:
             super().update()
         else:
-            self.pos[0] += self.velocity[0]
-            self.pos[1] += self.velocity[1]
+            self.pos[0] += self.velocity[0] * self.game.tick_scale
+            self.pos[1] += self.velocity[1] * self.game.tick_scale
 
         # if collide with enemy / projectile, reset level
 
@@ -274,12 +315,14 @@ class Player(PhysicsEntity):
             self.air_time = 0
             self.jumps = 1
             return answer
-        self.air_time += (1/60) # should add 1 second for every second the player doesn't touch the ground
+        self.air_time += self.game.dt # should add 1 second for every second the player doesn't touch the ground
         if self.air_time > self.COYOTE_TIME:
             self.jumps = 0
         return False
     
 class Collectible(PhysicsEntity):
+    __slots__ = ('is_collected', 'spawn_y', 'variant')
+
     def __init__(self, game, pos, size, variant=0):
         """
         Initializes a Collectible instance with the given parameters.
@@ -296,9 +339,11 @@ class Collectible(PhysicsEntity):
         Attributes:
             is_collected (bool): Indicates whether the collectible has been collected.
             variant (int): The variant of the collectible, used to determine the action.
+            spawn_y (float): The vertical position the collectible bobs around.
         """
         super().__init__(game, 'collectible', pos, size)
         self.is_collected = False
+        self.spawn_y = self.pos[1]
         self.variant = variant # 0 for carrot, 1 for radish
         if self.variant == 0:
             self.set_action('carrot')
@@ -310,11 +355,11 @@ class Collectible(PhysicsEntity):
         """
         Updates the collectible's position and checks for collection.
 
-        This method adjusts the collectible's vertical position to create a floating effect
+        This method moves the collectible by the game's collectible_bob to create a floating effect
         and calls the `collected` method to check if the player has collected the item.
         """
 
-        self.pos[1] += math.sin(py.time.get_ticks()/250) * 0.5
+        self.pos[1] = self.spawn_y + self.game.collectible_bob
         self.collected()
     
     def collected(self):
@@ -323,8 +368,8 @@ class Collectible(PhysicsEntity):
 
         This method checks if the player's rectangle is colliding with the
         collectible's rectangle. If so, it increments the game's score or
-        super score, depending on the variant of the collectible, and removes
-        the collectible from the game. If the variant is 2, it ends the level.
+        super score, depending on the variant of the collectible, and marks
+        the collectible as collected, removing it from the game. If the variant is 2, it ends the level.
 
         Returns:
             bool: Whether the collectible was collected.
@@ -336,12 +381,15 @@ class Collectible(PhysicsEntity):
                 self.game.super_score += 1
             else: 
                 self.game.end_level()
+            self.is_collected = True
             self.game.collectibles.remove(self)
             return True
         return False
     
 class Enemy(PhysicsEntity):
-    def __init__(self, game, enemy_type, pos, size, id='00000000'):
+    __slots__ = ('enemy_type', 'id')
+
+    def __init__(self, game, enemy_type, pos, size):
         """
         Initializes an Enemy instance with the given parameters.
 
@@ -350,35 +398,19 @@ class Enemy(PhysicsEntity):
             enemy_type (str): The type of the enemy, used for identifying it.
             pos (tuple): The initial position of the enemy as a (x, y) tuple.
             size (tuple): The size of the enemy as a (width, height) tuple.
-            id (str, optional): The ID of the enemy. Defaults to '00000000'.
+
+        Attributes:
+            id (int): The ID of the enemy, given by the game's entity registry.
         """
 
         super().__init__(game, enemy_type, pos, size)
         self.set_action('idle')
-        self.id = id
         self.enemy_type = enemy_type
-
-        while self.id in game.enemies_id:
-            self.id = random.choice(self.id_options) + random.choice(self.id_options) + random.choice(self.id_options) + random.choice(self.id_options) + random.choice(self.id_options) + random.choice(self.id_options) + random.choice(self.id_options) + random.choice(self.id_options)
-        game.enemies_id.append(self.id)
-    
-    def update(self):
-        """
-        Updates the enemy's position and handles collisions.
-
-        This method updates the position of the enemy by checking its velocity
-        and adjusting its direction when necessary. It checks for collisions with
-        tiles below and beside the enemy to determine if it should turn around. If
-        the enemy is about to move off a platform or run into a wall, its
-        horizontal velocity is reversed. Additionally, the method checks for
-        collisions with other enemies, and reverses direction upon collision to
-        prevent overlap.
-        """
-        if self.pos[0] + self.size[0] < self.game.scroll[0]-self.offscreen_offset or self.pos[0] > self.game.scroll[0] + self.game.width + self.offscreen_offset or self.pos[1] + self.size[1] < self.game.scroll[1]-self.offscreen_offset or self.pos[1] > self.game.scroll[1] + self.game.height + self.offscreen_offset:
-            return
-        super().update()
+        self.id = game.registry.register(self)
 
 class TickEnemy(Enemy):
+    __slots__ = ('swarm', 'swarm_index')
+
     def __init__(self, game, pos, size):
         """
         Initializes a TickEnemy instance with the given parameters.
@@ -390,9 +422,13 @@ class TickEnemy(Enemy):
 
         Attributes:
             velocity (list): The initial velocity of the tick enemy.
+            swarm (TickSwarm): The swarm that moves the tick enemy, or None if it moves itself.
+            swarm_index (int): The index of the tick enemy in its swarm.
         """
         super().__init__(game, 'tick_enemy', pos, size)
-        self.velocity = [random.choice([-1.2,-1,-0.8,0.8,1,1.2])*2.5, 0]
+        self.velocity = [self.game.rng.choice([-1.2,-1,-0.8,0.8,1,1.2])*2.5, 0]
+        self.swarm = None
+        self.swarm_index = 0
 
     def update(self):
         """
@@ -403,30 +439,41 @@ class TickEnemy(Enemy):
         tiles below and beside the enemy to determine if it should turn around. If
         the TickEnemy is about to move off a platform or run into a wall, its
         horizontal velocity is reversed. Additionally, the method checks for
-        collisions with other enemies, and reverses direction upon collision to
-        prevent overlap.
+        collisions with the nearby enemies found in the game's enemy_grid, and
+        reverses direction upon collision to prevent overlap.
+
+        A tick enemy in the game's tick_swarm has already been moved and turned with
+        the rest of the swarm when the swarm stepped, so it only takes its new state from there.
         """
+        if self.swarm != None and self.swarm == self.game.tick_swarm and self.swarm.stepped:
+            self.swarm.apply(self)
+            if self.rect().colliderect(self.game.player.rect()):
+                self.game.reset_level()
+            return
 
         super().update()
+        probe = self.hitbox # moved to where the tick enemy is about to be, until the next rect()
         if self.velocity[0] < 0:
             new_pos = (self.pos[0] - 1, self.pos[1] + 1)
+            probe.update(new_pos, self.size)
             tile_rect = self.tilemap.physics_specific_rect(new_pos, (0, 1)) # collision underneath
-            if not py.Rect(new_pos, self.size).colliderect(tile_rect): # if the tile below where it's about to be isn't collideable it turns
+            if not probe.colliderect(tile_rect): # if the tile below where it's about to be isn't collideable it turns
                 self.velocity[0] *= -1
             tile_rect = self.tilemap.physics_specific_rect(self.pos, (-1, 0)) # collision to the left
-            if py.Rect(new_pos, self.size).colliderect(tile_rect): # if run into wall, turn
+            if probe.colliderect(tile_rect): # if run into wall, turn
                 self.velocity[0] *= -1
 
         if self.velocity[0] > 0:
             new_pos = (self.pos[0] + self.size[0], self.pos[1] + 1)
+            probe.update(new_pos, self.size)
             tile_rect = self.tilemap.physics_specific_rect(new_pos, (0, 1)) # collision underneath
-            if not py.Rect(new_pos, self.size).colliderect(tile_rect):
+            if not probe.colliderect(tile_rect):
                 self.velocity[0] *= -1
             tile_rect = self.tilemap.physics_specific_rect(self.pos, (1, 0)) # collision to the right
-            if py.Rect(new_pos, self.size).colliderect(tile_rect):
+            if probe.colliderect(tile_rect):
                 self.velocity[0] *= -1
 
-        for enemy in self.game.enemies:
+        for enemy in self.game.enemy_grid.query(self.rect()):
             if self.rect().colliderect(enemy.rect()) and enemy.id != self.id and enemy.enemy_type == 'tick_enemy':
                self.velocity[0] *= -1
 
@@ -434,6 +481,8 @@ class TickEnemy(Enemy):
             self.game.reset_level()
 
 class DungEnemy(Enemy):
+    __slots__ = ('x_player_offset', 'y_player_offset', 'throw_time')
+
     def __init__(self, game, pos, size):
         """
         Initializes a DungEnemy instance with the given parameters.
@@ -446,15 +495,14 @@ class DungEnemy(Enemy):
         Attributes:
             x_player_offset (float): The horizontal offset between the enemy and the player.
             y_player_offset (float): The vertical offset between the enemy and the player.
-            projectile_id (str): The ID of the projectile to be thrown by the enemy.
-            time_since_throw (float): The time elapsed since the last projectile was thrown.
+            throw_time (float): The level time the last projectile was thrown at, or the time the attempt at the
+                level started at until the first is thrown, so there's the same wait before throwing after every reset.
         """
 
         super().__init__(game, 'dung_enemy', pos, size)
         self.x_player_offset = self.pos[0] - self.game.player.pos[0]
         self.y_player_offset = self.pos[1] - self.game.player.pos[1]
-        self.projectile_id = '00000000'
-        self.time_since_throw = 0
+        self.throw_time = self.game.attempt_start * self.game.dt
         
     def update(self):
         """
@@ -462,33 +510,49 @@ class DungEnemy(Enemy):
 
         This method updates the position offsets between the DungEnemy and the player,
         checks the distance to the player, and throws a projectile if within range
-        and enough time has passed since the last throw. The time since the last
-        projectile throw is incremented each frame.
+        and enough time has passed since the last throw. The time is measured from
+        the level's ticks, so it keeps passing while the enemy isn't updated.
         """
 
         super().update()
         self.x_player_offset = self.pos[0] - self.game.player.pos[0] # updates the x offset between the enemy and the player
         self.y_player_offset = self.pos[1] - self.game.player.pos[1] # updates the y offset between the enemy and the player
-        if self.distance_to_player() <= 200 and self.time_since_throw >= 2.5:
+        if self.distance_to_player() <= 200 and self.game.frame_count * self.game.dt - self.throw_time >= 2.5:
             self.throw_projectile()
-            self.time_since_throw = 0
-        else: self.time_since_throw += 1/60
+            self.throw_time = self.game.frame_count * self.game.dt
 
         if self.rect().colliderect(self.game.player.rect()):
             self.game.reset_level()
 
+    def save_state(self) -> dict:
+        '''
+        Returns the state the DungEnemy needs to carry on where it left off, including when it last threw a projectile.
+
+        Returns:
+            dict: The enemy's position, velocity, direction and throw time.
+        '''
+        state = super().save_state()
+        state['throw_time'] = self.throw_time
+        return state
+
+    def load_state(self, state) -> None:
+        '''
+        Puts the DungEnemy back in a state from save_state.
+
+        Args:
+            state (dict): The state from save_state.
+        '''
+        super().load_state(state)
+        self.throw_time = state['throw_time']
+
     def throw_projectile(self):
         """
         Throws a projectile from the DungEnemy's position towards the player.
 
-        This function generates a new ID for the projectile, appends it to the game's projectile IDs,
-        and creates a new Projectile instance with the player as the target and the DungEnemy's position
-        as the start position.
+        The projectile takes a free slot in the game's projectile pool, with the player as the target
+        and the DungEnemy's position as the start position.
         """
-        while self.projectile_id in self.game.projectiles_id:
-            self.projectile_id = random.choice(self.id_options) + random.choice(self.id_options) + random.choice(self.id_options) + random.choice(self.id_options) + random.choice(self.id_options) + random.choice(self.id_options) + random.choice(self.id_options) + random.choice(self.id_options)
-        self.game.projectiles_id.append(self.projectile_id)
-        self.game.projectiles[self.projectile_id] = Projectile(self.game, (self.pos[0] + (self.size[0]/2), self.pos[1] - 4), (4, 4), self.x_player_offset, self.y_player_offset, self.projectile_id)
+        self.game.projectiles.spawn((self.pos[0] + (self.size[0]/2), self.pos[1] - 4), self.x_player_offset, self.y_player_offset)
 
     def distance_to_player(self):
         """
@@ -503,74 +567,13 @@ class DungEnemy(Enemy):
         
         return ((self.x_player_offset)**2 + (self.y_player_offset)**2)**0.5 # pythagorean theorem used to calculate distance
 
-class Projectile(PhysicsEntity):
-    def __init__(self, game, pos, size, x_distance_to_player, y_distance_to_player, id):
-        """
-        Initializes a Projectile instance with the given parameters.
-
-        Args:
-            game: The game instance to which this projectile belongs.
-            pos (tuple): The initial position of the projectile as a (x, y) tuple.
-            size (tuple): The size of the projectile as a (width, height) tuple.
-            x_distance_to_player (float): The x offset between the projectile and the player.
-            y_distance_to_player (float): The y offset between the projectile and the player.
-            id (str): The ID of the projectile.
-
-        Attributes:
-            game: The game instance to which this projectile belongs.
-            id (str): The ID of the projectile.
-            y_player_offset (float): The y offset between the projectile and the player.
-            falling (int): 1 if falling, 0 if not falling.
-            velocity (list): The initial velocity of the projectile as a [x, y] list.
-        """
-        super().__init__(game, 'projectile', pos, size)
-        self.set_action('idle')
-        self.id = id
-        self.y_player_offset = y_distance_to_player
-        self.falling = -1 # 1 is falling, 0 isn't falling
-        self.velocity = [-1/60 * x_distance_to_player, (-1/60 * y_distance_to_player) - 3.151592653589793]
-    def update(self):
-        """
-        Updates the Projectile's state for the current frame.
-
-        This function updates the gravity force based on whether the projectile is
-        falling or not, and updates the projectile's position with the new gravity.
-        It also checks for collisions with other objects, and if a collision is
-        detected, it marks the projectile to be deleted.
-
-        """
-        if self.y_player_offset != 0:
-            gravity = [0.125, True, 0.5]
-        else: gravity = [0.125, False, 1]
-        super().update(gravity)
-
-        if self.velocity[1] > 0:
-            self.velocity[1] = round(min(5, max(-5, self.velocity[1])), 2)
-        else:  
-            self.velocity[1] = round(min(5, max(-5, self.velocity[1])), 2)
-
-        if self.velocity[1] > 0:
-            self.falling = 1
-        
-        projectile_rect = self.rect()
-        if projectile_rect.colliderect(self.game.player.rect()): #* Needs to send some signal to player or the game to end it, or deal damage to player 
-            self.game.reset_level()
-            return
-        for collision in self.collisions.values():
-            if collision == True: # if the projectile is colliding with anything
-                self.game.projectiles_to_delete.append(self.id) 
-                return
-        for enemy in self.game.enemies:
-            if projectile_rect.colliderect(enemy.rect()) and enemy.enemy_type != 'dung_enemy': #* Could damage enemies
-                self.game.projectiles_to_delete.append(self.id) 
-                return
-        
-
 class MoleEnemy(Enemy):
+    __slots__ = ()
+
     def __init__(self, game, pos, size):
         super().__init__(game, 'mole_enemy', [pos[0], pos[1]-1], size)
+        self.anim_offset = (0, 1)
     
     def update(self):
-        self.anim_offset = [0, 1]
         if self.rect().colliderect(self.game.player.rect()):
             self.game.player.pos[1] += 48
\ No newline at end of file
@@ -0,0 +1,107 @@
+import pygame as py
+from scripts.utils import ASSETS
+
+TEXT_CACHE_SIZE = 256 # the number of rendered texts kept before the cache is cleared
+
+class Hud:
+    def __init__(self, font, size=(640, 360)):
+        """
+        Initializes the Hud, the overlay drawn over a level.
+
+        The icons and the "Jump Power" label are rendered once here, and every number is rendered
+        once per value, so the overlay only needs redrawing when one of the values it shows changes.
+
+        Args:
+            font (pygame.font.Font): The font used for the label and the numbers.
+            size (tuple, optional): The size of the overlay, as (width, height). Defaults to (640, 360).
+
+        Attributes:
+            font (pygame.font.Font): The font used for the label and the numbers.
+            surface (pygame.Surface): The overlay, redrawn only when a value changes.
+            carrot (pygame.Surface): The carrot icon.
+            radish (pygame.Surface): The radish icon.
+            label (pygame.Surface): The rendered "Jump Power" label.
+            text_cache (dict): The rendered numbers and times, keyed by their text.
+            state (tuple): The values the overlay was last drawn with.
+        """
+        self.font = font
+        self.surface = py.Surface(size, py.SRCALPHA)
+
+        self.carrot = ASSETS.image('collectibles/carrot.png').copy() # copied, as the cached image is shared
+        self.radish = ASSETS.image('collectibles/radish.png').copy()
+        self.carrot.set_alpha(200)
+        self.radish.set_alpha(200)
+
+        self.label = py.font.Font.render(self.font, "Jump Power", False, (0, 0, 0))
+        self.text_cache = {}
+        self.state = None
+
+    def text(self, text):
+        """
+        Returns the given text rendered in black, rendering it only the first time it is asked for.
+
+        Args:
+            text (str): The text to render.
+
+        Returns:
+            pygame.Surface: The rendered text.
+        """
+        if text not in self.text_cache:
+            if len(self.text_cache) >= TEXT_CACHE_SIZE:
+                self.text_cache.clear()
+            self.text_cache[text] = py.font.Font.render(self.font, text, None, 'black')
+        return self.text_cache[text]
+
+    def update(self, jump_time, score, super_score, current_time) -> bool:
+        """
+        Redraws the overlay if any of the values it shows has changed since the last call.
+
+        Args:
+            jump_time (float): How far the jump has been charged, from 0 to 10.
+            score (int): The number of carrots collected.
+            super_score (int): The number of radishes collected.
+            current_time (str): The time spent in the level, as 'hh:mm:ss'.
+
+        Returns:
+            bool: Whether the overlay was redrawn.
+        """
+        state = (jump_time, score, super_score, current_time)
+        if state == self.state:
+            return False
+        self.state = state
+
+        self.surface.fill((0, 0, 0, 5))
+
+        # Draw Jump Power Gauge
+        self.surface.blit(self.label, (25, 5))
+        py.draw.rect(self.surface, (150, 150, 150, 150), (15, 35, 200, 30), 0, 15)
+        py.draw.circle(self.surface, (150, 0, 0, 150), (30, 50), 15, 0)
+
+        if 4 < jump_time:
+            py.draw.rect(self.surface, (150, 0, 0, 150), (27, 35, 190*(jump_time - 4)*1/6-3, 30), 0, 15)
+        if 6 < jump_time:
+            py.draw.rect(self.surface, (150, 150, 0, 150), (27+64, 35, 190*(jump_time - 6)*1/6-3, 30), 0, 15)
+        if 8 < jump_time:
+            py.draw.rect(self.surface, (0, 150, 0, 150), (27+128, 35, 190*(jump_time - 8)*1/6-4, 30), 0, 15)
+
+        py.draw.rect(self.surface, (0, 0, 0, 150), (15, 35, 200, 30), 2, 15)
+
+        # Draw Number of carrots & radishes - to show the player how many they've collected
+        self.surface.blit(self.carrot, (520, 15))
+        self.surface.blit(self.text(str(score)), (540, 12))
+
+        self.surface.blit(self.radish, (580, 15))
+        self.surface.blit(self.text(str(super_score)), (600, 12))
+
+        # Draw the time spent in the level
+        self.surface.blit(self.text(current_time), (530, 47))
+        return True
+
+    def render(self, surface) -> None:
+        """
+        Draws the overlay onto the given surface.
+
+        Args:
+            surface (pygame.Surface): The surface to draw the overlay onto.
+        """
+        surface.blit(self.surface, (0, 0))
@@ -0,0 +1,175 @@
+import queue, threading
+import pygame as py
+from scripts.tilemap import Tilemap
+from scripts.utils import ASSETS, BASE_IMG_PATH
+
+class Preloader:
+    def __init__(self, game):
+        """
+        Initializes a Preloader, which decodes images and reads levels on a worker thread while a menu is open.
+
+        The worker only does the work that doesn't need the display: decoding PNG files and reading
+        maps into level snapshots, collision meshes included. Decoded images are handed back through a queue and converted on
+        the main thread by finish, a few per frame, so the menu keeps drawing smoothly.
+
+        The worker thread is only started by the first request, so a game that never opens a menu
+        never starts it.
+
+        Args:
+            game (Game): The game the levels are read for.
+
+        Attributes:
+            game (Game): The game the levels are read for.
+            jobs (queue.Queue): The images and levels waiting to be loaded, as ('image', path), ('directory', path) or ('level', map_id).
+            decoded (queue.Queue): The decoded images waiting to be converted, as (path, surface).
+            pending (int): The number of jobs not yet finished, including images waiting to be converted.
+            reading (dict): An event for each level being read right now, by either thread, set once the read is over.
+            lock (threading.Lock): Guards pending and reading, which both threads change.
+            thread (threading.Thread): The worker thread, or None if it hasn't been started.
+        """
+        self.game = game
+        self.jobs = queue.Queue()
+        self.decoded = queue.Queue()
+        self.pending = 0
+        self.reading = {}
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def request_images(self, paths) -> None:
+        """
+        Asks for the images at the given paths to be decoded, skipping those already cached.
+
+        Args:
+            paths (list): The file paths of the images, relative to the base image path.
+        """
+        for path in paths:
+            if ('image', path) not in ASSETS.cache:
+                self.request(('image', path))
+
+    def request_directories(self, paths) -> None:
+        """
+        Asks for every image in the given directories to be decoded, skipping those already cached.
+
+        Args:
+            paths (list): The paths of the directories, relative to the base image path.
+        """
+        for path in paths:
+            if ('images', path) not in ASSETS.cache:
+                self.request(('directory', path))
+
+    def request_level(self, map_id) -> None:
+        """
+        Asks for a level to be read into the game's level_cache, unless it already is.
+
+        Args:
+            map_id: The id of the level's map.
+        """
+        if map_id not in self.game.level_cache:
+            self.request(('level', map_id))
+
+    def request(self, job) -> None:
+        """
+        Queues a job for the worker thread, starting the thread if needed.
+
+        Args:
+            job (tuple): The job, as ('image', path), ('directory', path) or ('level', map_id).
+        """
+        with self.lock:
+            self.pending += 1
+        self.jobs.put(job)
+        if self.thread == None:
+            self.thread = threading.Thread(target=self.work, name='preloader', daemon=True)
+            self.thread.start()
+
+    def work(self) -> None:
+        """
+        The worker thread's loop: decodes images and reads levels until the game exits.
+
+        A job that fails is dropped, whatever the error, so the main thread loads that image or level itself later
+        and reports the error then, and the jobs after it still run.
+        """
+        while True:
+            kind, arg = self.jobs.get()
+            finished = True
+            try:
+                if kind == 'image':
+                    self.decoded.put((arg, py.image.load(BASE_IMG_PATH + arg)))
+                    finished = False
+                    continue # still pending until it has been converted
+                if kind == 'directory':
+                    for path in ASSETS.image_paths(arg):
+                        if ('image', path) not in ASSETS.cache:
+                            with self.lock:
+                                self.pending += 1
+                            self.decoded.put((path, py.image.load(BASE_IMG_PATH + path)))
+                elif self.claim_level(arg):
+                    try:
+                        self.game.level_cache[arg] = self.game.read_level(arg, Tilemap(self.game))
+                    finally:
+                        self.release_level(arg)
+            except Exception: # like a missing file or a malformed map, which would otherwise end the thread with the job still pending
+                pass
+            finally:
+                if finished:
+                    self.done()
+
+    def claim_level(self, map_id) -> bool:
+        """
+        Claims a level for the calling thread to read, unless it's already in the game's level_cache.
+
+        A level the other thread is reading is waited for rather than read a second time, so the
+        main thread never parses a map the worker is halfway through. If that read fails, the level
+        is claimed once it's over, so the caller reads it and reports the error itself.
+
+        Args:
+            map_id: The id of the level's map.
+
+        Returns:
+            bool: Whether the caller has to read the level and then call release_level.
+        """
+        while True:
+            with self.lock:
+                if map_id in self.game.level_cache:
+                    return False
+                event = self.reading.get(map_id)
+                if event == None:
+                    self.reading[map_id] = threading.Event()
+                    return True
+            event.wait()
+
+    def release_level(self, map_id) -> None:
+        """
+        Marks the read of a claimed level as over, whether it worked or not, waking the threads waiting for it.
+
+        Args:
+            map_id: The id of the level's map.
+        """
+        with self.lock:
+            event = self.reading.pop(map_id)
+        event.set()
+
+    def done(self) -> None:
+        """
+        Marks a job as finished.
+        """
+        with self.lock:
+            self.pending -= 1
+
+    def finish(self, limit=8) -> bool:
+        """
+        Converts up to limit decoded images and adds them to the asset cache. Has to be called on the main thread.
+
+        Args:
+            limit (int, optional): The most images to convert in this call. Defaults to 8.
+
+        Returns:
+            bool: Whether every requested job has been finished.
+        """
+        for i in range(limit):
+            try:
+                path, img = self.decoded.get_nowait()
+            except queue.Empty:
+                break
+            ASSETS.add_decoded(path, img)
+            self.done()
+        return self.pending == 0
@@ -0,0 +1,171 @@
+import pygame as py
+import time
+from array import array
+
+# the stages of a frame, each timed separately. A lap adds the time since the last lap to its stage
+PROFILE_SIMULATION = 0 # applying input, the camera, clouds and everything else update_level does outside the entity updates
+PROFILE_PLAYER = 1
+PROFILE_COLLECTIBLES = 2
+PROFILE_ENEMIES = 3
+PROFILE_PROJECTILES = 4
+PROFILE_BACKGROUND = 5
+PROFILE_CLOUDS = 6
+PROFILE_TILEMAP = 7
+PROFILE_ENTITIES = 8 # rendering the entities
+PROFILE_INPUT = 9
+PROFILE_HUD = 10
+PROFILE_PROFILER = 11 # drawing this overlay
+PROFILE_PRESENT = 12 # scaling the display up to the window and flipping it
+PROFILE_WAIT = 13 # waiting for the frame rate limit
+STAGE_NAMES = ('simulation', 'player', 'collectibles', 'enemies', 'projectiles', 'background', 'clouds',
+               'tilemap', 'entity render', 'input', 'hud', 'profiler', 'present', 'wait')
+
+PROFILE_FRAMES = 120 # the number of frames the graph and the averages cover
+PROFILE_REFRESH = 15 # the number of frames between redraws of the overlay's text
+GRAPH_HEIGHT = 60 # the height of the frame time graph, which shows up to two frame budgets
+STAGE_COLORS = ((90, 90, 220), (220, 220, 220), (240, 150, 30), (200, 40, 40), (140, 90, 40), (60, 60, 60), (170, 220, 255),
+                (40, 160, 40), (230, 230, 80), (200, 80, 200), (80, 200, 200), (120, 120, 120), (255, 255, 255), (30, 30, 30))
+
+class FrameProfiler:
+    def __init__(self, font, frames=PROFILE_FRAMES):
+        """
+        Initializes a FrameProfiler, which times each stage of the level loop's frames for a debug overlay.
+
+        The loop calls lap at the end of every stage, and the time since the previous lap is added to
+        that stage's time for the frame. Stages run once per tick, such as the entity updates, add up
+        over every tick of the frame. When the frame ends, its times go into ring buffers that are
+        allocated here, so timing a frame allocates nothing. While the profiler is off, start_frame,
+        lap and end_frame return straight away.
+
+        Args:
+            font (pygame.font.Font): The font used for the overlay's text.
+            frames (int, optional): The number of frames kept. Defaults to PROFILE_FRAMES.
+
+        Attributes:
+            font (pygame.font.Font): The font used for the overlay's text.
+            enabled (bool): Whether frames are being timed and the overlay drawn.
+            frames (int): The number of frames kept.
+            frame_times (array): The length of each kept frame, in seconds, as a ring buffer.
+            stage_times (list): One ring buffer per stage, of the stage's time in each kept frame, in seconds.
+            current (array): The time of each stage so far in the frame being timed.
+            zeros (array): A frame of zeros, copied into current when a frame starts.
+            index (int): The slot of the ring buffers the next frame goes into.
+            count (int): The number of frames kept so far, up to frames.
+            frame_start (float): When the frame being timed started.
+            last_lap (float): When the last lap ended.
+            surface (pygame.Surface): The overlay's background and text, redrawn every PROFILE_REFRESH frames.
+            renders (int): The number of times the overlay has been drawn since the profiler was turned on.
+            graph (pygame.Surface): The frame time graph, scrolled along by a column for every frame.
+        """
+        self.font = font
+        self.enabled = False
+        self.frames = frames
+        self.frame_times = array('d', [0]) * frames
+        self.stage_times = [array('d', [0]) * frames for stage in STAGE_NAMES]
+        self.current = array('d', [0]) * len(STAGE_NAMES)
+        self.zeros = array('d', [0]) * len(STAGE_NAMES)
+        self.index = 0
+        self.count = 0
+        self.frame_start = 0
+        self.last_lap = 0
+        self.renders = 0
+        self.surface = py.Surface((250, 22 + 14 * ((len(STAGE_NAMES) + 1) // 2) + GRAPH_HEIGHT + 10), py.SRCALPHA) # two columns of stages over the graph
+        self.graph = py.Surface((frames, GRAPH_HEIGHT), py.SRCALPHA)
+
+    def toggle(self) -> None:
+        """
+        Turns the profiler on or off, forgetting the frames kept so far.
+        """
+        self.enabled = not self.enabled
+        self.index = 0
+        self.count = 0
+        self.renders = 0
+        self.graph.fill((0, 0, 0, 0))
+
+    def start_frame(self) -> None:
+        """
+        Starts timing a frame.
+        """
+        if not self.enabled:
+            return
+        self.current[:] = self.zeros
+        self.frame_start = self.last_lap = time.perf_counter()
+
+    def lap(self, stage) -> None:
+        """
+        Adds the time since the last lap to the given stage.
+
+        Args:
+            stage (int): The stage that just ended, one of the PROFILE_ constants.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.current[stage] += now - self.last_lap
+        self.last_lap = now
+
+    def end_frame(self) -> None:
+        """
+        Stores the frame's times in the ring buffers.
+        """
+        if not self.enabled:
+            return
+        self.frame_times[self.index] = time.perf_counter() - self.frame_start
+        for stage in range(len(self.current)):
+            self.stage_times[stage][self.index] = self.current[stage]
+        self.index = (self.index + 1) % self.frames
+        self.count = min(self.count + 1, self.frames)
+
+    def mean(self, times) -> float:
+        """
+        Returns the mean of the kept frames in a ring buffer, in milliseconds.
+
+        Args:
+            times (array): The ring buffer, frame_times or one of stage_times.
+
+        Returns:
+            float: The mean, or 0 if no frame has been kept.
+        """
+        if self.count == 0:
+            return 0
+        return sum(times[:self.count]) * 1000 / self.count
+
+    def render(self, surface, budget) -> None:
+        """
+        Draws the overlay onto the given surface: the frame time graph of the kept frames, newest on
+        the right, and the mean time of the whole frame and of each stage.
+
+        Args:
+            surface (pygame.Surface): The surface to draw the overlay onto.
+            budget (float): The time a frame can take at the target frame rate, in seconds, drawn as a line across the graph.
+        """
+        left = surface.get_width() - self.surface.get_width() - 5
+        top = 80
+        if self.renders % PROFILE_REFRESH == 0:
+            self.surface.fill((0, 0, 0, 160))
+            self.surface.blit(py.font.Font.render(self.font, f'frame {self.mean(self.frame_times):.2f} ms', True, (255, 255, 255)), (5, 2))
+            for stage, name in enumerate(STAGE_NAMES):
+                x, y = 5 + 125 * (stage % 2), 20 + 14 * (stage // 2)
+                py.draw.rect(self.surface, STAGE_COLORS[stage], (x, y + 4, 8, 8))
+                self.surface.blit(py.font.Font.render(self.font, f'{name} {self.mean(self.stage_times[stage]):.2f}', True, (255, 255, 255)), (x + 12, y))
+        self.renders += 1
+        surface.blit(self.surface, (left, top))
+
+        #* the graph moves left by a column and the last frame is drawn on the right, split into its stages
+        if self.count > 0:
+            frame = (self.index - 1) % self.frames
+            self.graph.scroll(-1, 0)
+            x = self.frames - 1
+            py.draw.line(self.graph, (0, 0, 0, 0), (x, 0), (x, GRAPH_HEIGHT))
+            scale = GRAPH_HEIGHT / (budget * 2)
+            y = GRAPH_HEIGHT
+            for stage in range(len(self.stage_times)):
+                height = self.stage_times[stage][frame] * scale
+                if height >= 1:
+                    py.draw.line(self.graph, STAGE_COLORS[stage], (x, y), (x, max(0, y - height)))
+                y -= height
+                if y <= 0:
+                    break
+        graph_top = top + self.surface.get_height() - 5 - GRAPH_HEIGHT
+        surface.blit(self.graph, (left + 5, graph_top))
+        py.draw.line(surface, (255, 60, 60), (left + 5, graph_top + GRAPH_HEIGHT // 2), (left + 4 + self.frames, graph_top + GRAPH_HEIGHT // 2)) # the frame budget
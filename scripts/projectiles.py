@@ -0,0 +1,223 @@
+import pygame as py
+from array import array
+from scripts.entities import BASE_TICK_RATE, SIMULATION_MARGIN, RENDER_MARGIN
+from scripts.tilemap import NEIGHBOR_OFFSETS, NULL_RECT
+
+PROJECTILE_SIZE = (4, 4)
+POOL_CAPACITY = 32 # the number of projectiles a pool has room for before it has to grow
+
+class ProjectilePool:
+    def __init__(self, game, capacity=POOL_CAPACITY):
+        """
+        Initializes a ProjectilePool, which holds every projectile of a level in preallocated arrays.
+
+        A projectile is a slot in the arrays rather than an object. Throwing one takes a slot off the
+        free list and a projectile that hits something gives its slot back, so nothing is allocated
+        while the level is played unless more projectiles are in the air than ever before, in which
+        case the arrays grow. update moves every projectile and resolves its tile, player and enemy
+        hits in one pass, with the same results the projectiles would have had as PhysicsEntities.
+
+        Args:
+            game: The game the projectiles belong to.
+            capacity (int, optional): The number of slots to allocate up front. Defaults to POOL_CAPACITY.
+
+        Attributes:
+            game: The game the projectiles belong to.
+            size (tuple): The size of every projectile.
+            x, y (array): The positions of the projectiles.
+            prev_x, prev_y (array): The positions of the projectiles before the last tick, used to interpolate rendering.
+            vx, vy (array): The velocities of the projectiles.
+            descent (array): The multiplier of each projectile's gravity while it falls, 1 for projectiles thrown level with the player.
+            frame (array): The animation frame of each projectile, advanced by the game's tick_scale every tick.
+            live (list): The slots in use, in the order the projectiles were thrown.
+            free (list): The unused slots, used as a stack.
+            hit_rect (py.Rect): A rect reused to test each projectile against the tiles.
+        """
+        self.game = game
+        self.size = PROJECTILE_SIZE
+        self.x = array('d')
+        self.y = array('d')
+        self.prev_x = array('d')
+        self.prev_y = array('d')
+        self.vx = array('d')
+        self.vy = array('d')
+        self.descent = array('d')
+        self.frame = array('d')
+        self.live = []
+        self.free = []
+        self.hit_rect = py.Rect(0, 0, self.size[0], self.size[1])
+        self.grow(capacity)
+
+    def __len__(self) -> int:
+        return len(self.live)
+
+    def grow(self, slots) -> None:
+        """
+        Adds unused slots to the end of the arrays.
+
+        Args:
+            slots (int): The number of slots to add.
+        """
+        start = len(self.x)
+        for values in (self.x, self.y, self.prev_x, self.prev_y, self.vx, self.vy, self.descent, self.frame):
+            values.extend(array(values.typecode, [0]) * slots)
+        self.free.extend(range(start + slots - 1, start - 1, -1)) # lowest slot on top
+
+    def clear(self) -> None:
+        """
+        Removes every projectile, giving all the slots back to the free list.
+        """
+        self.live = []
+        self.free = list(range(len(self.x) - 1, -1, -1))
+
+    def spawn(self, pos, x_distance_to_player, y_distance_to_player) -> int:
+        """
+        Throws a projectile from the given position, aimed so it covers the horizontal distance to the player in a second.
+
+        Args:
+            pos (tuple): The position of the projectile as a (x, y) tuple.
+            x_distance_to_player (float): The x offset between the thrower and the player.
+            y_distance_to_player (float): The y offset between the thrower and the player.
+
+        Returns:
+            int: The slot of the projectile.
+        """
+        if not self.free:
+            self.grow(len(self.x))
+        slot = self.free.pop()
+        self.x[slot] = self.prev_x[slot] = pos[0]
+        self.y[slot] = self.prev_y[slot] = pos[1]
+        self.vx[slot] = -1/BASE_TICK_RATE * x_distance_to_player
+        self.vy[slot] = (-1/BASE_TICK_RATE * y_distance_to_player) - 3.151592653589793
+        self.descent[slot] = 0.5 if y_distance_to_player != 0 else 1 # projectiles thrown level with the player fall at full speed
+        self.frame[slot] = 0
+        self.live.append(slot)
+        return slot
+
+    def remember_pos(self) -> None:
+        '''
+        Stores the current positions as the previous ones, before a tick moves the projectiles.
+        '''
+        for slot in self.live:
+            self.prev_x[slot] = self.x[slot]
+            self.prev_y[slot] = self.y[slot]
+
+    def update(self) -> None:
+        """
+        Moves every projectile for the current tick and removes the ones that hit something or left the simulation margin.
+
+        Each projectile moves and collides with the tiles like a PhysicsEntity, horizontally and then
+        vertically, looking the collision mesh up directly rather than through physics_rects_around.
+        A mesh rect shared by several of the cells around a projectile is tested more than once, which
+        is harmless as the first hit already moves the projectile out of it. Gravity is then applied
+        and the vertical velocity capped. A projectile that touches the player resets the level, which
+        ends the pass, as the level's projectiles are gone. One that hits a tile, or an enemy other than
+        a dung enemy, gives its slot back to the free list.
+        """
+        game = self.game
+        tilemap = game.tilemap
+        if tilemap.collision_cells == None:
+            tilemap.build_collision_mesh()
+        cells = tilemap.collision_cells
+        tile_rects = tilemap.tile_rects
+        tile_size = tilemap.tile_size
+        animation = game.assets['projectile/idle']
+        frames = animation.img_duration * len(animation.images)
+        falling_speed = 0.125 * game.tick_scale
+        player_rect = game.player.rect()
+        rect = self.hit_rect
+        x, y, vx, vy = self.x, self.y, self.vx, self.vy
+        width, height = self.size
+        sim_left, sim_top = game.scroll[0] - SIMULATION_MARGIN, game.scroll[1] - SIMULATION_MARGIN
+        sim_right, sim_bottom = game.scroll[0] + game.width + SIMULATION_MARGIN, game.scroll[1] + game.height + SIMULATION_MARGIN
+        live = self.live
+        survivors = []
+        for slot in live:
+            if x[slot] + width < sim_left or x[slot] > sim_right or y[slot] + height < sim_top or y[slot] > sim_bottom:
+                self.free.append(slot) # too far off screen to ever come back
+                continue
+            hit = False
+
+            #* horizontal collisions
+            x_movement = vx[slot] * game.tick_scale
+            x[slot] += x_movement
+            rect.x, rect.y = int(x[slot]), int(y[slot])
+            tile_x, tile_y = int(x[slot] // tile_size), int(y[slot] // tile_size)
+            for offset in NEIGHBOR_OFFSETS:
+                tile_rect = cells.get((tile_x + offset[0], tile_y + offset[1]))
+                if tile_rect is not None and rect.colliderect(tile_rect):
+                    if x_movement > 0:
+                        rect.right = tile_rect.left
+                        hit = True
+                    if x_movement < 0:
+                        rect.left = tile_rect.right
+                        hit = True
+                    x[slot] = rect.x
+
+            #* vertical collisions
+            y_movement = vy[slot] * game.tick_scale
+            y[slot] += y_movement
+            rect.x, rect.y = int(x[slot]), int(y[slot])
+            vertical_hit = False
+            tile_x, tile_y = int(x[slot] // tile_size), int(y[slot] // tile_size)
+            for offset in NEIGHBOR_OFFSETS:
+                tile_rect = cells.get((tile_x + offset[0], tile_y + offset[1]))
+                if tile_rect is not None and rect.colliderect(tile_rect):
+                    if y_movement > 0:
+                        rect.bottom = tile_rect.top
+                        vertical_hit = True
+                    if y_movement < 0:
+                        rect.top = tile_rect.bottom
+                        vertical_hit = True
+                    y[slot] = rect.y
+
+            #* gravity, unless resting on a tile
+            rect.x, rect.y = int(x[slot]), int(y[slot]) + 1
+            tile_x, tile_y = int(x[slot] // tile_size), int(y[slot] // tile_size)
+            if not (rect.colliderect(tile_rects.get((tile_x, tile_y), NULL_RECT))
+                    or rect.colliderect(tile_rects.get((tile_x, tile_y + 1), NULL_RECT))
+                    or rect.colliderect(tile_rects.get((tile_x + 1, tile_y + 1), NULL_RECT))):
+                if vy[slot] > 0:
+                    vy[slot] = round(min(5, vy[slot] + falling_speed*self.descent[slot]), 2)
+                else: vy[slot] = round(min(5, vy[slot] + falling_speed), 2)
+            if vertical_hit:
+                vy[slot] = 0
+            vy[slot] = round(min(5, max(-5, vy[slot])), 2)
+            self.frame[slot] = (self.frame[slot] + game.tick_scale) % frames
+
+            rect.x, rect.y = int(x[slot]), int(y[slot])
+            if rect.colliderect(player_rect):
+                game.reset_level()
+                if self.live is not live: # the level was reset, taking every projectile with it
+                    return
+                survivors.append(slot)
+                continue
+            if hit or vertical_hit:
+                self.free.append(slot)
+                continue
+            for enemy in game.enemy_grid.query(rect):
+                if rect.colliderect(enemy.rect()) and enemy.enemy_type != 'dung_enemy':
+                    self.free.append(slot)
+                    break
+            else:
+                survivors.append(slot)
+        self.live = survivors
+
+    def render(self, surface, offset=(0, 0), alpha=1) -> None:
+        '''
+        Renders every projectile near the screen onto the given surface, between its previous and current position.
+
+        Args:
+            surface (pygame.Surface): The surface to render the projectiles onto.
+            offset (tuple, optional): The camera offset, given as (x, y) coordinates. Defaults to (0, 0).
+            alpha (float, optional): How far between their previous and current position the projectiles are drawn, from 0 to 1. Defaults to 1.
+        '''
+        animation = self.game.assets['projectile/idle']
+        right, bottom = surface.get_width() + RENDER_MARGIN, surface.get_height() + RENDER_MARGIN
+        for slot in self.live:
+            x = self.x[slot] * alpha + self.prev_x[slot] * (1 - alpha) - offset[0]
+            y = self.y[slot] * alpha + self.prev_y[slot] * (1 - alpha) - offset[1]
+            if x < -RENDER_MARGIN or x > right or y < -RENDER_MARGIN or y > bottom:
+                continue
+            image = animation.flipped_images if self.vx[slot] < 0 else animation.images
+            surface.blit(image[int(self.frame[slot] // animation.img_duration)], (x, y))
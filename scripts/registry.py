@@ -0,0 +1,77 @@
+SLOT_BITS = 20 # the low bits of a handle that hold its slot, the rest hold the slot's generation
+
+class EntityRegistry:
+    def __init__(self):
+        """
+        Initializes an EntityRegistry, which hands out the integer IDs of a level's entities.
+
+        An ID is a handle made of a slot and the slot's generation. Removing an entity gives its slot
+        back and moves the slot on a generation, so the slot can be used again without the old ID
+        ever matching the new entity. Registering, removing and looking up an ID take the same time
+        however many entities there are.
+
+        Attributes:
+            entities (dict): The registered entities, keyed by ID.
+            generations (list): The current generation of each slot.
+            free (list): The slots not in use, used as a stack.
+        """
+        self.entities = {}
+        self.generations = []
+        self.free = []
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def __contains__(self, handle) -> bool:
+        return handle in self.entities
+
+    def register(self, entity) -> int:
+        """
+        Gives an entity an ID.
+
+        Args:
+            entity: The entity to register.
+
+        Returns:
+            int: The entity's ID.
+        """
+        if self.free:
+            slot = self.free.pop()
+        else:
+            slot = len(self.generations)
+            self.generations.append(0)
+        handle = self.generations[slot] << SLOT_BITS | slot
+        self.entities[handle] = entity
+        return handle
+
+    def remove(self, handle) -> None:
+        """
+        Removes an entity, freeing its slot for another. Does nothing if the ID isn't registered.
+
+        Args:
+            handle (int): The ID of the entity.
+        """
+        if self.entities.pop(handle, None) is None:
+            return
+        slot = handle & ((1 << SLOT_BITS) - 1)
+        self.generations[slot] += 1
+        self.free.append(slot)
+
+    def get(self, handle):
+        """
+        Returns the entity with the given ID.
+
+        Args:
+            handle (int): The ID of the entity.
+
+        Returns:
+            The entity, or None if the ID was removed.
+        """
+        return self.entities.get(handle)
+
+    def clear(self) -> None:
+        """
+        Removes every entity, keeping the generations so none of their IDs match a later entity.
+        """
+        for handle in list(self.entities):
+            self.remove(handle)
@@ -0,0 +1,96 @@
+import json
+
+# the keys that can be held during a tick, as bits of the tick's input state
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_JUMP = 4
+
+RECORDING_VERSION = 1
+
+class Recording:
+    def __init__(self, level, seed, tick_rate=60, runs=None):
+        """
+        Initializes a Recording, the keys held during every tick of a level plus the seed of its random numbers.
+
+        Together with the level's map, that is everything the simulation depends on, so playing a
+        recording back with Game.play_recording reproduces the run exactly. The held keys are stored
+        run-length encoded, as most ticks hold the same keys as the tick before.
+
+        Args:
+            level: The level that was played.
+            seed (int): The seed of the level's random numbers.
+            tick_rate (int, optional): The tick rate the level was played at. Defaults to 60.
+            runs (list, optional): The held keys, as [state, ticks] pairs. Defaults to no ticks.
+
+        Attributes:
+            level: The level that was played.
+            seed (int): The seed of the level's random numbers.
+            tick_rate (int): The tick rate the level was played at.
+            runs (list): The held keys, as [state, ticks] pairs, where state is a combination of
+                INPUT_LEFT, INPUT_RIGHT and INPUT_JUMP held for that many ticks in a row.
+        """
+        self.level = level
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.runs = runs if runs != None else []
+
+    def record(self, state) -> None:
+        """
+        Adds a tick to the recording.
+
+        Args:
+            state (int): The keys held during the tick.
+        """
+        if self.runs and self.runs[-1][0] == state:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([state, 1])
+
+    def states(self):
+        """
+        Yields the keys held during each tick, in order.
+
+        Yields:
+            int: The keys held during the tick.
+        """
+        for state, ticks in self.runs:
+            for tick in range(ticks):
+                yield state
+
+    def ticks(self) -> int:
+        """
+        Returns the number of ticks recorded.
+
+        Returns:
+            int: The number of ticks.
+        """
+        return sum(ticks for state, ticks in self.runs)
+
+    def save(self, path) -> None:
+        """
+        Saves the recording as json.
+
+        Args:
+            path (str): The file to save to.
+        """
+        with open(path, 'w') as f:
+            json.dump({'version': RECORDING_VERSION, 'level': self.level, 'seed': self.seed, 'tick_rate': self.tick_rate, 'inputs': self.runs}, f)
+
+def load_recording(path) -> Recording:
+    """
+    Loads a recording saved with Recording.save.
+
+    Args:
+        path (str): The file to load from.
+
+    Returns:
+        Recording: The loaded recording.
+
+    Raises:
+        ValueError: If the file is from a newer version of the recording format.
+    """
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if data['version'] > RECORDING_VERSION:
+        raise ValueError(f'{path} is a version {data["version"]} recording, only version {RECORDING_VERSION} and older can be played')
+    return Recording(data['level'], data['seed'], data['tick_rate'], data['inputs'])
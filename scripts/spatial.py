@@ -0,0 +1,65 @@
+class SpatialHash:
+    def __init__(self, cell_size=64, reach=24):
+        """
+        Initializes a SpatialHash, a uniform grid used as a broadphase for entity collisions.
+
+        Every entity is stored in the single cell containing its position (top-left corner), so
+        a query looks at every cell an entity overlapping the queried rect could be stored in.
+
+        Args:
+            cell_size (int, optional): The width and height of each cell, in pixels. Defaults to 64.
+            reach (float, optional): How far, in pixels, an entity can extend or move past its stored position
+                before the hash is rebuilt. Has to cover the entity size plus the most it moves in a tick, so
+                a game with a lower tick rate needs a longer reach. Defaults to 24.
+
+        Attributes:
+            cell_size (int): The width and height of each cell, in pixels.
+            reach (float): How far an entity can extend or move past its stored position.
+            cells (dict): The entities in each cell, keyed by (x, y) cell position.
+        """
+        self.cell_size = cell_size
+        self.reach = reach
+        self.cells = {}
+
+    def rebuild(self, entities) -> None:
+        """
+        Clears the hash and inserts every given entity into the cell containing its position.
+
+        Args:
+            entities (list): The entities to insert. Each needs a pos attribute.
+        """
+        self.cells.clear()
+        for entity in entities:
+            self.insert(entity)
+
+    def insert(self, entity) -> None:
+        """
+        Inserts an entity into the cell containing its position.
+
+        Args:
+            entity: The entity to insert. Needs a pos attribute.
+        """
+        cell = (int(entity.pos[0] // self.cell_size), int(entity.pos[1] // self.cell_size))
+        if cell in self.cells:
+            self.cells[cell].append(entity)
+        else:
+            self.cells[cell] = [entity]
+
+    def query(self, rect) -> list:
+        """
+        Returns the entities that could be overlapping the given rect.
+
+        The result is a superset of the overlapping entities, so callers still need to do the exact test.
+
+        Args:
+            rect (pygame.Rect): The area to look in.
+
+        Returns:
+            list: The entities stored in every cell within reach of the rect.
+        """
+        found = []
+        for x in range(int((rect.left - self.reach) // self.cell_size), int((rect.right + self.reach) // self.cell_size) + 1):
+            for y in range(int((rect.top - self.reach) // self.cell_size), int((rect.bottom + self.reach) // self.cell_size) + 1):
+                if (x, y) in self.cells:
+                    found.extend(self.cells[(x, y)])
+        return found
@@ -0,0 +1,92 @@
+from bisect import bisect_left, bisect_right
+from scripts.entities import SIMULATION_MARGIN
+
+ACTIVATION_MARGIN = SIMULATION_MARGIN + 64 # the amount of pixels offscreen a spawner's entity is created, so it's there to be bumped into before it's updated
+DESPAWN_MARGIN = ACTIVATION_MARGIN + 128 # the amount of pixels offscreen an entity is put back into a spawner, further out so it doesn't go back and forth
+
+class SpawnerIndex:
+    def __init__(self, game, spawners, create, save):
+        """
+        Initializes a SpawnerIndex, which keeps the entities of a level as spawner records until the camera comes near them.
+
+        A record is a dict with the position of its entity and whatever create needs to make it. The
+        records waiting to be created are kept sorted along the level's longer axis, so update finds
+        the ones near the camera with a binary search rather than looking at all of them. An entity
+        that ends up far from the camera is made back into a record with save, in its current state,
+        so it carries on from there when it's created again, as if it had been there all along. An
+        entity removed from entities, like a collected collectible, is gone for good.
+
+        Args:
+            game: The game the entities belong to.
+            spawners (list): The records of the level. They are kept, but not changed.
+            create (callable): Makes the entity of a record.
+            save (callable): Makes the record of an entity, to create it again later.
+
+        Attributes:
+            game: The game the entities belong to.
+            create (callable): Makes the entity of a record.
+            save (callable): Makes the record of an entity.
+            axis (int): The axis the records are sorted along, 0 for x and 1 for y.
+            keys (list): The position of each record along the axis, sorted.
+            records (list): The records waiting to be created, in the order of keys.
+            entities (list): The entities created and not put back, in the order they were created.
+        """
+        self.game = game
+        self.create = create
+        self.save = save
+        width = max((spawner['pos'][0] for spawner in spawners), default=0) - min((spawner['pos'][0] for spawner in spawners), default=0)
+        height = max((spawner['pos'][1] for spawner in spawners), default=0) - min((spawner['pos'][1] for spawner in spawners), default=0)
+        self.axis = 0 if width >= height else 1
+        self.records = sorted(spawners, key=lambda spawner: spawner['pos'][self.axis])
+        self.keys = [spawner['pos'][self.axis] for spawner in self.records]
+        self.entities = []
+
+    def insert(self, record) -> None:
+        """
+        Adds a record to the ones waiting to be created.
+
+        Args:
+            record (dict): The record to add.
+        """
+        index = bisect_right(self.keys, record['pos'][self.axis])
+        self.keys.insert(index, record['pos'][self.axis])
+        self.records.insert(index, record)
+
+    def update(self) -> bool:
+        """
+        Puts the entities beyond DESPAWN_MARGIN of the screen back into records, and creates the
+        entities of the records within ACTIVATION_MARGIN. The entities list is changed in place.
+
+        Returns:
+            bool: Whether any entity was created or put back.
+        """
+        scroll = self.game.scroll
+        low = (scroll[0], scroll[1])
+        high = (scroll[0] + self.game.width, scroll[1] + self.game.height)
+
+        #* put back the entities that went far from the screen
+        kept = []
+        for entity in self.entities:
+            if (entity.pos[0] < low[0] - DESPAWN_MARGIN or entity.pos[0] > high[0] + DESPAWN_MARGIN
+                    or entity.pos[1] < low[1] - DESPAWN_MARGIN or entity.pos[1] > high[1] + DESPAWN_MARGIN):
+                self.insert(self.save(entity))
+            else: kept.append(entity)
+        changed = len(kept) != len(self.entities)
+        if changed:
+            self.entities[:] = kept
+
+        #* create the entities that came near the screen, the records along the axis found by binary search
+        other = 1 - self.axis
+        start = bisect_left(self.keys, low[self.axis] - ACTIVATION_MARGIN)
+        end = bisect_right(self.keys, high[self.axis] + ACTIVATION_MARGIN)
+        index = start
+        while index < end:
+            record = self.records[index]
+            if low[other] - ACTIVATION_MARGIN <= record['pos'][other] <= high[other] + ACTIVATION_MARGIN:
+                del self.keys[index]
+                del self.records[index]
+                end -= 1
+                self.entities.append(self.create(record))
+                changed = True
+            else: index += 1
+        return changed
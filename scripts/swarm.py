@@ -0,0 +1,305 @@
+from scripts.tilemap import NEIGHBOR_OFFSETS
+try:
+    import numpy as np
+except ImportError: # numpy is optional, without it every tick enemy updates itself
+    np = None
+
+SWARM_AVAILABLE = np != None
+SWARM_MIN_TICKS = 16 # below this many simulated tick enemies, updating them one by one is faster
+GRID_PADDING = 3 # the empty cells around a TileGrid, so a clamped lookup and its neighbors land on empty cells
+
+class TileGrid:
+    def __init__(self, tilemap):
+        """
+        Initializes a TileGrid, the collision mesh of a tilemap laid out as flat arrays so many positions can be looked up at once.
+
+        Args:
+            tilemap (Tilemap): The tilemap to lay out. Its collision mesh is built if it needs to be.
+
+        Attributes:
+            collision_cells (dict): The collision mesh the grid was made from.
+            tile_size (int): The size of each tile.
+            origin (tuple): The grid position of the first cell, as (x, y).
+            width (int): The number of cells in a row.
+            height (int): The number of rows.
+            mesh (numpy.ndarray): The index into rects of the merged rect covering each cell, or -1, row by row.
+            solid (numpy.ndarray): Whether each cell holds a physics tile, row by row.
+            rects (numpy.ndarray): The merged rects as (left, top, right, bottom) rows, followed by an empty row that -1 indexes.
+            neighbors (numpy.ndarray): How far each of NEIGHBOR_OFFSETS is from a cell, in cells.
+            earlier_neighbors (numpy.ndarray): Whether neighbor j is checked before neighbor i, indexed [i, j].
+        """
+        if tilemap.collision_cells == None:
+            tilemap.build_collision_mesh()
+        self.collision_cells = tilemap.collision_cells
+        self.tile_size = tilemap.tile_size
+
+        cells = tilemap.collision_cells
+        left = min((location[0] for location in cells), default=0) - GRID_PADDING
+        top = min((location[1] for location in cells), default=0) - GRID_PADDING
+        self.origin = (left, top)
+        self.width = max((location[0] for location in cells), default=0) - left + GRID_PADDING + 1
+        self.height = max((location[1] for location in cells), default=0) - top + GRID_PADDING + 1
+        self.mesh = np.full(self.width * self.height, -1, np.int64)
+
+        rect_ids = {}
+        rects = []
+        for location, rect in cells.items():
+            if id(rect) not in rect_ids: # the cells of a merged rect share it
+                rect_ids[id(rect)] = len(rects)
+                rects.append((rect.left, rect.top, rect.right, rect.bottom))
+            self.mesh[(location[1] - top) * self.width + location[0] - left] = rect_ids[id(rect)]
+        rects.append((0, 0, 0, 0))
+        self.rects = np.array(rects, np.float64)
+        self.solid = self.mesh >= 0
+        self.neighbors = np.array([offset[1] * self.width + offset[0] for offset in NEIGHBOR_OFFSETS])
+        self.earlier_neighbors = np.tri(len(NEIGHBOR_OFFSETS), k=-1, dtype=bool)
+
+    def matches(self, tilemap) -> bool:
+        """
+        Returns whether the grid is still the layout of the given tilemap.
+
+        A change to the tiles makes a new collision mesh, and a level's mesh is kept in its snapshot,
+        so a tilemap with the same mesh has the same layout, even when the level was started again.
+
+        Args:
+            tilemap (Tilemap): The tilemap to check.
+
+        Returns:
+            bool: Whether the grid was made from this tilemap's current collision mesh.
+        """
+        return tilemap.collision_cells is self.collision_cells
+
+    def cells(self, tile_x, tile_y, margin=0):
+        """
+        Returns the index of many cells at once. A cell outside the grid is moved onto its padding, which is empty.
+
+        Args:
+            tile_x (numpy.ndarray): The grid x of each cell.
+            tile_y (numpy.ndarray): The grid y of each cell.
+            margin (int, optional): How far inside the edge the cells are kept, so their neighbors are too. Defaults to 0.
+
+        Returns:
+            numpy.ndarray: The index of each cell in mesh and solid.
+        """
+        x = np.minimum(np.maximum(tile_x.astype(np.int64) - self.origin[0], margin), self.width - 1 - margin)
+        y = np.minimum(np.maximum(tile_y.astype(np.int64) - self.origin[1], margin), self.height - 1 - margin)
+        return y * self.width + x
+
+    def tile_hits(self, rect_x, rect_y, size, tile_x, tile_y):
+        """
+        Tests many rects against the physics tile in one cell each, like colliderect with Tilemap.physics_specific_rect.
+
+        Args:
+            rect_x (numpy.ndarray): The left of each rect.
+            rect_y (numpy.ndarray): The top of each rect.
+            size (tuple): The size of the rects, as (width, height).
+            tile_x (numpy.ndarray): The grid x of the cell each rect is tested against.
+            tile_y (numpy.ndarray): The grid y of the cell each rect is tested against.
+
+        Returns:
+            numpy.ndarray: Whether each rect collides with a physics tile in its cell.
+        """
+        left = tile_x * self.tile_size
+        top = tile_y * self.tile_size
+        return (self.solid[self.cells(tile_x, tile_y)] & (rect_x < left + self.tile_size) & (rect_y < top + self.tile_size)
+                & (rect_x + size[0] > left) & (rect_y + size[1] > top))
+
+
+class TickSwarm:
+    def __init__(self, game, ticks, grid):
+        """
+        Initializes a TickSwarm, which moves the tick enemies of a level in one call per tick.
+
+        The positions and velocities of the tick enemies are kept in numpy arrays and step works
+        out the whole tick at once for the ones the game updates this tick: the same tile collisions,
+        gravity, edge and wall turning and bumping into each other as TickEnemy.update, with the
+        same results. Each tick enemy then copies its new state with apply when the enemy loop
+        reaches it, so everything the enemy loop does in order still happens in the same order.
+
+        Args:
+            game: The game the tick enemies belong to.
+            ticks (list): The tick enemies, in the order the game updates them. They must all be the same size.
+            grid (TileGrid): The layout of the level's tilemap.
+
+        Attributes:
+            game: The game the tick enemies belong to.
+            ticks (list): The tick enemies.
+            grid (TileGrid): The layout of the level's tilemap.
+            size (tuple): The size of the tick enemies.
+            x, y, vx, vy (numpy.ndarray): The positions and velocities of the tick enemies, as of the last step.
+            earlier (numpy.ndarray): Whether tick enemy j is updated before tick enemy i, indexed [i, j].
+            stepped (bool): Whether the last step moved the tick enemies. If not, they updated themselves.
+            results (dict): The new state of each tick enemy moved by the last step, as (x, y, vx, vy, flip, turned),
+                keyed by swarm index, where turned is whether flip is set.
+        """
+        self.game = game
+        self.ticks = ticks
+        self.grid = grid
+        self.size = ticks[0].size
+        for index, tick in enumerate(ticks):
+            tick.swarm = self
+            tick.swarm_index = index
+        self.sync()
+        self.earlier = np.tri(len(ticks), k=-1, dtype=bool)
+        self.stepped = False
+        self.results = {}
+
+    def sync(self) -> None:
+        """
+        Reads the positions and velocities of the tick enemies into the arrays, after they updated themselves.
+        """
+        self.x = np.array([tick.pos[0] for tick in self.ticks], np.float64)
+        self.y = np.array([tick.pos[1] for tick in self.ticks], np.float64)
+        self.vx = np.array([tick.velocity[0] for tick in self.ticks], np.float64)
+        self.vy = np.array([tick.velocity[1] for tick in self.ticks], np.float64)
+
+    def step(self) -> None:
+        """
+        Works out the next tick of the tick enemies the game updates this tick, see TickEnemy.update.
+        Must be called after the game's visibility and enemy_grid are updated and before the enemies are.
+
+        When fewer than the game's swarm_min_ticks of them are within the simulation margin, the swarm doesn't
+        step and they update themselves, so the arrays are read again before the next step.
+        """
+        active = [enemy.swarm_index for enemy in self.game.simulated_enemies if enemy.enemy_type == 'tick_enemy' and enemy.swarm == self]
+        was_stepped = self.stepped
+        self.stepped = len(active) >= self.game.swarm_min_ticks
+        if not self.stepped:
+            return
+        if not was_stepped:
+            self.sync()
+
+        w, h = self.size
+        grid = self.grid
+        tile_size = grid.tile_size
+        active = np.array(active)
+        start_x, start_y = self.x, self.y
+        vx = self.vx[active]
+        x, y, vy = self.move(start_x[active], start_y[active], vx, self.vy[active])
+        flip = vx < 0
+        turned = vx != 0 # the sprite keeps facing the same way when not moving sideways
+
+        #* turn at the edges of platforms and at walls, with the ground and walls on both sides looked up at once
+        left_x, right_x, new_y = x - 1, x + w, y + 1
+        tile_x, tile_y, below = x // tile_size, y // tile_size, new_y // tile_size + 1
+        ground_left, wall_left, ground_right, wall_right = grid.tile_hits(
+            np.trunc(np.stack((left_x, left_x, right_x, right_x))), np.trunc(new_y), self.size, 
+            np.stack((left_x // tile_size, tile_x - 1, right_x // tile_size, tile_x + 1)), np.stack((below, tile_y, below, tile_y)))
+        left = vx < 0
+        vx = np.where(left & ~ground_left, -vx, vx)
+        vx = np.where(left & wall_left, -vx, vx)
+        right = vx > 0 # after turning away from the left, the right is checked too
+        vx = np.where(right & ~ground_right, -vx, vx)
+        vx = np.where(right & wall_right, -vx, vx)
+
+        #* bump into each other: each tick enemy sees the ones updated before it where they moved to, and the rest where they were
+        enemy_grid = self.game.enemy_grid
+        rect_x, rect_y = np.trunc(x), np.trunc(y)
+        start_rect_x, start_rect_y = np.trunc(start_x), np.trunc(start_y)
+        moved_x, moved_y = start_rect_x.copy(), start_rect_y.copy() # the ones not updated stay where they were
+        moved_x[active], moved_y[active] = rect_x, rect_y
+        earlier = self.earlier[active]
+        other_x = np.where(earlier, moved_x, start_rect_x)
+        other_y = np.where(earlier, moved_y, start_rect_y)
+        cell_x = start_x // enemy_grid.cell_size # where the enemy_grid has them
+        cell_y = start_y // enemy_grid.cell_size
+        nearby = ((cell_x >= ((rect_x - enemy_grid.reach) // enemy_grid.cell_size)[:, None])
+                  & (cell_x <= ((rect_x + w + enemy_grid.reach) // enemy_grid.cell_size)[:, None])
+                  & (cell_y >= ((rect_y - enemy_grid.reach) // enemy_grid.cell_size)[:, None])
+                  & (cell_y <= ((rect_y + h + enemy_grid.reach) // enemy_grid.cell_size)[:, None]))
+        bumps = (nearby & (rect_x[:, None] < other_x + w) & (rect_y[:, None] < other_y + h)
+                 & (rect_x[:, None] + w > other_x) & (rect_y[:, None] + h > other_y))
+        bumps[np.arange(len(active)), active] = False # not with itself
+        vx = np.where(bumps.sum(axis=1) % 2 == 1, -vx, vx)
+
+        self.x, self.y, self.vx, self.vy = start_x.copy(), start_y.copy(), self.vx.copy(), self.vy.copy()
+        self.x[active], self.y[active], self.vx[active], self.vy[active] = x, y, vx, vy
+        self.results = dict(zip(active.tolist(), zip(x.tolist(), y.tolist(), vx.tolist(), vy.tolist(), flip.tolist(), turned.tolist())))
+
+    def move(self, x, y, vx, vy):
+        """
+        Moves the given tick enemies by their velocity, resolving tile collisions and applying gravity like PhysicsEntity.update.
+
+        Args:
+            x, y, vx, vy (numpy.ndarray): The positions and velocities of the tick enemies.
+
+        Returns:
+            tuple: The new x, y and vertical velocity.
+        """
+        scale = self.game.tick_scale
+        tile_size = self.grid.tile_size
+
+        x_movement = vx * scale
+        x, hit_x = self.collide(x + x_movement, y, x_movement, 0)
+        y_movement = vy * scale
+        y, hit_y = self.collide(x, y + y_movement, y_movement, 1)
+
+        #* gravity, rounded one by one with python's round, which numpy's doesn't always match
+        tile_x, tile_y = x // tile_size, y // tile_size
+        ground = self.grid.tile_hits(np.trunc(x), np.trunc(y) + 1, self.size, 
+                                     np.stack((tile_x, tile_x, tile_x + 1)), np.stack((tile_y, tile_y + 1, tile_y + 1))).any(axis=0)
+        falling_speed = 0.125 * scale
+        vy = vy.copy()
+        for index in np.flatnonzero(~ground).tolist():
+            velocity = float(vy[index])
+            vy[index] = round(min(5, velocity + falling_speed*0.2), 2) if velocity > 0 else round(min(5, velocity + falling_speed), 2)
+
+        vy[hit_y] = 0 # normal force
+        return x, y, vy
+
+    def collide(self, x, y, movement, axis):
+        """
+        Resolves the collisions of many tick enemies with the merged rects around them along one axis,
+        like PhysicsEntity.horizontal_collision and vertical_collision.
+
+        Every rect around every tick enemy is tested at once. The few tick enemies that hit one are then
+        pushed out one rect at a time in the order the cells are checked, as each push moves them.
+
+        Args:
+            x, y (numpy.ndarray): The positions of the tick enemies, after moving.
+            movement (numpy.ndarray): The movement along the axis.
+            axis (int): 0 for horizontal, 1 for vertical.
+
+        Returns:
+            tuple: The new position along the axis, and whether each tick enemy hit something while moving.
+        """
+        w, h = self.size
+        grid = self.grid
+        ids = grid.mesh[grid.cells(x // grid.tile_size, y // grid.tile_size, 1)[:, None] + grid.neighbors]
+        # a merged rect around more than one of the cells is only tested once
+        new = (ids >= 0) & ~((ids[:, :, None] == ids[:, None, :]) & grid.earlier_neighbors).any(axis=2)
+        left, top, right, bottom = grid.rects[ids].transpose(2, 0, 1)
+        rect_x, rect_y = np.trunc(x), np.trunc(y)
+        hits = (new & (rect_x[:, None] < right) & (rect_y[:, None] < bottom)
+                & (rect_x[:, None] + w > left) & (rect_y[:, None] + h > top)).any(axis=1)
+
+        position = (x if axis == 0 else y).copy()
+        hit_any = np.zeros(len(x), bool)
+        for index in np.flatnonzero(hits).tolist():
+            rx, ry, step = float(rect_x[index]), float(rect_y[index]), float(movement[index])
+            for rect in zip(new[index].tolist(), left[index].tolist(), top[index].tolist(), right[index].tolist(), bottom[index].tolist()):
+                if rect[0] and rx < rect[3] and ry < rect[4] and rx + w > rect[1] and ry + h > rect[2]:
+                    if axis == 0:
+                        rx = rect[1] - w if step > 0 else rect[3] if step < 0 else rx
+                        position[index] = rx
+                    else:
+                        ry = rect[2] - h if step > 0 else rect[4] if step < 0 else ry
+                        position[index] = ry
+                    hit_any[index] = hit_any[index] or step != 0
+        return position, hit_any
+
+    def apply(self, tick) -> None:
+        """
+        Gives a tick enemy its state from the last step, in place of its own update.
+
+        Args:
+            tick (TickEnemy): The tick enemy, one of the swarm's.
+        """
+        x, y, vx, vy, flip, turned = self.results[tick.swarm_index]
+        tick.pos[0] = x
+        tick.pos[1] = y
+        tick.velocity[0] = vx
+        tick.velocity[1] = vy
+        if turned:
+            tick.flip = flip
+        tick.animation.update(self.game.tick_scale)
@@ -1,8 +1,17 @@
 import pygame as py
-import json
+import gc, json, mmap, struct
 
 NEIGHBOR_OFFSETS = [(-1, -1), (0, -1), (1, -1), (-1,0), (0, 0), (1, 0), (-1, 1), (0, 1), (1, 1)]
 PHYSICS_TILES = {'dirt', 'air'}
+CHUNK_SIZE = 16 # the width and height of a render chunk, in tiles
+NULL_RECT = py.Rect(-1000, -1000, 1, 1) #! THE NULL RECT IS REAL
+
+# compiled level format: a header, a table of tile type names, then one fixed size record per tile
+COMPILED_MAGIC = b'JHHL'
+COMPILED_VERSION = 1
+COMPILED_HEADER = struct.Struct('<4sHHHII') # magic, version, tile size, type count, on-grid count, off-grid count
+COMPILED_TILE = struct.Struct('<iiBBBx') # x, y, type index, variant, rotations
+COMPILED_OFFGRID_TILE = struct.Struct('<ddBBBx') # x, y, type index, variant, rotations
 
 class Tilemap:
     def __init__(self, game, tile_size=16):
@@ -16,19 +25,168 @@ class Tilemap:
         Attributes:
             game: The game instance to which this tilemap belongs.
             tile_size (int): The size of each tile.
-            tilemap (dict): A dictionary storing the on-grid tiles.
+            tilemap (dict): A dictionary storing the on-grid tiles, keyed by (x, y) grid position.
             offgrid_tiles (list): A list storing the off-grid tiles.
+            chunks (dict): The pre-rendered chunk surfaces, keyed by chunk position. A chunk is None if it has nothing to draw.
+            chunk_signs (dict): The sign tiles of each pre-rendered chunk, keyed by chunk position. Signs are drawn every frame.
+            collision_cells (dict): The collision mesh, mapping the grid position of every physics tile to the merged rect covering it. None when it needs rebuilding.
+            tile_rects (dict): The rect of every physics tile, keyed by grid position.
+            revision (int): A counter bumped on every change to the tiles, used to tell whether a snapshot is still current.
+            tile_index (dict): The grid positions of the on-grid tiles, keyed by (type, variant). Each entry is a dict used as an ordered set.
+            offgrid_index (dict): The off-grid tiles, keyed by (type, variant).
         """
 
         self.game = game
         self.tile_size = tile_size
         self.tilemap = {}
         self.offgrid_tiles = []
+        self.chunks = {}
+        self.chunk_signs = {}
+        self.collision_cells = None
+        self.tile_rects = {}
+        self.revision = 0
+        self.tile_index = {}
+        self.offgrid_index = {}
+
+    def set_tile(self, tile_pos, tile_type, variant, rotations=0):
+        """
+        Places a tile on the grid, replacing any tile already there, and invalidates the chunk it belongs to.
+
+        Args:
+            tile_pos (tuple): The grid position of the tile, given as (x, y) tile coordinates.
+            tile_type (str): The type of the tile.
+            variant (int): The variant of the tile.
+            rotations (int, optional): The number of times the tile is rotated clockwise. Defaults to 0.
+        """
+        location = (tile_pos[0], tile_pos[1])
+        if location in self.tilemap:
+            self.unindex_tile(location, self.tilemap[location])
+        self.tilemap[location] = {'type': tile_type, 'variant': variant, 'pos': [tile_pos[0], tile_pos[1]], 'rotations': rotations}
+        self.tile_index.setdefault((tile_type, variant), {})[location] = None
+        self.invalidate(tile_pos)
+
+    def remove_tile(self, tile_pos):
+        """
+        Removes the tile at the given grid position, if there is one, and invalidates the chunk it belonged to.
+
+        Args:
+            tile_pos (tuple): The grid position of the tile, given as (x, y) tile coordinates.
+
+        Returns:
+            dict: The removed tile, or None if there was no tile at the position.
+        """
+        tile = self.tilemap.pop((tile_pos[0], tile_pos[1]), None)
+        if tile != None:
+            self.unindex_tile((tile_pos[0], tile_pos[1]), tile)
+            self.invalidate(tile_pos)
+        return tile
+
+    def add_offgrid_tile(self, tile):
+        """
+        Adds an off-grid tile.
+
+        Args:
+            tile (dict): The tile, with 'type', 'variant', 'pos' and 'rotations' keys.
+        """
+        self.offgrid_tiles.append(tile)
+        self.offgrid_index.setdefault((tile['type'], tile['variant']), []).append(tile)
+        self.revision += 1
+
+    def remove_offgrid_tile(self, tile):
+        """
+        Removes an off-grid tile.
+
+        Args:
+            tile (dict): The tile to remove, as found in offgrid_tiles.
+        """
+        self.offgrid_tiles.remove(tile)
+        self.offgrid_index[(tile['type'], tile['variant'])].remove(tile)
+        self.revision += 1
+
+    def unindex_tile(self, location, tile):
+        """
+        Removes an on-grid tile from tile_index.
+
+        Args:
+            location (tuple): The grid position of the tile.
+            tile (dict): The tile.
+        """
+        locations = self.tile_index.get((tile['type'], tile['variant']))
+        if locations != None:
+            locations.pop(location, None)
+
+    def invalidate(self, tile_pos):
+        """
+        Throws away the pre-rendered chunk containing the given grid position, so it gets rebuilt the next time it is drawn,
+        and marks the collision mesh for rebuilding.
+
+        Args:
+            tile_pos (tuple): The grid position of the changed tile, given as (x, y) tile coordinates.
+        """
+        chunk = (int(tile_pos[0]) // CHUNK_SIZE, int(tile_pos[1]) // CHUNK_SIZE)
+        self.chunks.pop(chunk, None)
+        self.chunk_signs.pop(chunk, None)
+        self.collision_cells = None
+        self.revision += 1
+
+    def clear_caches(self):
+        """
+        Throws away every pre-rendered chunk and the collision mesh, after the whole tilemap has been replaced.
+        """
+        self.chunks = {}
+        self.chunk_signs = {}
+        self.collision_cells = None
+        self.revision += 1
+
+    def snapshot(self):
+        """
+        Captures the current tiles so they can be put back later with restore.
+
+        The tile dicts themselves are shared with the snapshot, which is safe because tiles are
+        always replaced through set_tile rather than modified in place. So is the collision mesh,
+        if it's built, as a change to the tiles makes a new one rather than changing it.
+
+        Returns:
+            dict: The snapshot, holding the tilemap, off-grid tiles, tile indexes, collision mesh, tile size and revision.
+        """
+        return {'tilemap': self.tilemap.copy(), 'offgrid_tiles': self.offgrid_tiles.copy(), 
+                'tile_index': {id_pair: locations.copy() for id_pair, locations in self.tile_index.items()}, 
+                'offgrid_index': {id_pair: tiles.copy() for id_pair, tiles in self.offgrid_index.items()}, 
+                'collision_cells': self.collision_cells, 'tile_rects': self.tile_rects, 
+                'tile_size': self.tile_size, 'revision': self.revision}
+
+    def restore(self, snapshot):
+        """
+        Puts back the tiles captured by snapshot.
+
+        If no tile has changed since the snapshot was taken, this does nothing, which keeps the
+        pre-rendered chunks. The collision mesh comes back with the tiles, so it only needs building
+        again if it wasn't built when the snapshot was taken.
+
+        Args:
+            snapshot (dict): A snapshot returned by snapshot.
+        """
+        if snapshot['revision'] == self.revision:
+            return
+        self.tilemap = snapshot['tilemap'].copy()
+        self.offgrid_tiles = snapshot['offgrid_tiles'].copy()
+        self.tile_size = snapshot['tile_size']
+        self.chunks = {}
+        self.chunk_signs = {}
+        self.collision_cells = snapshot['collision_cells']
+        self.tile_rects = snapshot['tile_rects']
+        self.tile_index = {id_pair: locations.copy() for id_pair, locations in snapshot['tile_index'].items()}
+        self.offgrid_index = {id_pair: tiles.copy() for id_pair, tiles in snapshot['offgrid_index'].items()}
+        self.revision = snapshot['revision']
 
     def extract(self, id_pairs:list, keep=False):
         """
         Extracts tiles from the tilemap and offgrid tiles that match the specified id pairs.
 
+        The matching tiles are looked up in tile_index and offgrid_index, so this costs time
+        proportional to the number of matches rather than the size of the map. Matches are
+        returned off-grid tiles first, then grouped in the order of id_pairs.
+
         Args:
             id_pairs (list): A list of tuples, where each tuple contains a tile type and variant to match.
             keep (bool, optional): If True, the matching tiles will not be removed from the tilemap or offgrid tiles. Defaults to False.
@@ -37,64 +195,146 @@ class Tilemap:
             list: A list of copies of the matching tiles. The positions of the tiles from the tilemap are scaled by the tile size.
         """
         matches = []
-        for tile in self.offgrid_tiles.copy():
-            if (tile['type'], tile['variant']) in id_pairs: 
+        removed = []
+        for id_pair in id_pairs:
+            for tile in self.offgrid_index.get(id_pair, ()):
                 matches.append(tile.copy())
-                if not keep:
-                    self.offgrid_tiles.remove(tile)
+            if not keep and self.offgrid_index.get(id_pair):
+                removed.extend(self.offgrid_index.pop(id_pair))
+        if removed:
+            removed_ids = {id(tile) for tile in removed}
+            self.offgrid_tiles = [tile for tile in self.offgrid_tiles if id(tile) not in removed_ids]
+            self.revision += 1
 
-        for location in list(self.tilemap):
-            tile = self.tilemap[location]
-            if (tile['type'], tile['variant']) in id_pairs:
+        for id_pair in id_pairs:
+            for location in list(self.tile_index.get(id_pair, ())):
+                tile = self.tilemap[location]
                 matches.append(tile.copy())
-                matches[-1]['pos'] = matches[-1]['pos'].copy()
-                matches[-1]['pos'][0] *= self.tile_size
-                matches[-1]['pos'][1] *= self.tile_size
+                matches[-1]['pos'] = [tile['pos'][0] * self.tile_size, tile['pos'][1] * self.tile_size]
                 if not keep:
                     del self.tilemap[location]
+                    self.invalidate(location)
+            if not keep:
+                self.tile_index.pop(id_pair, None)
         return matches
 
+    def build_collision_mesh(self):
+        """
+        Builds the collision mesh by greedily merging the physics tiles into as few rectangles as possible.
+
+        Going row by row, each physics tile not yet covered starts a new rectangle, which is
+        stretched right as far as the run of physics tiles goes and then down for as long as the
+        row below has the same run. Every covered grid position is then mapped to its rectangle,
+        which makes looking up the rects near an entity a handful of dictionary lookups.
+        """
+        solid = set()
+        for location, tile in self.tilemap.items():
+            if tile['type'] in PHYSICS_TILES:
+                solid.add(location)
+
+        self.collision_cells = {}
+        self.tile_rects = {}
+        for location in sorted(solid, key=lambda location: (location[1], location[0])):
+            if location in self.collision_cells:
+                continue
+            x, y = location
+            width = 1
+            while (x + width, y) in solid and (x + width, y) not in self.collision_cells:
+                width += 1
+            height = 1
+            while all((x + i, y + height) in solid and (x + i, y + height) not in self.collision_cells for i in range(width)):
+                height += 1
+            rect = py.Rect(x * self.tile_size, y * self.tile_size, width * self.tile_size, height * self.tile_size)
+            for i in range(width):
+                for j in range(height):
+                    self.collision_cells[(x + i, y + j)] = rect
+                    self.tile_rects[(x + i, y + j)] = py.Rect((x + i) * self.tile_size, (y + j) * self.tile_size, self.tile_size, self.tile_size)
+
+    def build_chunk(self, chunk):
+        """
+        Pre-renders every on-grid tile inside the given chunk onto a single off-screen surface.
+
+        Sign tiles (empty_dirt variant 3) depend on the current level, so they are collected
+        into chunk_signs instead of being drawn onto the chunk.
+
+        Args:
+            chunk (tuple): The chunk position, given as (x, y) chunk coordinates.
+        """
+        chunk_surf = py.Surface((CHUNK_SIZE * self.tile_size, CHUNK_SIZE * self.tile_size))
+        chunk_surf.set_colorkey((0, 0, 0))
+        signs = []
+        empty = True
+        for x in range(chunk[0] * CHUNK_SIZE, (chunk[0] + 1) * CHUNK_SIZE):
+            for y in range(chunk[1] * CHUNK_SIZE, (chunk[1] + 1) * CHUNK_SIZE):
+                location = (x, y)
+                if location in self.tilemap:
+                    tile = self.tilemap[location]
+                    if tile['type'] == 'empty_dirt' and tile['variant'] == 3:
+                        signs.append(tile)
+                        continue
+                    elif tile['type'] == 'air' and tile['variant'] == 0 and self.game.__str__() != 'Game':
+                        img = self.game.atlas.tile(tile['type'], 1, tile['rotations'])
+                    else:
+                        img = self.game.atlas.tile(tile['type'], tile['variant'], tile['rotations'])
+                    chunk_surf.blit(img, ((x - chunk[0] * CHUNK_SIZE) * self.tile_size, (y - chunk[1] * CHUNK_SIZE) * self.tile_size))
+                    empty = False
+        self.chunks[chunk] = None if empty else chunk_surf
+        self.chunk_signs[chunk] = signs
+
+    def render_sign(self, tile, offset=(0, 0)):
+        """
+        Draws the hint text of the current level at the position of a sign tile.
+
+        Args:
+            tile (dict): The sign tile.
+            offset (tuple, optional): The offset used to adjust the tile position for scrolling, given as (x, y) coordinates.
+        """
+        try:
+            if self.game.current_level == 1: 
+                self.game.display.blit(py.font.Font.render(self.game.normal_text, "WAD - Arrow Keys - Space", True, (0, 0, 0)), (tile['pos'][0] * self.tile_size - offset[0], tile['pos'][1] * self.tile_size - offset[1]))
+                self.game.display.blit(py.font.Font.render(self.game.normal_text, "Get to the Star", True, (0, 0, 0)), (tile['pos'][0] * self.tile_size - offset[0], (tile['pos'][1]+2) * self.tile_size - offset[1]))
+            if self.game.current_level == 2: 
+                self.game.display.blit(py.font.Font.render(self.game.normal_text, "They're Not Nice", True, (0, 0, 0)), (tile['pos'][0] * self.tile_size - offset[0], tile['pos'][1] * self.tile_size - offset[1]))
+            if self.game.current_level == 3: 
+                self.game.display.blit(py.font.Font.render(self.game.normal_text, "Look Out from Above", True, (0, 0, 0)), (tile['pos'][0] * self.tile_size - offset[0], tile['pos'][1] * self.tile_size - offset[1]))
+            if self.game.current_level == 4: 
+                self.game.display.blit(py.font.Font.render(self.game.normal_text, "Watch the Ground for Moles", True, (0, 0, 0)), (tile['pos'][0] * self.tile_size - offset[0], tile['pos'][1] * self.tile_size - offset[1]))
+            if self.game.current_level == 5: 
+                self.game.display.blit(py.font.Font.render(self.game.normal_text, "Just One Hare Higher", True, (0, 0, 0)), (tile['pos'][0] * self.tile_size - offset[0], tile['pos'][1] * self.tile_size - offset[1]))
+        except AttributeError:
+            pass
+
     def render(self, surface, offset=(0, 0)):
         """
         Renders the tiles onto the given surface, applying an offset for scrolling.
 
-        This function iterates through both off-grid and on-grid tiles, drawing each tile
-        onto the provided surface. Off-grid tiles are rendered directly at their specified
-        positions, while on-grid tiles are rendered based on the visible region determined
-        by the surface size and the provided offset. 
+        Off-grid tiles on screen are rendered directly at their specified positions. On-grid tiles are
+        drawn one pre-rendered chunk at a time, so only the handful of chunks overlapping the
+        visible region are blitted each frame. Chunks are built the first time they are seen
+        and rebuilt only after a tile inside them changes.
 
         Args:
             surface (pygame.Surface): The surface to render the tiles onto.
             offset (tuple, optional): The offset used to adjust the tile positions for
                                     scrolling, given as (x, y) coordinates.
         """
+        width, height = surface.get_size()
         for tile in self.offgrid_tiles:
-            surface.blit(py.transform.rotate(self.game.assets[tile['type']][tile['variant']], -90 * tile['rotations']), (tile['pos'][0] - offset[0], tile['pos'][1] - offset[1]))
+            x, y = tile['pos'][0] - offset[0], tile['pos'][1] - offset[1]
+            if x + self.tile_size > 0 and x < width and y + self.tile_size > 0 and y < height:
+                surface.blit(self.game.atlas.tile(tile['type'], tile['variant'], tile['rotations']), (x, y))
+
+        chunk_px = CHUNK_SIZE * self.tile_size
+        for cx in range(offset[0] // chunk_px, (offset[0] + surface.get_width()) // chunk_px + 1):
+            for cy in range(offset[1] // chunk_px, (offset[1] + surface.get_height()) // chunk_px + 1):
+                chunk = (cx, cy)
+                if chunk not in self.chunks:
+                    self.build_chunk(chunk)
+                if self.chunks[chunk] != None:
+                    surface.blit(self.chunks[chunk], (cx * chunk_px - offset[0], cy * chunk_px - offset[1]))
+                for tile in self.chunk_signs[chunk]:
+                    self.render_sign(tile, offset)
 
-        for x in range(offset[0] // self.tile_size, (offset[0] + surface.get_width()) // self.tile_size + 1):
-            for y in range(offset[1] // self.tile_size, (offset[1] + surface.get_height()) // self.tile_size + 1):
-                location = str(x) + ';' + str(y)
-                if location in self.tilemap:
-                    tile = self.tilemap[location] 
-                    if tile['type'] == 'empty_dirt' and tile['variant'] == 3:
-                        try:
-                            if self.game.current_level == 1: 
-                                self.game.display.blit(py.font.Font.render(self.game.normal_text, "WAD - Arrow Keys - Space", True, (0, 0, 0)), (tile['pos'][0] * self.tile_size - offset[0], tile['pos'][1] * self.tile_size - offset[1]))
-                                self.game.display.blit(py.font.Font.render(self.game.normal_text, "Get to the Star", True, (0, 0, 0)), (tile['pos'][0] * self.tile_size - offset[0], (tile['pos'][1]+2) * self.tile_size - offset[1]))
-                            if self.game.current_level == 2: 
-                                self.game.display.blit(py.font.Font.render(self.game.normal_text, "They're Not Nice", True, (0, 0, 0)), (tile['pos'][0] * self.tile_size - offset[0], tile['pos'][1] * self.tile_size - offset[1]))
-                            if self.game.current_level == 3: 
-                                self.game.display.blit(py.font.Font.render(self.game.normal_text, "Look Out from Above", True, (0, 0, 0)), (tile['pos'][0] * self.tile_size - offset[0], tile['pos'][1] * self.tile_size - offset[1]))
-                            if self.game.current_level == 4: 
-                                self.game.display.blit(py.font.Font.render(self.game.normal_text, "Watch the Ground for Moles", True, (0, 0, 0)), (tile['pos'][0] * self.tile_size - offset[0], tile['pos'][1] * self.tile_size - offset[1]))
-                            if self.game.current_level == 5: 
-                                self.game.display.blit(py.font.Font.render(self.game.normal_text, "Just One Hare Higher", True, (0, 0, 0)), (tile['pos'][0] * self.tile_size - offset[0], tile['pos'][1] * self.tile_size - offset[1]))
-                        except AttributeError:
-                            pass
-                    elif tile['type'] == 'air' and tile['variant'] == 0 and self.game.__str__() != 'Game':
-                        surface.blit(py.transform.rotate(self.game.assets[tile['type']][1], -90 * tile['rotations']), (tile['pos'][0] * self.tile_size - offset[0], tile['pos'][1] * self.tile_size - offset[1]))
-                    else:
-                        surface.blit(py.transform.rotate(self.game.assets[tile['type']][tile['variant']], -90 * tile['rotations']), (tile['pos'][0] * self.tile_size - offset[0], tile['pos'][1] * self.tile_size - offset[1]))
     def tiles_around(self, pos):
         """
         Returns a list of tiles surrounding the given position in the tilemap.
@@ -109,11 +349,12 @@ class Tilemap:
             list: A list of tiles found around the specified position.
         """
         tiles = []
-        tile_location = (int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
+        tile_x = int(pos[0] // self.tile_size)
+        tile_y = int(pos[1] // self.tile_size)
         for offset in NEIGHBOR_OFFSETS:
-            check_location = str(tile_location[0] + offset[0]) + ';' + str(tile_location[1] + offset[1])
-            if check_location in self.tilemap:
-                tiles.append(self.tilemap[check_location])
+            tile = self.tilemap.get((tile_x + offset[0], tile_y + offset[1]))
+            if tile != None:
+                tiles.append(tile)
         return tiles
     
     def tile_around(self, pos, tile_offset):
@@ -123,35 +364,38 @@ class Tilemap:
         If the tile at the offset position is not found, it returns None.
         If the tile is of a type included in PHYSICS_TILES, it returns the tile's properties.
         """
-        tile_location = (str(int(pos[0] // self.tile_size) + tile_offset[0]) + ';' + str(int(pos[1] // self.tile_size) + tile_offset[1]))
-        if tile_location in self.tilemap: 
-            return self.tilemap[tile_location]
-        return None
+        return self.tilemap.get((int(pos[0] // self.tile_size) + tile_offset[0], int(pos[1] // self.tile_size) + tile_offset[1]))
     
     def physics_rects_around(self, pos):
         """
-        Returns a list of pygame.Rects of the physics tiles around the given position in the tilemap.
+        Returns a list of the collision mesh rects around the given position in the tilemap.
         
-        Only tiles of type in PHYSICS_TILES are included in the list.
+        The rects come from the prebuilt collision mesh, so a rect can cover many physics tiles
+        and is shared between callers. They must not be modified.
         
         Args:
             pos (tuple): The position to check around.
         
         Returns:
-            list: A list of pygame.Rects of the physics tiles around the position.
+            list: A list of pygame.Rects of the merged physics tiles around the position.
         """
+        if self.collision_cells == None:
+            self.build_collision_mesh()
         rects = []
-        for tile in self.tiles_around(pos):
-            if tile['type'] in PHYSICS_TILES:   
-                rects.append(py.Rect(tile['pos'][0] * self.tile_size, tile['pos'][1] * self.tile_size, self.tile_size, self.tile_size))
+        tile_x = int(pos[0] // self.tile_size)
+        tile_y = int(pos[1] // self.tile_size)
+        for offset in NEIGHBOR_OFFSETS:
+            rect = self.collision_cells.get((tile_x + offset[0], tile_y + offset[1]))
+            if rect is not None and rect not in rects: # comparing a Rect with None raises and catches an error inside pygame
+                rects.append(rect)
         return rects
     
     def physics_specific_rect(self, pos, tile_offset):
         """
         Returns the pygame.Rect of a specific tile with a given offset from the provided tilemap position.
 
-        If the tile at the offset position is not found, it returns a dummy Rect at (-1000, -1000).
-        If the tile is of a type included in PHYSICS_TILES, it returns the Rect based on the tile's position and the tile size.
+        If the tile at the offset position is not found, or is not of a type included in PHYSICS_TILES,
+        it returns NULL_RECT, a dummy Rect at (-1000, -1000). The returned rect is shared and must not be modified.
         
         Args:
             pos (tuple): The position to check around.
@@ -160,15 +404,103 @@ class Tilemap:
         Returns:
             py.Rect: The rectangle of the specific tile or a dummy rectangle if no valid tile is found.
         """
-        tile = self.tile_around(pos, tile_offset)
-        if tile == None: return py.Rect(-1000, -1000, 1, 1) #! THE NULL RECT IS REAL
-        if tile['type'] in PHYSICS_TILES:
-            return py.Rect(tile['pos'][0] * self.tile_size, tile['pos'][1] * self.tile_size, self.tile_size, self.tile_size)
-        return py.Rect(-1000, -1000, 1, 1) #! THE NULL RECT IS REAL
+        if self.collision_cells == None:
+            self.build_collision_mesh()
+        return self.tile_rects.get((int(pos[0] // self.tile_size) + tile_offset[0], int(pos[1] // self.tile_size) + tile_offset[1]), NULL_RECT)
+
+    def save_compiled(self, path):
+        """
+        Saves the current tilemap to the given path in the compiled binary level format.
+
+        The file starts with a header holding the magic bytes, format version, tile size, and the
+        number of tile types, on-grid tiles and off-grid tiles. It is followed by the tile type
+        names, each as a length byte and utf-8 text, and then one fixed size record per on-grid
+        tile (x, y, type index, variant, rotations) and per off-grid tile (the same, with float positions).
+
+        Args:
+            path (str): The path to write the compiled level to.
+        """
+        types = sorted({tile['type'] for tile in self.tilemap.values()} | {tile['type'] for tile in self.offgrid_tiles})
+        type_ids = {tile_type: i for i, tile_type in enumerate(types)}
+
+        data = bytearray(COMPILED_HEADER.pack(COMPILED_MAGIC, COMPILED_VERSION, self.tile_size, len(types), len(self.tilemap), len(self.offgrid_tiles)))
+        for tile_type in types:
+            name = tile_type.encode('utf-8')
+            data += bytes([len(name)]) + name
+        for location, tile in self.tilemap.items():
+            data += COMPILED_TILE.pack(location[0], location[1], type_ids[tile['type']], tile['variant'], tile.get('rotations', 0))
+        for tile in self.offgrid_tiles:
+            data += COMPILED_OFFGRID_TILE.pack(tile['pos'][0], tile['pos'][1], type_ids[tile['type']], tile['variant'], tile.get('rotations', 0))
+
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    def load_compiled(self, path):
+        """
+        Loads a tilemap from a level compiled with save_compiled.
+
+        The file is memory-mapped and its fixed size records are unpacked straight from the
+        mapping, which skips the JSON parsing done by load. The garbage collector is paused while
+        the tiles are built, since creating thousands of small dicts would otherwise trigger
+        several full collections.
+
+        Args:
+            path (str): The path of the compiled level.
+
+        Raises:
+            ValueError: If the file is not a compiled level, was compiled with another format version,
+                or is shorter or longer than its header says, like a file left by an interrupted compile.
+        """
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if len(data) < COMPILED_HEADER.size:
+                    raise ValueError(f'{path} is too short to be a compiled level')
+                magic, version, tile_size, type_count, tile_count, offgrid_count = COMPILED_HEADER.unpack_from(data, 0)
+                if magic != COMPILED_MAGIC or version != COMPILED_VERSION:
+                    raise ValueError(f'{path} is not a version {COMPILED_VERSION} compiled level')
+
+                offset = COMPILED_HEADER.size
+                types = []
+                for i in range(type_count):
+                    if offset >= len(data) or offset + 1 + data[offset] > len(data):
+                        raise ValueError(f'{path} ends before its tile types')
+                    types.append(data[offset + 1:offset + 1 + data[offset]].decode('utf-8'))
+                    offset += 1 + data[offset]
+                if offset + tile_count * COMPILED_TILE.size + offgrid_count * COMPILED_OFFGRID_TILE.size != len(data):
+                    raise ValueError(f'{path} holds {len(data) - offset} bytes of tiles, not the {tile_count} on-grid and {offgrid_count} off-grid tiles of its header')
+
+                tilemap = {}
+                offgrid_tiles = []
+                tile_index = {}
+                offgrid_index = {}
+                gc_enabled = gc.isenabled()
+                gc.disable()
+                try:
+                    with memoryview(data) as view:
+                        end = offset + tile_count * COMPILED_TILE.size
+                        for x, y, type_id, variant, rotations in COMPILED_TILE.iter_unpack(view[offset:end]):
+                            tilemap[(x, y)] = {'type': types[type_id], 'variant': variant, 'pos': [x, y], 'rotations': rotations}
+                            tile_index.setdefault((types[type_id], variant), {})[(x, y)] = None
+                        offset, end = end, end + offgrid_count * COMPILED_OFFGRID_TILE.size
+                        for x, y, type_id, variant, rotations in COMPILED_OFFGRID_TILE.iter_unpack(view[offset:end]):
+                            offgrid_tiles.append({'type': types[type_id], 'variant': variant, 'pos': [x, y], 'rotations': rotations})
+                            offgrid_index.setdefault((types[type_id], variant), []).append(offgrid_tiles[-1])
+                finally:
+                    if gc_enabled:
+                        gc.enable()
+
+        self.tilemap = tilemap
+        self.tile_size = tile_size
+        self.offgrid_tiles = offgrid_tiles
+        self.tile_index = tile_index
+        self.offgrid_index = offgrid_index
+        self.clear_caches()
 
     def save(self, path):
         """
         Saves the current tilemap to the given path as a json file.
+
+        The (x, y) tuple keys used in memory are written back out as 'x;y' strings.
         
         The json file will contain a dictionary with the following keys:
         - 'tilemap': the tilemap as a dictionary of dictionaries, where the keys are the 
@@ -183,12 +515,15 @@ class Tilemap:
             tiles that are not part of the main tilemap (i.e. the tiles that are not
             aligned with the grid)
         """
+        tilemap = {str(location[0]) + ';' + str(location[1]): tile for location, tile in self.tilemap.items()}
         with open(path, 'w') as f:
-            json.dump({'tilemap': self.tilemap, 'tile_size': self.tile_size, 'offgrid_tiles': self.offgrid_tiles}, f)
+            json.dump({'tilemap': tilemap, 'tile_size': self.tile_size, 'offgrid_tiles': self.offgrid_tiles}, f)
     
     def load(self, path):
         """
-        Loads a tilemap from the given path. The tilemap is expected to be in the following format:
+        Loads a tilemap from the given path. The 'x_pos;y_pos' keys of the file are turned into
+        (x, y) integer tuples, which is how the tilemap is keyed in memory. The tilemap is expected
+        to be in the following format:
         {
             'tilemap': {'x_pos;y_pos': {'type': str, 'variant': int, 'rotations': int, 'pos': (int, int)}}, 
             'tile_size': int, 
@@ -199,6 +534,17 @@ class Tilemap:
         with open(path, 'r') as f:
             map_data = json.load(f)
         
-        self.tilemap = map_data['tilemap']
+        self.tilemap = {}
+        self.tile_index = {}
+        for location, tile in map_data['tilemap'].items():
+            x, y = location.split(';')
+            tile.setdefault('rotations', 0) # older maps were saved before tiles could be rotated
+            self.tilemap[(int(x), int(y))] = tile
+            self.tile_index.setdefault((tile['type'], tile['variant']), {})[(int(x), int(y))] = None
         self.tile_size = map_data['tile_size']
-        self.offgrid_tiles = map_data['offgrid_tiles']
\ No newline at end of file
+        self.offgrid_tiles = map_data['offgrid_tiles']
+        self.offgrid_index = {}
+        for tile in self.offgrid_tiles:
+            tile.setdefault('rotations', 0)
+            self.offgrid_index.setdefault((tile['type'], tile['variant']), []).append(tile)
+        self.clear_caches()
\ No newline at end of file
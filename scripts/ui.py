@@ -0,0 +1,151 @@
+import pygame as py
+
+HOVER_COLORKEY = (255, 0, 255) # marks the transparent corners of a button's hover background
+
+class Button:
+    def __init__(self, rect, hit_rect=None, radius=25, hover_background=True, hover_labels=()):
+        """
+        Initializes a Button, a clickable area of a Menu.
+
+        The button's normal look is drawn into its menu's panel, so a button only keeps what is drawn
+        under the panel while the mouse is over it: its background, drawn opaque, and its labels.
+        Both are rendered once here.
+
+        Args:
+            rect (tuple): The drawn area of the button on the display, as (x, y, width, height).
+            hit_rect (tuple, optional): The area of the display that counts as the button when hovering and clicking.
+                Defaults to rect.
+            radius (int, optional): The corner radius of the button. Defaults to 25.
+            hover_background (bool, optional): Whether the background is drawn again when hovered. Defaults to True.
+            hover_labels (list, optional): The labels drawn when hovered, as (surface, (x, y)) pairs in display coordinates.
+                Defaults to no labels.
+
+        Attributes:
+            rect (pygame.Rect): The drawn area of the button on the display.
+            hit_rect (pygame.Rect): The area of the display that counts as the button.
+            hover_image (pygame.Surface): The background drawn when hovered, or None.
+            hover_labels (list): The labels drawn when hovered.
+        """
+        self.rect = py.Rect(rect)
+        self.hit_rect = py.Rect(hit_rect if hit_rect != None else rect)
+        self.hover_labels = list(hover_labels)
+
+        self.hover_image = None
+        if hover_background:
+            # drawn on a surface without per-pixel alpha, matching drawing straight onto the display
+            self.hover_image = py.Surface(self.rect.size)
+            self.hover_image.fill(HOVER_COLORKEY)
+            self.hover_image.set_colorkey(HOVER_COLORKEY)
+            py.draw.rect(self.hover_image, (150, 150, 150), ((0, 0), self.rect.size), 0, radius)
+            py.draw.rect(self.hover_image, (0, 0, 0), ((0, 0), self.rect.size), 2, radius)
+
+    def render_hover(self, surface) -> None:
+        """
+        Draws the hovered look of the button onto the given surface.
+
+        Args:
+            surface (pygame.Surface): The surface to draw onto, below the menu's panel.
+        """
+        if self.hover_image != None:
+            surface.blit(self.hover_image, self.rect.topleft)
+        for label, pos in self.hover_labels:
+            surface.blit(label, pos)
+
+
+class Menu:
+    def __init__(self, size=(640, 360)):
+        """
+        Initializes a Menu, a retained set of widgets drawn from cached surfaces.
+
+        Everything that doesn't change while the menu is open is drawn into the panel once, so a frame
+        of the menu is a few blits: the hovered button, the panel and the overlays. The hit-test rects
+        are scaled to the window once per scale instead of being rebuilt every frame.
+
+        Args:
+            size (tuple, optional): The size of the panel, as (width, height). Defaults to (640, 360).
+
+        Attributes:
+            panel (pygame.Surface): The static look of the menu, drawn once by its owner.
+            overlays (list): The images drawn over the panel, as (surface, (x, y)) pairs.
+            buttons (dict): The buttons of the menu, keyed by the name the menu's events use.
+            rects (dict): The hit-test rects of the buttons in window coordinates, keyed like buttons.
+            scale (int): The scale the rects were built for.
+        """
+        self.panel = py.Surface(size, py.SRCALPHA)
+        self.overlays = []
+        self.buttons = {}
+        self.rects = {}
+        self.scale = None
+
+    def add_button(self, key, button) -> Button:
+        """
+        Adds a button to the menu.
+
+        Args:
+            key: The name of the button, used by the menu's events.
+            button (Button): The button to add.
+
+        Returns:
+            Button: The added button.
+        """
+        self.buttons[key] = button
+        self.scale = None
+        return button
+
+    def add_overlay(self, image, pos) -> None:
+        """
+        Adds an image drawn over the panel every frame.
+
+        Args:
+            image (pygame.Surface): The image to draw.
+            pos (tuple): The position to draw it at, in display coordinates.
+        """
+        self.overlays.append((image, pos))
+
+    def hit_rects(self, scale) -> dict:
+        """
+        Returns the hit-test rects of the buttons in window coordinates, rebuilding them only if the scale changed.
+
+        Args:
+            scale (int): The scale of the window compared to the display.
+
+        Returns:
+            dict: The rects, keyed by button name.
+        """
+        if scale != self.scale:
+            self.scale = scale
+            self.rects = {key: py.Rect(button.hit_rect.x*scale, button.hit_rect.y*scale, button.hit_rect.w*scale, button.hit_rect.h*scale)
+                          for key, button in self.buttons.items()}
+        return self.rects
+
+    def hovered(self, mouse_pos, scale):
+        """
+        Returns the name of the button under the mouse.
+
+        Args:
+            mouse_pos (tuple): The position of the mouse in window coordinates.
+            scale (int): The scale of the window compared to the display.
+
+        Returns:
+            The name of the hovered button, or None.
+        """
+        for key, rect in self.hit_rects(scale).items():
+            if rect.collidepoint(mouse_pos):
+                return key
+        return None
+
+    def render(self, surface, mouse_pos, scale) -> None:
+        """
+        Draws the menu onto the given surface.
+
+        Args:
+            surface (pygame.Surface): The surface to draw onto.
+            mouse_pos (tuple): The position of the mouse in window coordinates.
+            scale (int): The scale of the window compared to the display.
+        """
+        key = self.hovered(mouse_pos, scale)
+        if key != None:
+            self.buttons[key].render_hover(surface)
+        surface.blit(self.panel, (0, 0))
+        for image, pos in self.overlays:
+            surface.blit(image, pos)
@@ -1,4 +1,5 @@
 import os
+from collections import OrderedDict
 import pygame as py
 
 BASE_IMG_PATH = 'data/images/'
@@ -14,7 +15,21 @@ def load_image(path):
     Returns:
         pygame.Surface: The loaded and processed image.
     """
-    img = py.image.load(BASE_IMG_PATH + path).convert() # do this to images, it's good for performance
+    return convert_image(py.image.load(BASE_IMG_PATH + path))
+
+def convert_image(img):
+    """
+    Converts a decoded image to the display's pixel format and sets its background color to transparent.
+
+    Decoding can happen on any thread, but this has to run on the main thread, as it needs the display.
+
+    Args:
+        img (pygame.Surface): The image, as returned by pygame.image.load.
+
+    Returns:
+        pygame.Surface: The converted image.
+    """
+    img = img.convert() # do this to images, it's good for performance
     img.set_colorkey((0, 0, 0))
     return img
 
@@ -36,24 +51,201 @@ def load_images(path):
             images.append(load_image(path + '/' + img_name))
     return images
 
+class AssetManager:
+    def __init__(self, max_size=None):
+        """
+        Initializes an AssetManager, a cache of everything loaded from data/images/.
+
+        Images are loaded the first time they are asked for and then kept, so starting a level again,
+        or opening the editor after the game, doesn't read them from disk again. If max_size is given,
+        the least recently used entries are dropped once there are more than max_size of them.
+
+        Args:
+            max_size (int, optional): The number of entries kept before the least recently used is dropped.
+                Defaults to None, which keeps everything.
+
+        Attributes:
+            cache (OrderedDict): The loaded assets, keyed by kind and path, least recently used first.
+            max_size (int): The number of entries kept, or None.
+            disk_loads (int): The number of images read from disk so far.
+        """
+        self.cache = OrderedDict()
+        self.max_size = max_size
+        self.disk_loads = 0
+
+    def get(self, key, loader):
+        """
+        Returns the asset cached under key, calling loader to create it the first time.
+
+        Args:
+            key (tuple): The key of the asset.
+            loader (function): Called with no arguments to create the asset if it isn't cached.
+
+        Returns:
+            The cached asset.
+        """
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        asset = loader()
+        self.cache[key] = asset
+        if self.max_size != None:
+            while len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
+        return asset
+
+    def load_image(self, path):
+        """
+        Loads an image from disk with load_image, counting the read.
+
+        Args:
+            path (str): The file path to the image, relative to the base image path.
+
+        Returns:
+            pygame.Surface: The loaded image.
+        """
+        self.disk_loads += 1
+        return load_image(path)
+
+    def image(self, path):
+        """
+        Returns the image at the given path, as loaded by load_image.
+
+        Args:
+            path (str): The file path to the image, relative to the base image path.
+
+        Returns:
+            pygame.Surface: The image.
+        """
+        return self.get(('image', path), lambda: self.load_image(path))
+
+    def images(self, path):
+        """
+        Returns the images in the given directory, as loaded by load_images.
+
+        Args:
+            path (str): The path to the directory containing the images, relative to the base image path.
+
+        Returns:
+            list: The images, sorted by file name.
+        """
+        return self.get(('images', path), lambda: [self.image(img_path) for img_path in self.image_paths(path)])
+
+    def image_paths(self, path):
+        """
+        Returns the paths of the images in the given directory, as loaded by images.
+
+        Args:
+            path (str): The path to the directory containing the images, relative to the base image path.
+
+        Returns:
+            list: The paths of the images relative to the base image path, sorted by file name.
+        """
+        return [path + '/' + img_name for img_name in sorted(os.listdir(BASE_IMG_PATH + path))
+                if os.path.isfile(BASE_IMG_PATH + '/' + path + '/' + img_name)]
+
+    def add_decoded(self, path, img):
+        """
+        Caches an image that was decoded elsewhere, such as on a preloading thread, converting it first.
+
+        Has to be called on the main thread, as converting needs the display.
+
+        Args:
+            path (str): The file path the image was loaded from, relative to the base image path.
+            img (pygame.Surface): The image, as returned by pygame.image.load.
+
+        Returns:
+            pygame.Surface: The cached image.
+        """
+        return self.get(('image', path), lambda: convert_image(img))
+
+    def animation(self, path, img_dur=5, loop=True):
+        """
+        Returns an Animation of the images in the given directory.
+
+        The same Animation is returned every time, so it should only be copied, never updated.
+
+        Args:
+            path (str): The path to the directory containing the images, relative to the base image path.
+            img_dur (int, optional): The duration in frames of each image. Defaults to 5.
+            loop (bool, optional): Whether the animation loops. Defaults to True.
+
+        Returns:
+            Animation: The animation.
+        """
+        return self.get(('animation', path, img_dur, loop), lambda: Animation(self.images(path), img_dur, loop))
+
+    def clear(self):
+        """
+        Drops every cached asset.
+        """
+        self.cache.clear()
+
+class Atlas:
+    def __init__(self, assets, names=None):
+        """
+        Initializes an Atlas, which keeps every rotation of the tile variants in the given assets.
+
+        Only asset entries that are lists of images (the tile groups) are rotated, so the render
+        code can index the rotated images instead of calling pygame.transform.rotate every frame.
+        Each rotation is made the first time it is asked for, as some variants are big images
+        that are never drawn rotated.
+
+        Args:
+            assets (dict): The game's assets, as loaded with load_image, load_images and Animation.
+            names (list, optional): The names of the tile groups to rotate. Defaults to every list of images in assets.
+
+        Attributes:
+            tiles (dict): The rotated images, indexed as tiles[type][variant][rotations]. None until first asked for.
+        """
+        self.tiles = {}
+        for name, images in assets.items():
+            if isinstance(images, list) and (names == None or name in names):
+                self.tiles[name] = [[img, None, None, None] for img in images]
+
+    def tile(self, tile_type, variant, rotations=0):
+        """
+        Returns the image of a tile variant rotated clockwise the given number of times.
+
+        Args:
+            tile_type (str): The type of the tile.
+            variant (int): The variant of the tile.
+            rotations (int, optional): The number of clockwise rotations. Defaults to 0.
+
+        Returns:
+            pygame.Surface: The rotated image.
+        """
+        images = self.tiles[tile_type][variant]
+        rotations %= 4
+        if images[rotations] == None:
+            images[rotations] = py.transform.rotate(images[0], -90 * rotations)
+        return images[rotations]
+
 class Animation:
-    def __init__(self, images, img_dur=5, loop=True):
+    __slots__ = ('images', 'flipped_images', 'loop', 'img_duration', 'done', 'frame') # every entity has its own copy
+
+    def __init__(self, images, img_dur=5, loop=True, flipped_images=None):
         """
         Initializes an Animation instance with the given parameters.
 
         Args:
             images (list): A list of pygame.Surface objects to be displayed in sequence.
-            img_dur (int, optional): The duration in frames of each image in the animation. Defaults to 5.
+            img_dur (int, optional): The duration of each image in the animation, in frames at the base tick rate. Defaults to 5.
             loop (bool, optional): Whether the animation should loop after reaching the end of the list. Defaults to True.
+            flipped_images (list, optional): The horizontally flipped images. Computed from images if not given.
 
         Attributes:
             images (list): The list of pygame.Surface objects to be displayed in sequence.
-            img_duration (int): The duration in frames of each image in the animation.
+            flipped_images (list): The images flipped horizontally, shared between copies of the animation.
+            img_duration (int): The duration of each image in the animation, in frames at the base tick rate.
             loop (bool): Whether the animation should loop after reaching the end of the list.
             done (bool): Whether the animation is finished.
-            frame (int): The current frame of the animation.
+            frame (float): The current frame of the animation, fractional when the tick rate isn't the base tick rate.
         """
         self.images = images
+        if flipped_images == None:
+            flipped_images = [py.transform.flip(img, True, False) for img in images]
+        self.flipped_images = flipped_images
         self.loop = loop
         self.img_duration = img_dur
         self.done = False
@@ -63,29 +255,39 @@ class Animation:
         '''
         Copies this Animation, returning a new Animation with the same properties as this one.
         '''
-        return Animation(self.images, self.img_duration, self.loop)
+        return Animation(self.images, self.img_duration, self.loop, self.flipped_images)
     
-    def update(self):
+    def update(self, step=1):
         """
         Updates the animation by incrementing the frame count and checking if the animation is finished.
 
         If the animation is set to loop, the frame count will wrap around to the beginning of the animation after it has finished.
         If the animation is not set to loop, the frame count will be capped at the last frame of the animation and the done flag will be set to True.
+
+        Args:
+            step (float, optional): How far to advance the frame count, the game's tick_scale so animations keep the same speed at any tick rate. Defaults to 1.
         """
         if self.loop:
-            self.frame = (self.frame + 1) % (self.img_duration * len(self.images))
+            self.frame = (self.frame + step) % (self.img_duration * len(self.images))
         else:
-            self.frame = min(self.frame + 1, self.img_duration * len(self.images) - 1)
+            self.frame = min(self.frame + step, self.img_duration * len(self.images) - 1)
             if self.frame >= self.img_duration * len(self.images) - 1:
                 self.done = True
     
-    def img(self):
+    def img(self, flip=False):
         """
         Returns the current frame of the animation as a pygame.Surface.
 
         The frame is determined by dividing the current frame count by the image duration.
 
+        Args:
+            flip (bool, optional): Whether to return the horizontally flipped frame. Defaults to False.
+
         Returns:
             pygame.Surface: The current image frame of the animation.
         """
-        return self.images[int(self.frame / self.img_duration)]
\ No newline at end of file
+        if flip:
+            return self.flipped_images[int(self.frame / self.img_duration)]
+        return self.images[int(self.frame / self.img_duration)]
+
+ASSETS = AssetManager() # shared by everything in the process
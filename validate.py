@@ -0,0 +1,201 @@
+import argparse, json, os, sys, time
+from concurrent.futures import ProcessPoolExecutor
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1' # keeps the printed results valid json
+from game import Game
+from scripts.swarm import SWARM_AVAILABLE
+from scripts.replay import Recording, load_recording, INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
+
+MAPS_PATH = 'data/maps/'
+REPLAYS_PATH = 'data/replays/'
+THROW_GRACE = 2.5 # the seconds after the start of an attempt at a level before a dung enemy can throw
+
+#* the scripted inputs every map is played with, as cycles of [keys, ticks] runs repeated for the whole run
+SCRIPTS = {'idle': [[0, 1]],
+           'run_right': [[INPUT_RIGHT, 1]],
+           'run_left': [[INPUT_LEFT, 1]],
+           'hop_right': [[INPUT_RIGHT, 50], [INPUT_RIGHT | INPUT_JUMP, 40]], # a full jump every 1.5 seconds
+           'hop_left': [[INPUT_LEFT, 50], [INPUT_LEFT | INPUT_JUMP, 40]]}
+
+game = None # the headless game of this process, created by the first run
+
+def scripted_recording(level, cycle, ticks, seed, tick_rate) -> Recording:
+    """
+    Creates a recording that repeats a cycle of held keys for the given number of ticks.
+
+    :param level: the level to play
+    :param cycle: the held keys, as [keys, ticks] runs
+    :param ticks: the length of the recording, in ticks
+    :param seed: the seed of the level's random numbers
+    :param tick_rate: the tick rate of the recording
+    :return: the Recording
+    """
+    recording = Recording(level, seed, tick_rate)
+    while ticks > 0:
+        for state, length in cycle:
+            if ticks == 0:
+                break
+            length = min(length, ticks)
+            recording.runs.append([state, length])
+            ticks -= length
+    return recording
+
+def trace_ticks(recording, batch_ticks) -> tuple:
+    """
+    Plays a recording in this process's headless game and traces the tick enemies every tick.
+
+    The swarm is made for even a single tick enemy, as the shipped maps never have enough of them
+    near the camera at once for it to be made otherwise.
+
+    :param recording: the Recording to play
+    :param batch_ticks: whether the tick enemies are moved together by a TickSwarm
+    :return: the player's position, the deaths and every tick enemy's position, velocity, facing and
+             animation frame after each tick, and the number of ticks the swarm moved the tick enemies
+    """
+    game.batch_ticks = batch_ticks
+    game.swarm_min_ticks = 1
+    game.start_level(recording.level, recording.seed)
+    trace = []
+    swarm_ticks = 0
+    for state in recording.states():
+        if not game.level_loop:
+            break
+        game.held_keys = state
+        game.update_level()
+        if game.tick_swarm != None and game.tick_swarm.stepped:
+            swarm_ticks += 1
+        trace.append((tuple(game.player.pos), game.deaths,
+                      [(float(tick.pos[0]), float(tick.pos[1]), float(tick.velocity[0]), float(tick.velocity[1]), tick.flip, tick.animation.frame)
+                       for tick in game.enemies if tick.enemy_type == 'tick_enemy']))
+    return trace, swarm_ticks
+
+def check_swarm(recording) -> dict:
+    """
+    Checks that a recording plays out the same with the tick enemies moved by a TickSwarm as with
+    each of them updating itself, tick by tick.
+
+    :param recording: the Recording to play
+    :return: whether the traces match, the first tick they differ at, and the number of ticks the swarm moved the tick enemies
+    """
+    batch_ticks, swarm_min_ticks = game.batch_ticks, game.swarm_min_ticks
+    try:
+        swarm_trace, swarm_ticks = trace_ticks(recording, True)
+        single_trace, _ = trace_ticks(recording, False)
+    finally:
+        game.batch_ticks, game.swarm_min_ticks = batch_ticks, swarm_min_ticks
+    first_difference = next((tick for tick, (swarm, single) in enumerate(zip(swarm_trace, single_trace)) if swarm != single), None)
+    if first_difference == None and len(swarm_trace) != len(single_trace):
+        first_difference = min(len(swarm_trace), len(single_trace))
+    return {'swarm_matches': first_difference == None, 'swarm_first_difference': first_difference, 'swarm_ticks': swarm_ticks}
+
+def check_throws(recording) -> dict:
+    """
+    Checks that no dung enemy throws a projectile within THROW_GRACE seconds of the start of an
+    attempt at the level, which is the start of the level or a reset.
+
+    A throw is a projectile slot that is live after a tick but wasn't after the one before. A slot
+    given back during a tick can only be taken again in a later tick, as projectiles are updated
+    after the enemies, and a reset empties the projectile pool.
+
+    :param recording: the Recording to play
+    :return: the number of throws, and the ones too soon after the start of their attempt, as [attempt start tick, throw tick] pairs
+    """
+    game.start_level(recording.level, recording.seed)
+    attempt_start = 0
+    deaths = 0
+    live = set()
+    throws = 0
+    early_throws = []
+    for state in recording.states():
+        if not game.level_loop:
+            break
+        game.held_keys = state
+        game.update_level()
+        tick = game.frame_count - 1
+        last_live, live = live, set(game.projectiles.live)
+        if game.deaths != deaths:
+            deaths = game.deaths
+            attempt_start = tick
+            last_live = set()
+        for slot in live - last_live:
+            throws += 1
+            if tick * game.dt - attempt_start * game.dt < THROW_GRACE:
+                early_throws.append([attempt_start, tick])
+    return {'throws': throws, 'early_throws': early_throws}
+
+CHECKS = {'swarm': check_swarm, 'throws': check_throws} # the checks a run can be played again for, by name
+
+def run(job) -> dict:
+    """
+    Plays one recording in this process's headless game and times the simulation.
+
+    The level is started once before it's timed, so loading it and its assets isn't counted.
+
+    :param job: the map name, the name of the inputs, the Recording to play and the names of the CHECKS to play it again for
+    :return: the map and inputs names and how the run went, as returned by Game.play_recording,
+             plus the simulated ticks per second and the results of the checks,
+             or the error if the map couldn't be played
+    """
+    global game
+    name, inputs, recording, checks = job
+    if game == None:
+        game = Game(headless=True, tick_rate=recording.tick_rate)
+    try:
+        game.start_level(recording.level, recording.seed)
+        start = time.perf_counter()
+        result = game.play_recording(recording)
+        elapsed = time.perf_counter() - start
+        checked = {}
+        for check in checks:
+            checked.update(CHECKS[check](recording))
+    except Exception as error: # a broken map is reported, not allowed to stop the other runs
+        return {'map': name, 'inputs': inputs, 'error': repr(error)}
+    result.update({'map': name, 'inputs': inputs, 'sim_fps': round(result['ticks'] / elapsed, 1) if elapsed > 0 else None})
+    result.update(checked)
+    return result
+
+# Plays every map (or the ones given) with every script and recording in parallel, and prints or writes the results as json
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Plays every map in data/maps/ headless with scripted and recorded inputs, spread across processes.')
+    parser.add_argument('maps', nargs='*', help='the maps to play, without the file extension. Defaults to every json map')
+    parser.add_argument('--scripts', nargs='*', default=list(SCRIPTS), choices=list(SCRIPTS), help='the scripted inputs to play each map with. Defaults to all of them')
+    parser.add_argument('--recordings', default=REPLAYS_PATH, help="a directory of recordings, each also played on its level's map")
+    parser.add_argument('--ticks', type=int, default=3600, help='the length of each scripted run, in ticks')
+    parser.add_argument('--tick-rate', type=int, default=60, help='the tick rate of the scripted runs')
+    parser.add_argument('--seed', type=int, default=0, help='the seed of the scripted runs')
+    parser.add_argument('--jobs', type=int, help='the number of processes to run. Defaults to one per core')
+    parser.add_argument('--check-swarm', action='store_true', help='also play each scripted run with the tick swarm forced on and off, failing if they differ')
+    parser.add_argument('--check-throws', action='store_true', help='also play each scripted run to check that no dung enemy throws within THROW_GRACE seconds of a reset, failing if one does')
+    parser.add_argument('--output', help='the file to write the results to, instead of printing them')
+    args = parser.parse_args()
+    if args.check_swarm and not SWARM_AVAILABLE:
+        parser.error('--check-swarm needs numpy, which the tick swarm is made with')
+
+    names = args.maps or sorted(file[:-5] for file in os.listdir(MAPS_PATH) if file.endswith('.json'))
+    levels = {name: int(name) if name.isdigit() else name for name in names}
+    checks = [check for check, asked in (('swarm', args.check_swarm), ('throws', args.check_throws)) if asked]
+
+    jobs = []
+    for name, level in levels.items():
+        for script in args.scripts:
+            jobs.append((name, script, scripted_recording(level, SCRIPTS[script], args.ticks, args.seed, args.tick_rate), checks))
+    if os.path.isdir(args.recordings):
+        for file in sorted(os.listdir(args.recordings)):
+            if file.endswith('.json'):
+                recording = load_recording(os.path.join(args.recordings, file))
+                if str(recording.level) in levels and recording.tick_rate == args.tick_rate:
+                    jobs.append((str(recording.level), file, recording, []))
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        runs = list(executor.map(run, jobs))
+
+    results = {'ticks': args.ticks, 'seed': args.seed, 'seconds': round(time.perf_counter() - start, 2), 'maps': {name: {} for name in names}}
+    for result in runs:
+        results['maps'][result.pop('map')][result.pop('inputs')] = result
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+    sys.exit(1 if any(result.get('swarm_matches') == False or result.get('early_throws') for result in runs) else 0)